@@ -1,17 +1,32 @@
+import logging
+import time
+
 from tri.delaunay.helpers import ToPointsAndSegments
 from tri.delaunay.insert_kd import triangulate
 from tri.delaunay.iter import FiniteEdgeIterator, TriangleIterator
 from tri.delaunay.inout import output_triangles
 
 from grassfire.inout import output_offsets, output_skel
-from grassfire.initialize import init_skeleton, internal_only_skeleton
+from grassfire.lifetime import LifetimeIndex
+from grassfire.initialize import (init_skeleton, internal_only_skeleton,
+                                  minimize_initial_flips)
 from grassfire.events import init_event_list, event_loop
-from grassfire.transform import get_transform, get_box
+from grassfire.convex import is_convex_ring, init_convex_skeleton, convex_event_loop
+from grassfire.slav import (UnsupportedConfiguration, init_slav_skeleton,
+                            oriented_rings, prefer_slav, reflex_count,
+                            slav_event_loop)
+from grassfire.stream import SegmentStream
+from grassfire.transform import get_transform, get_box, get_box_array
 
 __version__ = "0.1.dev0"
 __license__ = "MIT License"
 __author__ = "Martijn Meijers"
-__all__ = ["calc_skel"]
+__all__ = ["calc_skel", "calc_skel_from_rings", "prepare_triangulation",
+           "PreparedTriangulation", "ENGINES"]
+
+# engines that calc_skel can use, "auto" uses the convex engine where it can
+# and the triangulation engine otherwise, "fastest" also considers "slav"
+ENGINES = ("auto", "triangulation", "convex", "slav", "fastest")
 # ------------------------------------------------------------------------------
 # main function for calculating skeleton
 
@@ -24,23 +39,267 @@ __all__ = ["calc_skel"]
 # f f -- does not make sense (no skeleton)
 
 
-def calc_skel(conv, pause=False, output=False, shrink=True, internal_only=False):
+class PreparedTriangulation(object):
+    """A constrained triangulation of the (transformed) input, that can be
+    given to calc_skel multiple times (e.g. to obtain the internal and the
+    external skeleton) without triangulating again.
+
+    init_skeleton only reads the triangulation, so it can be shared.
+    """
+
+    __slots__ = ("dt", "transform", "duration")
+
+    def __init__(self, dt, transform=None, duration=0.0):
+        self.dt = dt
+        self.transform = transform
+        self.duration = duration  # seconds spent in the triangulator
+
+
+def prepare_triangulation(conv, shrink=True, output=False, triangulator=None):
+    """Triangulate the points and segments of conv
+
+    The triangulator is a callable with the signature of
+    tri.delaunay.insert_kd.triangulate:
+
+        triangulator(points, infos, segments, output) -> triangulation
+
+    and it should return a constrained triangulation with the same interface
+    as the one of tri (vertices, triangles, neighbours and constrained flags).
+
+    Returns:
+        PreparedTriangulation
+    """
+    pts, transform = _transform_points(conv.points, shrink)
+    return _triangulate(pts, conv.infos, conv.segments, transform, output,
+                        triangulator)
+
+
+def _transform_points(points, shrink):
+    """Returns the points (transformed to the (-1,-1),(1,1) box if shrink)
+    and the transform used (None if not shrink)"""
+    # step 0 -- get transformation parameters
+    if shrink:
+        box = get_box(points)
+        transform = get_transform(box)
+        return list(map(transform.forward, points)), transform
+    else:
+        return points, None
+
+
+def calc_skel(conv, pause=False, output=False, shrink=True, internal_only=False,
+              triangulator=None, triangulation=None, minimize_flips=False,
+              engine="auto", lazy_events=False, compact=False, on_segment=None,
+              capture_times=None, keep_triangles=False):
     """Perform the calculation of the skeleton, given points and segments
 
+    triangulator -- callable that is used to triangulate the input
+                    (see prepare_triangulation), defaults to the
+                    triangulate function of tri
+    triangulation -- PreparedTriangulation to use, conv, shrink and
+                     triangulator are then ignored
+    minimize_flips -- flip the initial kinetic triangulation so that area
+                      collapses happen later (fewer flip events during
+                      propagation, see minimize_initial_flips)
+    lazy_events -- queue a cheap lower bound of the collapse time of the
+                   triangles, the exact collapse is only computed when the
+                   event loop reaches it (see EventQueue; skel.event_counts
+                   then also holds the number of rechecks)
+    compact -- return a CompactSkeleton (node and segment arrays, requires
+               NumPy) instead of the Skeleton with its kinetic vertices
+    on_segment -- callable that is given every segment of the skeleton (in
+                  the format of skel.segments) as soon as it is final,
+                  while the wavefront propagates (see grassfire.stream)
+    capture_times -- sorted times (distances, in the units of the input) at
+                     which the wavefront is recorded during propagation, as
+                     skel.snapshots (see grassfire.snapshots, requires NumPy)
+    keep_triangles -- keep the kinetic triangulation in skel.triangles
+                      after propagation (by default it is released, see
+                      Skeleton.release_triangles, so that the skeleton is
+                      freed by reference counting); only the triangulation
+                      engine makes triangles
+    engine -- one of ENGINES:
+              "triangulation" -- kinetic triangulation (any input)
+              "convex" -- edge events only, for the internal skeleton of one
+                          convex ring (no triangulation is made)
+              "slav" -- edge and split events on the circular lists of
+                        vertices, for the internal skeleton of polygons
+                        (with holes) given as closed rings
+              "auto" -- "convex" if possible, "triangulation" otherwise
+              "fastest" -- "convex" if possible, else "slav" if it is
+                           expected to be faster (see slav.prefer_slav, the
+                           limits there come from benchmark_engines) and
+                           succeeds, "triangulation" otherwise
+
+    Returns:
+        skel -- skeleton structure, with skel.timings holding the time spent
+                on triangulation, initialization and propagation
+    """
+    if triangulation is None:
+        pts, transform = _transform_points(conv.points, shrink)
+        if capture_times is not None:
+            # the slav engine may fall back, so the times are used twice
+            capture_times = list(capture_times)
+        skel = _calc_skel_without_triangulation(
+            pts, conv.infos, conv.segments, transform, internal_only, engine,
+            on_segment, capture_times
+        )
+        if skel is not None:
+            return _result(skel, compact)
+        triangulation = _triangulate(pts, conv.infos, conv.segments, transform,
+                                     output, triangulator)
+    elif engine not in ("auto", "fastest", "triangulation"):
+        raise ValueError("a prepared triangulation needs the triangulation engine")
+    return _result(_calc_skel(triangulation, pause, output, internal_only,
+                              minimize_flips, lazy_events, on_segment,
+                              capture_times, keep_triangles), compact)
+
+
+def calc_skel_from_rings(coords, offsets=None, pause=False, output=False,
+                         shrink=True, internal_only=False, triangulator=None,
+                         minimize_flips=False, engine="auto", lazy_events=False,
+                         compact=False, on_segment=None, capture_times=None,
+                         keep_triangles=False):
+    """Perform the calculation of the skeleton, given rings as a contiguous
+    coordinate buffer
+
+    coords -- (n, 2) float64 array, or any buffer with 2n doubles
+    offsets -- ring i is coords[offsets[i]:offsets[i + 1]]
+               (if not given, all coordinates form one ring)
+
+    Bounding box and transform are computed vectorized (requires NumPy).
+    The other keywords are as for calc_skel.
+
     Returns:
         skel -- skeleton structure
     """
+    from grassfire.buffers import ring_points_and_segments
+
+    points, segments = ring_points_and_segments(coords, offsets)
     # step 0 -- get transformation parameters
     if shrink:
-        box = get_box(conv.points)
-        transform = get_transform(box)
-        pts = list(map(transform.forward, conv.points))
+        transform = get_transform(get_box_array(points))
+        points = transform.forward_array(points)
+    else:
+        transform = None
+    pts = list(zip(points[:, 0].tolist(), points[:, 1].tolist()))
+    segs = list(zip(segments[:, 0].tolist(), segments[:, 1].tolist()))
+    if capture_times is not None:
+        capture_times = list(capture_times)
+    skel = _calc_skel_without_triangulation(pts, [], segs, transform,
+                                            internal_only, engine, on_segment,
+                                            capture_times)
+    if skel is not None:
+        return _result(skel, compact)
+    triangulation = _triangulate(pts, [], segs, transform, output, triangulator)
+    return _result(_calc_skel(triangulation, pause, output, internal_only,
+                              minimize_flips, lazy_events, on_segment,
+                              capture_times, keep_triangles), compact)
+
+
+def _result(skel, compact):
+    """The skeleton, or its CompactSkeleton (see grassfire.compact)"""
+    if not compact:
+        return skel
+    from grassfire.compact import compact_skeleton
+
+    return compact_skeleton(skel)
+
+
+def _calc_skel_without_triangulation(pts, infos, segments, transform,
+                                     internal_only, engine, on_segment=None,
+                                     capture_times=None):
+    """Use an engine that does not need a triangulation, if the input and
+    engine allow it
+
+    When the slav engine may still fall back to the triangulation engine,
+    the segments for on_segment are held back until it has finished.
+
+    Returns:
+        skel -- skeleton structure, or None if the triangulation engine
+                should be used
+    """
+    if engine not in ENGINES:
+        raise ValueError("unknown engine '{}', use one of {}".format(engine, ENGINES))
+    if engine == "triangulation":
+        return None
+    rings = oriented_rings(pts, segments) if internal_only else None
+    if rings is None:
+        if engine not in ("auto", "fastest"):
+            raise ValueError("the {} engine needs internal_only=True and"
+                             " closed rings as input".format(engine))
+        return None
+    if engine != "slav" and len(rings) == 1 and is_convex_ring(pts, rings[0]):
+        return _run_ring_engine(init_convex_skeleton, convex_event_loop,
+                                pts, rings[0], infos, transform, on_segment,
+                                capture_times)
+    if engine == "convex":
+        raise ValueError("the convex engine needs one convex ring as input")
+    if engine == "auto":
+        return None
+    if engine == "fastest" and not prefer_slav(len(pts), reflex_count(pts, rings)):
+        return None
+    pending = []
+    if engine == "fastest" and on_segment is not None:
+        callback = pending.append
+    else:
+        callback = on_segment
+    try:
+        skel = _run_ring_engine(init_slav_skeleton, slav_event_loop,
+                                pts, rings, infos, transform, callback,
+                                capture_times)
+    except UnsupportedConfiguration:
+        if engine == "slav":
+            raise
+        logging.debug("slav engine failed, falling back to triangulation")
+        return None
+    for segment in pending:
+        on_segment(segment)
+    return skel
+
+
+def _run_ring_engine(init_fn, event_loop_fn, pts, rings, infos, transform,
+                     on_segment=None, capture_times=None):
+    t0 = time.perf_counter()
+    skel = init_fn(pts, rings, infos)
+    if transform is not None:
+        skel.transform = transform
+    if on_segment is not None:
+        skel.stream = SegmentStream(on_segment, transform)
+    capture = _capture(capture_times, transform)
+    t1 = time.perf_counter()
+    event_loop_fn(skel, capture=capture)
+    if capture is not None:
+        skel.snapshots = capture.snapshots
+    if skel.stream is not None:
+        skel.stream.finish(skel)
+        skel.stream = None
+    skel.timings = {
+        "triangulate": 0.0,
+        "initialize": t1 - t0,
+        "propagate": time.perf_counter() - t1,
+    }
+    return skel
+
+
+def _capture(capture_times, transform):
+    """WavefrontCapture for the capture times (None if there are none)"""
+    if capture_times is None:
+        return None
+    from grassfire.snapshots import WavefrontCapture
+
+    return WavefrontCapture(capture_times, transform)
+
+
+def _triangulate(pts, infos, segments, transform, output, triangulator):
+    """Triangulate the (transformed) points and segments"""
+    if triangulator is None:
+        triangulator = triangulate
     # step 1 -- triangulate
     # FIXME: keep info on points
     # (so that we know after the construction what each node represents)
-    else:
-        pts = conv.points
-    dt = triangulate(pts, conv.infos, conv.segments, output)
+    t0 = time.perf_counter()
+    dt = triangulator(pts, infos, segments, output)
+    duration = time.perf_counter() - t0
     if output:
         with open("/tmpfast/edges.wkt", "w") as fh:
             fh.write("id;wkt\n")
@@ -51,28 +310,53 @@ def calc_skel(conv, pause=False, output=False, shrink=True, internal_only=False)
                         j, edge.segment
                     )
                 )
+    return PreparedTriangulation(dt, transform, duration)
+
+
+def _calc_skel(triangulation, pause, output, internal_only, minimize_flips=False,
+               lazy_events=False, on_segment=None, capture_times=None,
+               keep_triangles=False):
+    """Build the kinetic triangulation and propagate the wavefront"""
+    t0 = time.perf_counter()
     # step 2a -- copy over triangles and deal with
     # - terminal 1-vertices (add triangle)
     # - infinite triangles
-    skel = init_skeleton(dt)
+    skel = init_skeleton(triangulation.dt)
     # step 2b -- do we have a polygon and only internal to its boundaries
     # where do we want to obtain the skeleton?
     if internal_only:
         # keeps internal kinetic triangle/vertices only
         skel = internal_only_skeleton(skel)
+    if minimize_flips:
+        minimize_initial_flips(skel)
 
     # keep the transform object with the skeleton if we shrink to -1,1
-    if shrink:
-        skel.transform = transform
+    if triangulation.transform is not None:
+        skel.transform = triangulation.transform
 
     for kv in skel.vertices:
         x, y = kv.start_node.pos
         assert -2.0 <= x <= 2.0, (x, "start")
         assert -2.0 <= y <= 2.0, (y, "start")
+    if on_segment is not None:
+        skel.stream = SegmentStream(on_segment, triangulation.transform)
     # step 3 -- make initial event list
-    el = init_event_list(skel)
+    el = init_event_list(skel, lazy_events)
+    capture = _capture(capture_times, triangulation.transform)
+    t1 = time.perf_counter()
     # step 4 -- handle events until finished
-    last_evt_time = event_loop(el, skel, pause)
+    last_evt_time = event_loop(el, skel, pause, capture=capture)
+    if capture is not None:
+        skel.snapshots = capture.snapshots
+    if skel.stream is not None:
+        skel.stream.finish(skel)
+        skel.stream = None
+    t2 = time.perf_counter()
+    skel.timings = {
+        "triangulate": triangulation.duration,
+        "initialize": t1 - t0,
+        "propagate": t2 - t1,
+    }
     # step 5 -- output offsets and the skeleton
     if output:
         output_offsets(skel, last_evt_time)
@@ -80,24 +364,31 @@ def calc_skel(conv, pause=False, output=False, shrink=True, internal_only=False)
         from grassfire.inout import visualize
 
         visualize([], skel, last_evt_time + 10)
+    # the kinetic triangulation is not part of the result, unless asked for
+    if not keep_triangles:
+        skel.release_triangles()
     return skel
 
 
-def calc_offsets(skel, now, ct=100):
+def calc_offsets(skel, now, ct=100, index=None):
+    """Yields the offset segments (from every active vertex to its left
+    neighbour) at ct times in [0, now)
+
+    index -- LifetimeIndex on skel.vertices to use (made if not given)
+    """
+    if index is None:
+        index = LifetimeIndex(skel.vertices)
     inc = now / ct
     for t in range(ct):
         t *= inc
-        for v in skel.vertices:
-            if (v.starts_at <= t and v.stops_at is not None and v.stops_at > t) or (
-                v.starts_at <= t and v.stops_at is None
-            ):
-                try:
-                    yield (
-                        v.position_at(t),
-                        v.left_at(t).position_at(t),
-                        t,
-                        id(v),
-                        id(v.left_at(t)),
-                    )
-                except AttributeError:
-                    continue
+        for v in index.active_at(t):
+            left = v.left_at(t)
+            if left is None:
+                continue
+            yield (
+                v.position_at(t),
+                left.position_at(t),
+                t,
+                id(v),
+                id(left),
+            )
@@ -0,0 +1,123 @@
+"""Benchmark of the slav engine against the triangulation engine
+
+The slav engine tests every reflex vertex against every wavefront, so its
+cost grows with vertices * reflex vertices, while the triangulation engine
+pays per vertex (triangulation, flip events). Both engines are timed on
+star shaped polygons with a given number of vertices, of which a given
+number is reflex; slav.SLAV_MAX_WORK and slav.SLAV_MAX_REFLEX (used by
+calc_skel(engine="fastest")) are set from these results.
+"""
+
+import argparse
+import math
+import time
+from statistics import mean
+
+from grassfire import calc_skel
+from grassfire.benchmark_rectilinear import make_conv
+from grassfire.slav import prefer_slav
+
+
+VERTICES = (100, 200, 400, 800, 1600)
+REFLEX = (1, 4, 16, 64, 256)
+
+
+def star_ring(vertices, reflex):
+    """Counterclockwise ring with *vertices* vertices on the unit circle, of
+    which *reflex* (spread evenly, at most half of them) are pulled inwards
+    so that they are reflex"""
+    if not 0 <= reflex <= vertices // 2:
+        raise ValueError("reflex must be between 0 and half the vertices")
+    step = 2 * math.pi / vertices
+    # a vertex is reflex when it lies inside the chord of its neighbours
+    inner = 0.5 * math.cos(step)
+    pulled = set(int(i * vertices / reflex) for i in range(reflex)) if reflex else set()
+    ring = []
+    for i in range(vertices):
+        radius = inner if i in pulled else 1.0
+        ring.append((radius * math.cos(i * step), radius * math.sin(i * step)))
+    return ring
+
+
+def benchmark_engines(
+    vertices=VERTICES,
+    reflex=REFLEX,
+    repeats=3,
+    calc_skel_fn=calc_skel,
+    make_conv_fn=make_conv,
+    timer=time.perf_counter,
+):
+    """Time both engines on the star shaped ring of every combination of
+    number of vertices and reflex vertices
+
+    Returns:
+        list of (number of vertices, number of reflex vertices, average time
+        of the slav engine, average time of the triangulation engine, error)
+        tuples; when a skeleton could not be made, its time is None and
+        error holds the message
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be >= 1")
+    rows = []
+    for n in vertices:
+        for r in reflex:
+            if r > n // 2:
+                continue
+            ring = star_ring(n, r)
+            averages = []
+            error = None
+            for engine in ("slav", "triangulation"):
+                totals = []
+                for _ in range(repeats):
+                    conv = make_conv_fn(ring)
+                    start = timer()
+                    try:
+                        calc_skel_fn(conv, internal_only=True, engine=engine)
+                    except Exception as exc:
+                        error = "{}: {}".format(type(exc).__name__, exc)
+                        break
+                    totals.append(timer() - start)
+                averages.append(mean(totals) if len(totals) == repeats else None)
+            rows.append((n, r, averages[0], averages[1], error))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the slav engine against the triangulation "
+        "engine on star shaped polygons."
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Number of runs to average (default: 3).",
+    )
+    parser.add_argument(
+        "--vertices",
+        nargs="+",
+        type=int,
+        default=list(VERTICES),
+        help="Numbers of vertices (default: 100 200 400 800 1600).",
+    )
+    parser.add_argument(
+        "--reflex",
+        nargs="+",
+        type=int,
+        default=list(REFLEX),
+        help="Numbers of reflex vertices (default: 1 4 16 64 256).",
+    )
+    args = parser.parse_args()
+    rows = benchmark_engines(args.vertices, args.reflex, args.repeats)
+    for n, r, slav, triangulation, error in rows:
+        if error is not None:
+            print(f"vertices={n:6d} reflex={r:4d} failed ({error})")
+            continue
+        print(f"vertices={n:6d} reflex={r:4d} slav={slav:.6f}s "
+              f"triangulation={triangulation:.6f}s "
+              f"slav_faster={slav < triangulation} "
+              f"prefer_slav={prefer_slav(n, r)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark of the exact collapse computations with and without lazy events
+
+With calc_skel(..., lazy_events=True) the event queue holds a lower bound of
+the collapse time of the triangles, and the exact collapse is only computed
+when the event loop reaches that bound. This counts the exact computations
+(EventQueue.collapse_computations) of the triangulation engine on the shapes
+of benchmark_rectilinear, with and without lazy events, next to the number
+of events handled and, with lazy events, the number of rechecks.
+"""
+
+import argparse
+
+from grassfire import prepare_triangulation
+from grassfire.benchmark_rectilinear import make_conv, rectilinear_ring
+from grassfire.events import event_loop, init_event_list
+from grassfire.initialize import init_skeleton, internal_only_skeleton
+
+
+SHAPES = ("L", "T", "U", "comb", "staircase")
+SIZES = (100, 1000)
+
+
+def count_computations(conv, lazy_events):
+    """Runs the triangulation engine steps of calc_skel on conv
+
+    Returns:
+        (number of exact collapse computations, events handled per type)
+    """
+    triangulation = prepare_triangulation(conv)
+    skel = internal_only_skeleton(init_skeleton(triangulation.dt))
+    queue = init_event_list(skel, lazy_events)
+    event_loop(queue, skel)
+    return queue.collapse_computations, skel.event_counts
+
+
+def benchmark_lazy_events(
+    shapes=SHAPES,
+    sizes=SIZES,
+    count_fn=count_computations,
+    make_conv_fn=make_conv,
+):
+    """Count the exact collapse computations for every shape at every size
+
+    Returns:
+        list of (shape, number of vertices, computations without lazy
+        events, computations with lazy events, number of rechecks, error)
+        tuples; when a skeleton could not be made, the counts are None and
+        error holds the message
+    """
+    rows = []
+    for shape in shapes:
+        for size in sizes:
+            ring = rectilinear_ring(shape, size)
+            try:
+                eager, _ = count_fn(make_conv_fn(ring), False)
+                lazy, counts = count_fn(make_conv_fn(ring), True)
+            except Exception as exc:
+                error = "{}: {}".format(type(exc).__name__, exc)
+                rows.append((shape, len(ring), None, None, None, error))
+                continue
+            rows.append((shape, len(ring), eager, lazy, counts["recheck"], None))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count the exact collapse computations with and without "
+        "lazy events on synthetic rectilinear polygons."
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=SHAPES,
+        default=list(SHAPES),
+        help="Shapes to benchmark (default: all).",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(SIZES),
+        help="Approximate number of vertices per shape (default: 100 1000).",
+    )
+    args = parser.parse_args()
+    for shape, vertices, eager, lazy, rechecks, error in benchmark_lazy_events(
+        args.shapes, args.sizes
+    ):
+        if error is None:
+            print(f"{shape:10s} vertices={vertices:6d} exact={eager:7d} "
+                  f"exact_lazy={lazy:7d} rechecks={rechecks:7d} "
+                  f"saved={1 - lazy / max(eager, 1):.1%}")
+        else:
+            print(f"{shape:10s} vertices={vertices:6d} failed ({error})")
+
+
+if __name__ == "__main__":
+    main()
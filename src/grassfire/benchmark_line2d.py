@@ -0,0 +1,97 @@
+"""Benchmark of the event handlers on the rectilinear footprints
+
+The edge, split and parallel fan handlers intersect wavefront pairs with
+the line2d kernel (intersect_at_time and the WaveFrontPair cache). This
+times the propagation stage of calc_skel (skel.timings["propagate"], the
+event loop with its handlers) on the shapes of benchmark_rectilinear, so
+that a change to the kernel or the handlers can be compared by running it
+before and after the change.
+"""
+
+import argparse
+import time
+from statistics import mean
+
+from grassfire import calc_skel
+from grassfire.benchmark_rectilinear import make_conv, rectilinear_ring
+
+
+SHAPES = ("L", "T", "U", "comb", "staircase")
+SIZES = (100, 1000)
+
+
+def benchmark_event_handling(
+    shapes=SHAPES,
+    sizes=SIZES,
+    repeats=3,
+    calc_skel_fn=calc_skel,
+    make_conv_fn=make_conv,
+):
+    """Time the event handling of the triangulation engine for every shape
+    at every size
+
+    Returns:
+        list of (shape, number of vertices, number of events, average
+        propagation time, error) tuples; when the skeleton could not be
+        made, the time is None and error holds the message
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be >= 1")
+    rows = []
+    for shape in shapes:
+        for size in sizes:
+            ring = rectilinear_ring(shape, size)
+            totals = []
+            events = None
+            error = None
+            for _ in range(repeats):
+                try:
+                    skel = calc_skel_fn(make_conv_fn(ring), internal_only=True,
+                                        engine="triangulation")
+                except Exception as exc:
+                    error = "{}: {}".format(type(exc).__name__, exc)
+                    break
+                totals.append(skel.timings["propagate"])
+                events = sum(skel.event_counts.values())
+            avg = None if error is not None else mean(totals)
+            rows.append((shape, len(ring), events, avg, error))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the event handlers (propagation stage of calc_skel) "
+        "on synthetic rectilinear polygons."
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Number of runs to average (default: 3).",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=SHAPES,
+        default=list(SHAPES),
+        help="Shapes to benchmark (default: all).",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(SIZES),
+        help="Approximate number of vertices per shape (default: 100 1000).",
+    )
+    args = parser.parse_args()
+    rows = benchmark_event_handling(args.shapes, args.sizes, args.repeats)
+    for shape, vertices, events, avg, error in rows:
+        if error is None:
+            print(f"{shape:10s} vertices={vertices:6d} events={events:6d} "
+                  f"propagate={avg:.6f}s per_event={avg / max(events, 1) * 1e6:.2f}us")
+        else:
+            print(f"{shape:10s} vertices={vertices:6d} failed ({error})")
+
+
+if __name__ == "__main__":
+    main()
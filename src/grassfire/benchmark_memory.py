@@ -0,0 +1,127 @@
+"""Allocation and garbage collection statistics of the event loop
+
+The kinetic triangles keep one event record each, that is updated in place
+when their collapse is recomputed, and the cyclic garbage collector is
+disabled while the event loop runs. This benchmark runs the triangulation
+engine on a batch of rectilinear polygons (keeping all skeletons, as a
+batch job would), with and without reusing the event records
+(init_event_list(..., reuse_events)) and disabling the collector
+(event_loop(..., disable_gc)), and reports the peak traced memory
+(tracemalloc), the number of collections per generation and the time spent
+in the garbage collector (gc.callbacks).
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from grassfire import prepare_triangulation
+from grassfire.benchmark_rectilinear import SHAPES, make_conv, rectilinear_ring
+from grassfire.events import event_loop, init_event_list
+from grassfire.initialize import init_skeleton, internal_only_skeleton
+
+
+def make_batch(shapes=SHAPES, size=100, count=10):
+    """Returns count rings of every shape, with about size vertices"""
+    return [rectilinear_ring(shape, size) for shape in shapes for _ in range(count)]
+
+
+def skeletonize(conv, reuse_events=True, disable_gc=True):
+    """Internal skeleton of conv, made with the steps of the triangulation
+    engine of calc_skel, with the given event loop settings"""
+    triangulation = prepare_triangulation(conv)
+    skel = internal_only_skeleton(init_skeleton(triangulation.dt))
+    skel.transform = triangulation.transform
+    queue = init_event_list(skel, reuse_events=reuse_events)
+    event_loop(queue, skel, disable_gc=disable_gc)
+    skel.release_triangles()
+    return skel
+
+
+def measure_memory(
+    rings,
+    reuse_events=True,
+    disable_gc=True,
+    skeletonize_fn=skeletonize,
+    make_conv_fn=make_conv,
+    timer=time.perf_counter,
+):
+    """Skeletonize the rings with the triangulation engine and collect
+    statistics
+
+    Returns:
+        dict with the total time, peak traced memory in bytes, collections
+        per generation and the seconds spent in the garbage collector
+    """
+    pauses = []
+    started = []
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started.append(timer())
+        elif started:
+            pauses.append(timer() - started.pop())
+
+    skeletons = []
+    gc.collect()
+    before = [stats["collections"] for stats in gc.get_stats()]
+    gc.callbacks.append(on_gc)
+    tracemalloc.start()
+    start = timer()
+    try:
+        for ring in rings:
+            skeletons.append(skeletonize_fn(make_conv_fn(ring), reuse_events, disable_gc))
+        total = timer() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(on_gc)
+    after = [stats["collections"] for stats in gc.get_stats()]
+    return {
+        "total": total,
+        "peak_bytes": peak,
+        "collections": [b - a for a, b in zip(before, after)],
+        "gc_time": sum(pauses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare allocations and GC time with and without event record"
+        " reuse and disabling the garbage collector in the event loop."
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=100,
+        help="Approximate number of vertices per polygon (default: 100).",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=10,
+        help="Number of polygons per shape (default: 10).",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=SHAPES,
+        default=list(SHAPES),
+        help="Shapes to use (default: all).",
+    )
+    args = parser.parse_args()
+    rings = make_batch(args.shapes, args.size, args.count)
+    for reuse, disable_gc in ((False, False), (True, False), (True, True)):
+        result = measure_memory(rings, reuse_events=reuse, disable_gc=disable_gc)
+        collections = "/".join(str(c) for c in result["collections"])
+        print(
+            f"reuse_events={reuse} disable_gc={disable_gc} polygons={len(rings)}"
+            f" total_time={result['total']:.3f}s"
+            f" peak={result['peak_bytes'] / 1e6:.2f}MB collections={collections}"
+            f" gc_time={result['gc_time']:.4f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
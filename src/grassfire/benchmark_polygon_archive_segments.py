@@ -1,5 +1,6 @@
 import argparse
 import cProfile
+import functools
 import pstats
 import time
 from statistics import mean
@@ -7,7 +8,7 @@ from statistics import mean
 import requests
 from tri.delaunay.helpers import ToPointsAndSegments
 
-from grassfire import calc_skel
+from grassfire import calc_skel, calc_skel_from_rings
 
 
 INPUT_NAMES = (
@@ -53,7 +54,7 @@ def load_coords(name):
         raise RuntimeError(f"failed to load polygon archive input '{name}'") from exc
 
 
-def calc_segments(coords):
+def make_conv(coords):
     conv = ToPointsAndSegments()
     for ring in coords:
         for p in ring:
@@ -62,7 +63,29 @@ def calc_segments(coords):
             start = tuple(ring[i])
             end = tuple(ring[(i + 1) % len(ring)])
             conv.add_segment(start, end)
-    return calc_skel(conv, internal_only=True).segments()
+    return conv
+
+
+def calc_segments(coords, minimize_flips=False, lazy_events=False):
+    conv = make_conv(coords)
+    return calc_skel(
+        conv, internal_only=True, minimize_flips=minimize_flips, lazy_events=lazy_events
+    ).segments()
+
+
+def load_ring_arrays(name):
+    """Loads an input as contiguous coordinate array with ring offsets"""
+    import numpy as np
+
+    rings = [np.asarray(ring, dtype=np.float64) for ring in load_coords(name)]
+    offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    np.cumsum([len(ring) for ring in rings], out=offsets[1:])
+    return np.concatenate(rings), offsets
+
+
+def calc_segments_from_rings(ring_arrays):
+    coords, offsets = ring_arrays
+    return calc_skel_from_rings(coords, offsets, internal_only=True).segments()
 
 
 def benchmark_total_skeleton_time(
@@ -96,6 +119,33 @@ def benchmark_total_skeleton_time(
     return mean(totals), totals
 
 
+def compare_initial_triangulations(
+    names=INPUT_NAMES,
+    load_coords_fn=load_coords,
+    calc_skel_fn=calc_skel,
+    make_conv_fn=make_conv,
+):
+    """Compare the plain constrained Delaunay triangulation with the
+    flip-minimizing initial triangulation: events handled per type and the
+    time spent in initialization and propagation, summed over all inputs.
+    """
+    loaded_coords = [load_coords_fn(name) for name in names]
+    result = {}
+    for minimize_flips in (False, True):
+        events = {"edge": 0, "flip": 0, "split": 0}
+        timings = {"initialize": 0.0, "propagate": 0.0}
+        for coords in loaded_coords:
+            skel = calc_skel_fn(
+                make_conv_fn(coords), internal_only=True, minimize_flips=minimize_flips
+            )
+            for tp, count in skel.event_counts.items():
+                events[tp] += count
+            for stage in timings:
+                timings[stage] += skel.timings[stage]
+        result["minimize_flips" if minimize_flips else "cdt"] = (events, timings)
+    return result
+
+
 def run_benchmark(
     repeats=3,
     profile=False,
@@ -125,9 +175,54 @@ def main():
         action="store_true",
         help="Enable cProfile while running the benchmark.",
     )
+    parser.add_argument(
+        "--arrays",
+        action="store_true",
+        help="Feed the input as coordinate arrays with ring offsets (requires NumPy).",
+    )
+    parser.add_argument(
+        "--minimize-flips",
+        action="store_true",
+        help="Use the flip-minimizing initial triangulation.",
+    )
+    parser.add_argument(
+        "--lazy-events",
+        action="store_true",
+        help="Queue lower bounds of the collapse times, compute exact events lazily.",
+    )
+    parser.add_argument(
+        "--compare-flips",
+        action="store_true",
+        help="Report events and time of plain CDT versus flip-minimizing start.",
+    )
     args = parser.parse_args()
+    if args.compare_flips:
+        for strategy, (events, timings) in compare_initial_triangulations().items():
+            print(
+                f"{strategy}: events={sum(events.values())} "
+                + " ".join(f"{tp}={count}" for tp, count in events.items())
+                + f" initialize={timings['initialize']:.6f}s"
+                + f" propagate={timings['propagate']:.6f}s"
+            )
+        return
+    benchmark_fn = benchmark_total_skeleton_time
+    if args.minimize_flips or args.lazy_events:
+        benchmark_fn = functools.partial(
+            benchmark_total_skeleton_time,
+            calc_segments_fn=functools.partial(
+                calc_segments,
+                minimize_flips=args.minimize_flips,
+                lazy_events=args.lazy_events,
+            ),
+        )
+    if args.arrays:
+        benchmark_fn = functools.partial(
+            benchmark_total_skeleton_time,
+            load_coords_fn=load_ring_arrays,
+            calc_segments_fn=calc_segments_from_rings,
+        )
     average_total, totals, profiler = run_benchmark(
-        repeats=args.repeats, profile=args.profile
+        repeats=args.repeats, profile=args.profile, benchmark_fn=benchmark_fn
     )
     print(f"inputs={len(INPUT_NAMES)} repeats={args.repeats}")
     for i, total in enumerate(totals, start=1):
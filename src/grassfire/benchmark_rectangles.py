@@ -0,0 +1,102 @@
+"""Per polygon latency on a large batch of rectangles
+
+Many inputs are rectangles (or other tiny footprints), for which the fixed
+cost per calc_skel call dominates.  This benchmark runs calc_skel on a batch
+of randomly placed, sized and rotated rectangles (one million by default)
+and reports the latency per polygon.
+"""
+
+import argparse
+import math
+import random
+import time
+from statistics import mean
+
+from tri.delaunay.helpers import ToPointsAndSegments
+
+from grassfire import ENGINES, calc_skel
+
+
+def make_rectangles(count=1000000, seed=42):
+    """Yields *count* random (counterclockwise) rectangles"""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        width, height = rnd.uniform(5.0, 50.0), rnd.uniform(5.0, 50.0)
+        angle = rnd.uniform(0.0, math.pi)
+        cx, cy = rnd.uniform(0.0, 1e5), rnd.uniform(0.0, 1e5)
+        c, s = math.cos(angle), math.sin(angle)
+        yield [
+            (cx + x * c - y * s, cy + x * s + y * c)
+            for x, y in ((0, 0), (width, 0), (width, height), (0, height))
+        ]
+
+
+def make_conv(ring):
+    conv = ToPointsAndSegments()
+    for i in range(len(ring)):
+        conv.add_segment(ring[i], ring[(i + 1) % len(ring)])
+    return conv
+
+
+def percentile(values, fraction):
+    """Nearest rank percentile of the sorted values"""
+    index = max(0, int(math.ceil(fraction * len(values))) - 1)
+    return values[index]
+
+
+def benchmark_rectangles(
+    rings,
+    engine="auto",
+    calc_skel_fn=calc_skel,
+    make_conv_fn=make_conv,
+    timer=time.perf_counter,
+):
+    """Time calc_skel (internal skeleton) for every ring separately
+
+    Returns:
+        dict with the number of polygons, the total time and the mean,
+        median and 95th percentile latency per polygon
+    """
+    latencies = []
+    for ring in rings:
+        conv = make_conv_fn(ring)
+        start = timer()
+        calc_skel_fn(conv, internal_only=True, engine=engine)
+        latencies.append(timer() - start)
+    if not latencies:
+        raise ValueError("no rings to benchmark")
+    latencies.sort()
+    return {
+        "polygons": len(latencies),
+        "total": sum(latencies),
+        "mean": mean(latencies),
+        "median": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the per polygon latency on a batch of rectangles."
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1000000,
+        help="Number of rectangles (default: 1000000).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="auto",
+        help="Skeleton engine to use (default: auto).",
+    )
+    args = parser.parse_args()
+    result = benchmark_rectangles(make_rectangles(args.count), engine=args.engine)
+    print(f"engine={args.engine} polygons={result['polygons']} total_time={result['total']:.3f}s")
+    for name in ("mean", "median", "p95"):
+        print(f"{name}_latency={result[name] * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Benchmark on synthetic rectilinear (orthogonal) polygons
+
+Building footprints are mostly rectilinear: all edges are axis aligned, so
+many wavefronts run parallel and the parallel fan handlers are hit often.
+The shapes (L, T, U, comb and staircase) are generated with a given number
+of vertices, from 10 up to 10k.
+"""
+
+import argparse
+import time
+from statistics import mean
+
+from tri.delaunay.helpers import ToPointsAndSegments
+
+from grassfire import ENGINES, calc_skel
+
+
+SHAPES = ("L", "T", "U", "comb", "staircase")
+SIZES = (10, 100, 1000, 10000)
+
+# base outlines (counterclockwise) that get notches along their edges
+BASE_RINGS = {
+    "L": [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)],
+    "T": [(1, 0), (2, 0), (2, 2), (3, 2), (3, 3), (0, 3), (0, 2), (1, 2)],
+    "U": [(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)],
+}
+
+
+def notched_ring(ring, size):
+    """Adds small rectangular notches (outwards) along the edges of an
+    axis aligned ring, until it has about *size* vertices
+
+    The notches are spaced evenly over the whole boundary and stay away from
+    the corners, so that the result is a simple polygon.
+    """
+    count = len(ring)
+    lengths = []
+    for i in range(count):
+        (x0, y0), (x1, y1) = ring[i], ring[(i + 1) % count]
+        lengths.append(abs(x1 - x0) + abs(y1 - y0))
+    notches = max(0, (size - count) // 4)
+    spacing = sum(lengths) / (notches + count)
+    width, depth = spacing * 0.5, spacing * 0.25
+    result = []
+    for i in range(count):
+        (x0, y0), (x1, y1) = ring[i], ring[(i + 1) % count]
+        length = lengths[i]
+        dx, dy = (x1 - x0) / length, (y1 - y0) / length
+        # outwards is to the right of a counterclockwise ring
+        nx, ny = dy, -dx
+        result.append((x0, y0))
+        k = int(length / spacing) - 1
+        if k < 1:
+            continue
+        step = length / (k + 1)
+        for j in range(1, k + 1):
+            a = j * step - width * 0.5
+            b = j * step + width * 0.5
+            result.append((x0 + a * dx, y0 + a * dy))
+            result.append((x0 + a * dx + depth * nx, y0 + a * dy + depth * ny))
+            result.append((x0 + b * dx + depth * nx, y0 + b * dy + depth * ny))
+            result.append((x0 + b * dx, y0 + b * dy))
+    return result
+
+
+def comb_ring(size):
+    """Comb with teeth of width 1, that has about *size* vertices"""
+    teeth = max(1, size // 4)
+    width = 2 * teeth - 1
+    ring = [(0, 0), (width, 0)]
+    for i in reversed(range(teeth)):
+        ring.extend([(2 * i + 1, 4), (2 * i, 4)])
+        if i > 0:
+            ring.extend([(2 * i, 1), (2 * i - 1, 1)])
+    return ring
+
+
+def staircase_ring(size):
+    """Staircase with steps of 1 by 1, that has about *size* vertices"""
+    steps = max(1, size // 2 - 1)
+    ring = [(0, 0), (steps, 0)]
+    for i in range(steps):
+        x = steps - i
+        ring.extend([(x, i + 1), (x - 1, i + 1)])
+    return ring
+
+
+def rectilinear_ring(shape, size):
+    """Returns the (counterclockwise) ring of the rectilinear *shape* with
+    about *size* vertices"""
+    if shape == "comb":
+        return comb_ring(size)
+    elif shape == "staircase":
+        return staircase_ring(size)
+    elif shape in BASE_RINGS:
+        return notched_ring(BASE_RINGS[shape], size)
+    raise ValueError("unknown shape '{}'".format(shape))
+
+
+def make_conv(ring):
+    conv = ToPointsAndSegments()
+    for i in range(len(ring)):
+        conv.add_segment(ring[i], ring[(i + 1) % len(ring)])
+    return conv
+
+
+def benchmark_rectilinear(
+    shapes=SHAPES,
+    sizes=SIZES,
+    repeats=3,
+    engine="triangulation",
+    calc_skel_fn=calc_skel,
+    make_conv_fn=make_conv,
+    timer=time.perf_counter,
+):
+    """Time the skeleton of every shape at every size
+
+    Returns:
+        list of (shape, number of vertices, average time, error) tuples;
+        when the skeleton could not be made, the average time is None and
+        error holds the message
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be >= 1")
+    rows = []
+    for shape in shapes:
+        for size in sizes:
+            ring = rectilinear_ring(shape, size)
+            totals = []
+            error = None
+            for _ in range(repeats):
+                conv = make_conv_fn(ring)
+                start = timer()
+                try:
+                    calc_skel_fn(conv, internal_only=True, engine=engine)
+                except Exception as exc:
+                    error = "{}: {}".format(type(exc).__name__, exc)
+                    break
+                totals.append(timer() - start)
+            avg = None if error is not None else mean(totals)
+            rows.append((shape, len(ring), avg, error))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark skeleton generation on synthetic rectilinear polygons."
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Number of runs to average (default: 3).",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=SHAPES,
+        default=list(SHAPES),
+        help="Shapes to benchmark (default: all).",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(SIZES),
+        help="Approximate number of vertices per shape (default: 10 100 1000 10000).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="triangulation",
+        help="Skeleton engine to use (default: triangulation, the kinetic "
+        "triangulation with its parallel fan handling).",
+    )
+    args = parser.parse_args()
+    rows = benchmark_rectilinear(args.shapes, args.sizes, args.repeats, args.engine)
+    for shape, vertices, avg, error in rows:
+        if error is None:
+            print(f"{shape:10s} vertices={vertices:6d} average_time={avg:.6f}s")
+        else:
+            print(f"{shape:10s} vertices={vertices:6d} failed ({error})")
+
+
+if __name__ == "__main__":
+    main()
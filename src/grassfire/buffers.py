@@ -0,0 +1,73 @@
+"""Input for the skeleton from contiguous coordinate buffers
+
+Rings are given as one (n, 2) float64 array of coordinates (or any object
+that supports the buffer protocol with 2n doubles) together with ring
+offsets: ring i consists of coords[offsets[i]:offsets[i + 1]].  This is the
+layout most GIS readers produce, and it allows to prepare the input for the
+triangulation without building per point Python tuples first.
+"""
+
+import numpy as np
+
+
+def as_ring_arrays(coords, offsets=None):
+    """Returns coordinates as contiguous (n, 2) float64 array and the ring
+    offsets as int64 array of length rings + 1.
+
+    Without offsets, all coordinates are taken to form one ring.
+    """
+    coords = np.ascontiguousarray(np.asarray(coords, dtype=np.float64))
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        coords = coords.reshape(-1, 2)
+    if offsets is None:
+        offsets = np.array([0, len(coords)], dtype=np.int64)
+    else:
+        offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.ndim != 1 or len(offsets) < 2:
+        raise ValueError("offsets should hold at least 2 values")
+    if offsets[0] != 0 or offsets[-1] != len(coords):
+        raise ValueError("offsets should start at 0 and end at the number of coordinates")
+    if np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets should be non-decreasing")
+    return coords, offsets
+
+
+def ring_points_and_segments(coords, offsets=None):
+    """Converts rings to unique points and segments (pairs of point indices)
+
+    Closing coordinates (last equal to first) are dropped, duplicate points
+    are merged (like ToPointsAndSegments does) and zero length segments are
+    skipped.
+
+    Returns:
+        points -- (m, 2) float64 array
+        segments -- (k, 2) int64 array, indices into points
+    """
+    coords, offsets = as_ring_arrays(coords, offsets)
+    starts, ends = offsets[:-1], offsets[1:]
+    lengths = ends - starts
+    # -- drop the closing coordinate of closed rings
+    nonempty = lengths > 0
+    closed = np.zeros(len(lengths), dtype=bool)
+    closed[nonempty] = np.all(
+        coords[ends[nonempty] - 1] == coords[starts[nonempty]], axis=1
+    ) & (lengths[nonempty] > 1)
+    if np.any(closed):
+        keep = np.ones(len(coords), dtype=bool)
+        keep[ends[closed] - 1] = False
+        coords = coords[keep]
+        lengths = lengths - closed
+    lengths = lengths[lengths > 0]
+    if np.any(lengths < 3):
+        raise ValueError("every ring should have at least 3 distinct coordinates")
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    # -- merge duplicate points
+    points, inverse = np.unique(coords, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    # -- segments: every coordinate to the next one in its ring
+    nxt = np.arange(1, len(coords) + 1, dtype=np.int64)
+    nxt[offsets[1:] - 1] = offsets[:-1]
+    segments = np.column_stack((inverse, inverse[nxt]))
+    segments = segments[segments[:, 0] != segments[:, 1]]
+    return points, segments
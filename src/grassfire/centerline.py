@@ -0,0 +1,266 @@
+"""Reduction of the skeleton graph and centerline extraction
+
+For centerlines (of roads, rivers, ...) the full skeleton has too much
+detail: every convex corner of the input sends a branch into the skeleton,
+and where parallel wavefronts are handled the skeleton runs straight on over
+a string of nodes. reduce_graph takes such a graph (see grassfire.graph) and
+
+- prunes the branches that lead to input corners (the leaves of the graph at
+  time 0), shortest first, as long as they are not longer than a threshold.
+  The length of a branch is measured from the junction where it starts to
+  the farthest corner it leads to: once all but one branch at a junction are
+  pruned the junction is an end of the remaining graph, and its branch can
+  be pruned as well. A component is never pruned away completely.
+- merges the chains of edges that run on straight (within an angle) into
+  one edge, so that only the nodes where the skeleton turns or branches are
+  left.
+
+Both steps walk over every edge a bounded number of times. Pruning takes
+the branches that are not longer than the threshold from a heap, shortest
+first: where the last branches of a component meet, this keeps the longest
+one (the order decides which one survives). That is O(n + p log p), with p
+the number of such branches. longest_path finds the longest path in the
+reduced graph and centerline gives the coordinates of that path.
+"""
+
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+from grassfire.graph import SkeletonGraph, make_graph, skeleton_graph
+
+
+Centerline = namedtuple("Centerline", ["coords", "times", "length"])
+Centerline.__doc__ = """Centerline of the skeleton
+
+coords -- (k, 2) float64 array, the nodes of the line (in the input units)
+times -- (k,) float64 array, time at which the wavefront reached the nodes
+         (the distance to the input)
+length -- total length of the line
+"""
+
+
+def reduce_graph(graph, prune_length=0.0, merge_angle=1e-6):
+    """Returns the reduced SkeletonGraph (only the nodes on the remaining
+    edges are kept)
+
+    prune_length -- branches to input corners that are not longer than this
+                    are pruned (by default none are; a large length prunes
+                    the graph down to its last edge)
+    merge_angle -- chains of edges that do not turn more than this (in
+                   radians) at a node are merged into one edge (a negative
+                   angle keeps all nodes)
+    """
+    kept = _prune(graph, prune_length)
+    graph = _subgraph(graph, graph.edges[kept], graph.lengths[kept])
+    edges, lengths = _merge(graph, merge_angle)
+    return _subgraph(graph, edges, lengths)
+
+
+def longest_path(graph):
+    """Returns the nodes on the longest path in graph, as int64 array from
+    the one end to the other
+
+    On a tree the path is found exactly (by walking from any node to the
+    farthest node, and from there to the node farthest from it). A graph
+    with cycles is reduced to a spanning tree first, so the path returned
+    is the longest path in that tree.
+    """
+    count = len(graph.positions)
+    if not len(graph.edges):
+        return np.empty(0, dtype=np.int64)
+    indptr, indices, data = (graph.indptr.tolist(), graph.indices.tolist(),
+                             graph.data.tolist())
+    # spanning forest, from the first node of every component
+    distance = [None] * count
+    parent = [-1] * count
+    roots = []
+    for root in range(count):
+        if distance[root] is None:
+            roots.append(root)
+            _sweep(indptr, indices, data, root, distance, parent)
+    tree = [i for i in range(count) if parent[i] != -1]
+    forest = make_graph(graph.positions, graph.times, graph.infos,
+                        [(i, parent[i]) for i in tree],
+                        [distance[i] - distance[parent[i]] for i in tree])
+    indptr, indices, data = (forest.indptr.tolist(), forest.indices.tolist(),
+                             forest.data.tolist())
+    first = [None] * count
+    second = [None] * count
+    best = None
+    for root in roots:
+        reached = _sweep(indptr, indices, data, root, first, parent)
+        far = max(reached, key=first.__getitem__)
+        reached = _sweep(indptr, indices, data, far, second, parent)
+        other = max(reached, key=second.__getitem__)
+        if best is None or second[other] > second[best[0]]:
+            best = (other, far)
+    # the components do not share nodes: parent still holds the last sweep
+    # of the component of the longest path
+    other, far = best
+    path = [other]
+    while path[-1] != far:
+        path.append(parent[path[-1]])
+    return np.array(path, dtype=np.int64)
+
+
+def centerline(skel, prune_length=0.0, merge_angle=1e-6, tolerance=1e-7):
+    """Returns the centerline of skel (a Skeleton, CompactSkeleton or
+    SkeletonGraph): the longest path in the reduced graph (see reduce_graph
+    and longest_path)"""
+    if not isinstance(skel, SkeletonGraph):
+        skel = skeleton_graph(skel, tolerance)
+    graph = reduce_graph(skel, prune_length, merge_angle)
+    path = longest_path(graph)
+    coords = graph.positions[path]
+    length = float(np.hypot(*np.diff(coords, axis=0).T).sum())
+    return Centerline(coords, graph.times[path], length)
+
+
+def _sweep(indptr, indices, data, start, distance, parent):
+    """Walks over the component of start, setting the distance along the
+    walk (and the node it was reached from) of every node reached
+
+    Nodes are visited once (the first way a node is reached is kept), on a
+    tree this gives the distances along the tree. Returns the nodes reached.
+    """
+    distance[start] = 0.0
+    parent[start] = -1
+    reached = [start]
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if distance[j] is None:
+                distance[j] = distance[i] + data[k]
+                parent[j] = i
+                reached.append(j)
+                stack.append(j)
+    return reached
+
+
+def _prune(graph, prune_length):
+    """Returns the mask of the edges of graph that are kept after pruning
+
+    The branches that are not longer than prune_length (the others are
+    never pruned) wait in a heap, ordered by length: every branch is pushed
+    and popped once (a junction left with one branch adds one more).
+    """
+    indptr, indices, edge_ids = (graph.indptr.tolist(), graph.indices.tolist(),
+                                 graph.edge_ids.tolist())
+    lengths = graph.lengths.tolist()
+    original = np.diff(graph.indptr)
+    degree = original.tolist()
+    kept = [True] * len(lengths)
+
+    def branch(leaf, depth):
+        # from the leaf over the nodes that had 2 edges to the next node
+        # that had not, as (length, leaf, end node, edges)
+        walked = [-1]
+        here = leaf
+        while True:
+            for k in range(indptr[here], indptr[here + 1]):
+                if kept[edge_ids[k]] and edge_ids[k] != walked[-1]:
+                    break
+            walked.append(edge_ids[k])
+            depth += lengths[edge_ids[k]]
+            here = indices[k]
+            if original[here] != 2:
+                return (depth, leaf, here, walked[1:])
+
+    corners = np.flatnonzero((original == 1) & (graph.times <= 0)).tolist()
+    heap = [b for b in (branch(leaf, 0.0) for leaf in corners) if b[0] <= prune_length]
+    heapq.heapify(heap)
+    while heap:
+        length, leaf, end, walked = heapq.heappop(heap)
+        if degree[leaf] != 1 or degree[end] < 2:
+            # leaf already pruned, or the branch is all that is left
+            continue
+        for e in walked:
+            kept[e] = False
+        degree[leaf] = 0
+        degree[end] -= 1
+        if degree[end] == 1:
+            # all but one branch of the junction are gone
+            longer = branch(end, length)
+            if longer[0] <= prune_length:
+                heapq.heappush(heap, longer)
+    return np.array(kept, dtype=bool)
+
+
+def _merge(graph, merge_angle):
+    """Returns the edges (and their lengths) of graph with the chains of
+    edges that run on straight merged"""
+    positions = graph.positions
+    degree = np.diff(graph.indptr)
+    through = np.flatnonzero(degree == 2)
+    first = graph.indptr[through]
+    # angle between the way in and the way out
+    u = positions[through] - positions[graph.indices[first]]
+    v = positions[graph.indices[first + 1]] - positions[through]
+    turn = np.arctan2(np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]),
+                      (u * v).sum(axis=1))
+    merged = np.zeros(len(positions), dtype=bool)
+    # (not where both edges go to the same node)
+    straight = (turn <= merge_angle) & \
+        (graph.indices[first] != graph.indices[first + 1])
+    merged[through[straight]] = True
+    if not merged.any():
+        return graph.edges, graph.lengths
+
+    indptr, indices, edge_ids = (graph.indptr.tolist(), graph.indices.tolist(),
+                                 graph.edge_ids.tolist())
+    lengths = graph.lengths.tolist()
+    merged = merged.tolist()
+    visited = [False] * len(lengths)
+    edges = []
+    new_lengths = []
+
+    def walk(start, k):
+        # from start over edge indices[k] through the merged nodes
+        length = 0.0
+        while True:
+            e = edge_ids[k]
+            visited[e] = True
+            length += lengths[e]
+            here = indices[k]
+            if not merged[here]:
+                break
+            # the other edge of the merged node
+            k = indptr[here] if edge_ids[indptr[here]] != e else indptr[here] + 1
+        if here != start:
+            edges.append((start, here))
+            new_lengths.append(length)
+
+    for start in range(len(merged)):
+        if not merged[start]:
+            for k in range(indptr[start], indptr[start + 1]):
+                if not visited[edge_ids[k]]:
+                    walk(start, k)
+    # cycles of merged nodes only: keep both nodes of one of their edges
+    for e in range(len(lengths)):
+        if not visited[e]:
+            a, b = graph.edges[e].tolist()
+            merged[a] = merged[b] = False
+            for k in range(indptr[a], indptr[a + 1]):
+                if not visited[edge_ids[k]]:
+                    walk(a, k)
+    return edges, new_lengths
+
+
+def _subgraph(graph, edges, lengths):
+    """Returns the SkeletonGraph with the edges of graph given (and only the
+    nodes on them), in the order of skeleton_graph"""
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    order = np.lexsort((edges[:, 1], edges[:, 0]))
+    edges = edges[order]
+    lengths = np.asarray(lengths, dtype=np.float64)[order]
+    used = np.zeros(len(graph.positions), dtype=bool)
+    used[edges.ravel()] = True
+    renumber = np.cumsum(used) - 1
+    nodes = np.flatnonzero(used)
+    return make_graph(graph.positions[nodes], graph.times[nodes],
+                      [graph.infos[i] for i in nodes.tolist()],
+                      renumber[edges], lengths)
@@ -42,6 +42,26 @@ def find_gte(a, x):
     return None
 
 
+def make_event(tri, when, side, tp, reuse=True):
+    """Returns the event record for the triangle, updated in place
+
+    The record of the triangle is reused, unless it is still queued (e.g.
+    when the exact time of a queued recheck event is looked up) or reuse is
+    False (to compare allocations, see benchmark_memory.py).
+    """
+    event = tri.event
+    if not reuse or event is None or event.seq is not None:
+        return Event(when=when, tri=tri, side=side, tp=tp, tri_tp=tri.type)
+    event.time = when
+    event.side = side
+    event.tp = tp
+    event.triangle_tp = tri.type
+    event.since = None
+    event.sieve = None
+    event.had_event = True
+    return event
+
+
 def vertex_crash_time(org, dst, apx):
     """Returns time when vertex crashes on edge.
 
@@ -91,7 +111,7 @@ def area_collapse_times(o, d, a):
     return solution
 
 
-def compute_event_0triangle(tri, now, sieve):
+def compute_event_0triangle(tri, now, sieve, reuse=True):
     assert tri.neighbours.count(None) == 0
     o, d, a = tri.vertices
 
@@ -111,13 +131,13 @@ def compute_event_0triangle(tri, now, sieve):
                     indices.append(i)
             if len(indices) == 1:
                 side = indices[0]
-                return Event(when=now, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, now, (side,), "edge", reuse)
             elif len(indices) == 3:
                 raise ValueError("0-triangle collapsing to point")
             else:
                 largest_dist = max(dists)
                 side = dists.index(largest_dist)
-                return Event(when=now, tri=tri, side=(side,), tp="flip", tri_tp=tri.type)
+                return make_event(tri, now, (side,), "flip", reuse)
 
     times_edge_collapse = [
         collapse_time_edge(o, d),
@@ -162,10 +182,10 @@ def compute_event_0triangle(tri, now, sieve):
             zeros = [near_zero(d - min(dists)) for d in dists]
             sides_collapse = zeros.count(True)
             if sides_collapse == 3:
-                return Event(when=time, tri=tri, side=(0, 1, 2), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (0, 1, 2), "edge", reuse)
             elif sides_collapse == 1:
                 side = zeros.index(True)
-                return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "edge", reuse)
             else:
                 time = time_area_collapse
                 dists = [
@@ -175,7 +195,7 @@ def compute_event_0triangle(tri, now, sieve):
                 ]
                 largest_dist = max(dists)
                 side = dists.index(largest_dist)
-                return Event(when=time, tri=tri, side=(side,), tp="flip", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "flip", reuse)
         elif time_area_collapse < time_edge_collapse:
             logging.debug("area < edge")
             time = time_area_collapse
@@ -186,7 +206,7 @@ def compute_event_0triangle(tri, now, sieve):
             ]
             largest_dist = max(dists)
             side = dists.index(largest_dist)
-            return Event(when=time, tri=tri, side=(side,), tp="flip", tri_tp=tri.type)
+            return make_event(tri, time, (side,), "flip", reuse)
         elif time_edge_collapse is not None:
             logging.debug("edge collapse")
             time = time_edge_collapse
@@ -198,10 +218,10 @@ def compute_event_0triangle(tri, now, sieve):
             zeros = [near_zero(_) for _ in dists]
             sides_collapse = zeros.count(True)
             if sides_collapse == 3:
-                return Event(when=time, tri=tri, side=(0, 1, 2), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (0, 1, 2), "edge", reuse)
             elif sides_collapse == 1:
                 side = zeros.index(True)
-                return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "edge", reuse)
             else:
                 raise ValueError("can this happen?")
 
@@ -217,10 +237,10 @@ def compute_event_0triangle(tri, now, sieve):
             zeros = [near_zero(_) for _ in dists]
             sides_collapse = zeros.count(True)
             if sides_collapse == 3:
-                return Event(when=time, tri=tri, side=(0, 1, 2), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (0, 1, 2), "edge", reuse)
             elif sides_collapse == 1:
                 side = zeros.index(True)
-                return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "edge", reuse)
             else:
                 raise ValueError(
                     "0 triangle with 2 or 0 side collapse,"
@@ -235,12 +255,12 @@ def compute_event_0triangle(tri, now, sieve):
             ]
             largest_dist = max(dists)
             side = dists.index(largest_dist)
-            return Event(when=time, tri=tri, side=(side,), tp="flip", tri_tp=tri.type)
+            return make_event(tri, time, (side,), "flip", reuse)
         else:
             raise ValueError("problem!!!")
 
 
-def compute_event_1triangle(tri, now, sieve):
+def compute_event_1triangle(tri, now, sieve, reuse=True):
     assert tri.neighbours.count(None) == 1
     wavefront_side = tri.neighbours.index(None)
 
@@ -270,7 +290,7 @@ def compute_event_1triangle(tri, now, sieve):
                     indices.append(i)
             if len(indices) == 1:
                 side = indices[0]
-                return Event(when=now, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, now, (side,), "edge", reuse)
 
             dists = [
                 math.sqrt(d.distance2_at(a, time)),
@@ -279,7 +299,7 @@ def compute_event_1triangle(tri, now, sieve):
             ]
             longest_side = dists.index(max(dists))
             tp = "split" if longest_side == wavefront_side else "flip"
-            return Event(when=time, tri=tri, side=(longest_side,), tp=tp, tri_tp=tri.type)
+            return make_event(tri, time, (longest_side,), tp, reuse)
 
     time_vertex_crash = sieve(times_vertex_crash, now)
     logging.debug("time vertex crash " + str(time_vertex_crash))
@@ -306,13 +326,7 @@ def compute_event_1triangle(tri, now, sieve):
         if time is None:
             return None
         elif near_zero(time - now) is True:
-            return Event(
-                when=now,
-                tri=tri,
-                side=(wavefront_side,),
-                tp="split",
-                tri_tp=tri.type,
-            )
+            return make_event(tri, now, (wavefront_side,), "split", reuse)
         else:
             dists = [
                 d.distance2_at(a, time) if tri.neighbours[0] is not None else -1,
@@ -321,7 +335,7 @@ def compute_event_1triangle(tri, now, sieve):
             ]
             logging.debug(" {}".format(dists))
             sides = (dists.index(max(dists)),)
-            return Event(when=time, tri=tri, side=sides, tp="flip", tri_tp=tri.type)
+            return make_event(tri, time, sides, "flip", reuse)
 
     elif time_edge_collapse is None and time_vertex_crash is not None:
         logging.debug(" case B, time vertex crash " + str(time_vertex_crash))
@@ -351,32 +365,20 @@ def compute_event_1triangle(tri, now, sieve):
             if near_zero(_ - max(dists)):
                 longest.append(i)
         if wavefront_side in longest and len(longest) == 1:
-            return Event(
-                when=time_vertex_crash,
-                tri=tri,
-                side=(wavefront_side,),
-                tp="split",
-                tri_tp=tri.type,
-            )
+            return make_event(tri, time_vertex_crash, (wavefront_side,), "split", reuse)
         else:
             zeros = [near_zero(_) for _ in dists]
             sides_collapse = zeros.count(True)
             if sides_collapse == 1:
                 sides = (dists.index(min(dists)),)  # shortest side
-                return Event(when=time, tri=tri, side=sides, tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, sides, "edge", reuse)
             else:
                 sides = (dists.index(max(dists)),)  # longest side
-                return Event(when=time, tri=tri, side=sides, tp="flip", tri_tp=tri.type)
+                return make_event(tri, time, sides, "flip", reuse)
 
     elif time_edge_collapse is not None and time_vertex_crash is None:
         logging.debug(" case C")
-        return Event(
-            when=time_edge_collapse,
-            tri=tri,
-            side=(wavefront_side,),
-            tp="edge",
-            tri_tp=tri.type,
-        )
+        return make_event(tri, time_edge_collapse, (wavefront_side,), "edge", reuse)
 
     elif time_edge_collapse is not None and time_vertex_crash is not None:
         logging.debug(" case D")
@@ -393,7 +395,7 @@ def compute_event_1triangle(tri, now, sieve):
             sides = [dists_squared.index(min(dists_squared))]
             assert len(sides) == 1
             tp = "edge"
-            return Event(when=time, tri=tri, side=sides, tp=tp, tri_tp=tri.type)
+            return make_event(tri, time, sides, tp, reuse)
 
         elif time_vertex_crash < time_edge_collapse:
             logging.debug("vertex crash time strictly earlier than time edge collapse")
@@ -419,14 +421,14 @@ def compute_event_1triangle(tri, now, sieve):
                 max_dist_side = dists.index(max_dist)
                 tp = "split" if tri.neighbours[max_dist_side] is None else "flip"
                 sides = (max_dist_side,)
-            return Event(when=time, tri=tri, side=sides, tp=tp, tri_tp=tri.type)
+            return make_event(tri, time, sides, tp, reuse)
         else:
             raise NotImplementedError("Problem, unforeseen configuration")
 
     raise NotImplementedError("Problem, unforeseen configuration")
 
 
-def compute_event_2triangle(tri, now, sieve):
+def compute_event_2triangle(tri, now, sieve, reuse=True):
     assert tri.neighbours.count(None) == 2
     o, d, a = tri.vertices
     times = []
@@ -457,19 +459,19 @@ def compute_event_2triangle(tri, now, sieve):
         sides_collapse = zeros.count(True)
         if sides_collapse == 3:
             sides = tuple(range(3))
-            return Event(when=time, tri=tri, side=sides, tp="edge", tri_tp=tri.type)
+            return make_event(tri, time, sides, "edge", reuse)
         elif sides_collapse == 2:
             raise ValueError("This is not possible with this type of triangle [{}]".format(tri.info))
         elif sides_collapse == 1:
             side = dists.index(min(dists))
-            return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+            return make_event(tri, time, (side,), "edge", reuse)
         elif sides_collapse == 0:
             return None
     else:
         return None
 
 
-def compute_event_3triangle(tri, now, sieve):
+def compute_event_3triangle(tri, now, sieve, reuse=True):
     a, o, d = tri.vertices
     t_e_c = [
         collapse_time_edge(o, d),
@@ -511,16 +513,16 @@ def compute_event_3triangle(tri, now, sieve):
                 "3-triangle: override # of sides collapsing -- instead of 2, we collapse all 3"
             )
             sides = list(range(3))
-        return Event(when=time_edge_collapse, tri=tri, side=sides, tp="edge", tri_tp=tri.type)
+        return make_event(tri, time_edge_collapse, sides, "edge", reuse)
     elif time_area_collapse:
         logging.error("3-triangle: using area collapse time as fall back not to miss out")
         sides = list(range(3))
-        return Event(when=time_area_collapse, tri=tri, side=sides, tp="edge", tri_tp=tri.type)
+        return make_event(tri, time_area_collapse, sides, "edge", reuse)
     else:
         return None
 
 
-def compute_event_inftriangle(tri, now, sieve):
+def compute_event_inftriangle(tri, now, sieve, reuse=True):
     for inf_idx, v in enumerate(tri.vertices):
         if isinstance(v, InfiniteVertex):
             break
@@ -537,7 +539,7 @@ def compute_event_inftriangle(tri, now, sieve):
             dist = o.distance2_at(d, time)
             logging.debug(dist)
             if near_zero(dist):
-                return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "edge", reuse)
             else:
                 return None
     else:
@@ -546,7 +548,7 @@ def compute_event_inftriangle(tri, now, sieve):
         if time:
             dist = o.distance2_at(d, time)
             if near_zero(dist):
-                return Event(when=time, tri=tri, side=(side,), tp="edge", tri_tp=tri.type)
+                return make_event(tri, time, (side,), "edge", reuse)
             else:
                 tp = "flip"
                 dists = []
@@ -555,11 +557,11 @@ def compute_event_inftriangle(tri, now, sieve):
                     dists.append(start.distance2_at(end, time))
                 idx = dists.index(min(dists))
                 min_dist_side = [cw, ccw][idx](side)
-                return Event(when=time, tri=tri, side=(min_dist_side,), tp=tp, tri_tp=tri.type)
+                return make_event(tri, time, (min_dist_side,), tp, reuse)
     return None
 
 
-def compute_collapse_time(tri, now=0, sieve=find_gte):
+def compute_collapse_time(tri, now=0, sieve=find_gte, reuse=True):
     """Computes Event that represents how a triangle collapses at a given time."""
     event = None
     if tri.stops_at is not None:
@@ -571,16 +573,16 @@ def compute_collapse_time(tri, now=0, sieve=find_gte):
         tp = tri.type
         if tp == 0:
             logging.debug(" event for 0-triangle")
-            event = compute_event_0triangle(tri, now, sieve)
+            event = compute_event_0triangle(tri, now, sieve, reuse)
         elif tp == 1:
             logging.debug(" event for 1-triangle")
-            event = compute_event_1triangle(tri, now, sieve)
+            event = compute_event_1triangle(tri, now, sieve, reuse)
         elif tp == 2:
             logging.debug(" event for 2-triangle")
-            event = compute_event_2triangle(tri, now, sieve)
+            event = compute_event_2triangle(tri, now, sieve, reuse)
         elif tp == 3:
             logging.debug(" event for 3-triangle")
-            event = compute_event_3triangle(tri, now, sieve)
+            event = compute_event_3triangle(tri, now, sieve, reuse)
 
         if event is not None and all(not v.inf_fast for v in tri.vertices) is True:
             assert event is not None
@@ -603,7 +605,7 @@ def compute_collapse_time(tri, now=0, sieve=find_gte):
     else:
         logging.debug("")
         logging.debug("=-=-= infinite triangle #{} [{}] =-=-=".format(id(tri), tri.info))
-        event = compute_event_inftriangle(tri, now, sieve)
+        event = compute_event_inftriangle(tri, now, sieve, reuse)
 
     if event is not None:
         tri.event = event
@@ -612,11 +614,54 @@ def compute_collapse_time(tri, now=0, sieve=find_gte):
     return event
 
 
+def collapse_time_lower_bound(tri, now):
+    """Conservative lower bound on the time at which the finite triangle
+    collapses, None if no (useful) bound can be given
+
+    Every event makes the triangle degenerate, i.e. one of its vertices ends
+    up on the opposite side. At time now every vertex is at least the
+    smallest height (2 * area / longest side) away from the opposite side,
+    and this distance shrinks at most twice as fast as the fastest vertex.
+    """
+    if not tri.is_finite or any(v.inf_fast for v in tri.vertices):
+        return None
+    speed = max(norm(v.velocity) for v in tri.vertices)
+    if near_zero(speed):
+        return None
+    (ax, ay), (bx, by), (cx, cy) = [v.position_at(now) for v in tri.vertices]
+    area2 = abs((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+    longest = max(math.hypot(bx - ax, by - ay),
+                  math.hypot(cx - bx, cy - by),
+                  math.hypot(ax - cx, ay - cy))
+    if near_zero(longest):
+        return None
+    return now + area2 / longest / (2.0 * speed)
+
+
+def compute_lazy_collapse_time(tri, now=0, sieve=find_gte, reuse=True):
+    """As compute_collapse_time, but for a triangle that collapses clearly
+    later than now, only a recheck event at the lower bound of its collapse
+    time is made (and the exact event is computed when the loop reaches it)
+    """
+    if tri.stops_at is not None:
+        return None
+    bound = collapse_time_lower_bound(tri, now)
+    if bound is None or near_zero(bound - now):
+        return compute_collapse_time(tri, now, sieve, reuse)
+    had_event = tri.event is not None
+    event = make_event(tri, bound, None, "recheck", reuse)
+    event.since = now
+    event.sieve = sieve
+    event.had_event = had_event
+    tri.event = event
+    return event
+
+
 # FIXME: Rename method
 # it does not compute collapse time, it computes a new event
 # at a given time, the triangle should collapse, but which sides ??
 # also the type should probably be considered -> could lead to split of 2-triangle (parallel fan)
-def compute_new_edge_collapse_event(tri, time):
+def compute_new_edge_collapse_event(tri, time, reuse=True):
     """Compute new edge event for triangle that collapse at time.
 
     Somehow we know that one or more of the edges of this triangle do collapse at this moment.
@@ -639,7 +684,7 @@ def compute_new_edge_collapse_event(tri, time):
     for i, zero in enumerate(zeros):
         if zero is True:
             sides.append(i)
-    return Event(when=time, tri=tri, side=sides, tp="edge", tri_tp=tri.type)
+    return make_event(tri, time, sides, "edge", reuse)
 
 
 def collapse_time_edge(v1, v2):
@@ -0,0 +1,139 @@
+"""Compact, immutable result of the skeleton computation
+
+The Skeleton that the event loop works on keeps the kinetic vertices (with
+their wavefronts and neighbour histories) and skeleton nodes as Python
+objects.  Most users only need the nodes and the segments between them, so
+compact_skeleton copies those into arrays, after which the Skeleton (and all
+kinetic scaffolding it refers to) can be dropped:
+
+    positions -- (n, 2) float64 array, node coordinates (original box)
+    times -- (n,) float64 array, time at which the wavefront reached the node
+             (distance to the input, in the units of the input)
+    infos -- tuple of length n, info of the node (None for most nodes)
+    segments -- (m, 2) int64 array, start and end node of the segments
+    rays -- (k,) int64 array, start node of the vertices that never stop
+            (only in the skeleton outside the input)
+    ray_directions -- (k, 2) float64 array, velocity of those vertices
+
+The memory a CompactSkeleton holds is proportional to its output only.
+"""
+
+import numpy as np
+
+
+class CompactSkeleton(object):
+    """Nodes and segments of a skeleton in read-only arrays"""
+
+    __slots__ = ("positions", "times", "infos", "segments", "rays",
+                 "ray_directions", "timings", "event_counts")
+
+    def __init__(self, positions, times, infos, segments, rays=None,
+                 ray_directions=None, timings=None, event_counts=None):
+        if rays is None:
+            rays = np.empty(0, dtype=np.int64)
+        if ray_directions is None:
+            ray_directions = np.empty((0, 2), dtype=np.float64)
+        values = {
+            "positions": _frozen(positions, np.float64, (-1, 2)),
+            "times": _frozen(times, np.float64, (-1,)),
+            "infos": tuple(infos),
+            "segments": _frozen(segments, np.int64, (-1, 2)),
+            "rays": _frozen(rays, np.int64, (-1,)),
+            "ray_directions": _frozen(ray_directions, np.float64, (-1, 2)),
+            "timings": dict(timings or {}),
+            "event_counts": dict(event_counts or {}),
+        }
+        if len(values["times"]) != len(values["positions"]) or \
+                len(values["infos"]) != len(values["positions"]):
+            raise ValueError("positions, times and infos should have the same length")
+        if len(values["rays"]) != len(values["ray_directions"]):
+            raise ValueError("rays and ray_directions should have the same length")
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactSkeleton is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CompactSkeleton is immutable")
+
+    def __reduce__(self):
+        return CompactSkeleton, tuple(getattr(self, name) for name in self.__slots__)
+
+    def __len__(self):
+        """Number of (finite) segments"""
+        return len(self.segments)
+
+    def segments_list(self, ray_until=1000.0):
+        """Returns the segments in the format of Skeleton.segments:
+
+            [((start, end), (start info, end info)), ...]
+
+        Rays are cut off at time ray_until (in the units of the input).
+        """
+        pos = self.positions.tolist()
+        infos = self.infos
+        result = [((tuple(pos[a]), tuple(pos[b])), (infos[a], infos[b]))
+                  for a, b in self.segments.tolist()]
+        for node, (dx, dy) in zip(self.rays.tolist(), self.ray_directions.tolist()):
+            x, y = pos[node]
+            dt = ray_until - self.times[node]
+            result.append((((x, y), (x + dt * dx, y + dt * dy)), (infos[node], None)))
+        return result
+
+
+def _frozen(values, dtype, shape):
+    array = np.array(values, dtype=dtype).reshape(shape)
+    array.flags.writeable = False
+    return array
+
+
+def compact_skeleton(skel):
+    """Copies the nodes and segments of skel into a CompactSkeleton
+
+    Segments of vertices that start and stop at the same node are skipped
+    (as Skeleton.segments does).  Node positions and times are transformed
+    back to the box of the input when skel has a transform.
+    """
+    index = {}
+    nodes = []
+
+    def node_index(node, time):
+        i = index.get(id(node))
+        if i is None:
+            i = index[id(node)] = len(nodes)
+            nodes.append([node, time if node.time is None else node.time])
+        elif nodes[i][1] is None:
+            nodes[i][1] = time
+        return i
+
+    for node in skel.sk_nodes:
+        node_index(node, None)
+    segments = []
+    rays = []
+    directions = []
+    for v in skel.vertices:
+        start = node_index(v.start_node, v.starts_at)
+        if v.stops_at is not None:
+            stop = node_index(v.stop_node, v.stops_at)
+            if start != stop:
+                segments.append((start, stop))
+        else:
+            rays.append(start)
+            directions.append((0.0, 0.0) if v.inf_fast else v.velocity)
+
+    scale = skel.transform.scale[0] if skel.transform is not None else 1.0
+    positions = np.array([node.pos for node, _ in nodes], dtype=np.float64).reshape(-1, 2)
+    if skel.transform is not None:
+        positions = skel.transform.backward_array(positions)
+    times = np.array([np.nan if t is None else t for _, t in nodes], dtype=np.float64)
+    return CompactSkeleton(
+        positions,
+        times * scale,
+        [node.info for node, _ in nodes],
+        segments,
+        rays,
+        directions,
+        getattr(skel, "timings", None),
+        getattr(skel, "event_counts", None),
+    )
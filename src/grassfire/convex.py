@@ -0,0 +1,256 @@
+"""Straight skeleton of a convex polygon, without kinetic triangulation
+
+Inside a convex polygon no split events can happen: every event is the
+collapse of a wavefront edge between two neighbouring kinetic vertices.
+The events can thus be processed with a priority queue of edge collapse
+times over the circular list of kinetic vertices (no triangulation and no
+flip events are needed).
+
+The resulting Skeleton has the same kinetic vertices / skeleton nodes as
+the one of the triangulation based engine, so Skeleton.segments() and the
+output functions can be used as is.
+
+Triangles and rectangles, the most common small inputs, are solved in
+closed form (incenter, ridge between the short sides) without any queue.
+"""
+
+import heapq
+import logging
+import math
+
+from grassfire.calc import near_zero
+from grassfire.events.lib import compute_new_kvertex, update_circ
+from grassfire.primitives import SkeletonNode
+from grassfire.rings import (
+    edge_collapse_time,
+    init_ring_skeleton,
+    ridge_kvertex,
+    ring_from_segments,
+    same_location,
+    stop_vertices,
+)
+
+
+def is_convex_ring(points, ring):
+    """Whether every vertex of the counterclockwise ring makes a strict left
+    turn (i.e. all kinetic vertices would be "LEFT - CONVEX")"""
+    count = len(ring)
+    for i in range(count):
+        (ax, ay) = points[ring[i - 1]]
+        (bx, by) = points[ring[i]]
+        (cx, cy) = points[ring[(i + 1) % count]]
+        if (bx - ax) * (cy - by) - (by - ay) * (cx - bx) <= 0:
+            return False
+    return True
+
+
+def convex_ring(points, segments):
+    """Returns the counterclockwise ring of point indices if the segments
+    form one convex polygon, None otherwise"""
+    ring = ring_from_segments(points, segments)
+    if ring is not None and is_convex_ring(points, ring):
+        return ring
+    return None
+
+
+def init_convex_skeleton(points, ring, infos=None):
+    """Makes the skeleton nodes and the circular list of kinetic vertices for
+    the counterclockwise, convex ring (indices into points)"""
+    return init_ring_skeleton(points, [ring], infos)
+
+
+def _collapse_edge(skel, v1, v2, now, step, made_now):
+    """Edge event: v1 and v2 (its right neighbour) stop, a new vertex
+    continues between the left neighbour of v1 and the right one of v2
+
+    Returns:
+        the new kinetic vertex
+    """
+    v0 = v1.left
+    v3 = v2.right
+    sk_node = stop_vertices([v1, v2], step, now, skel, made_now)
+    pair = skel.wavefront_pairs[v1.wfl, v2.wfr]
+    kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node,
+                             len(skel.vertices) + 1, True, pair=pair)
+    kv.wfl = v1.wfl
+    kv.wfr = v2.wfr
+    kv.turn = "LEFT - CONVEX"
+    skel.vertices.append(kv)
+    update_circ(v0, kv, now)
+    update_circ(kv, v3, now)
+    return kv
+
+
+def _finish_ridge(skel, now):
+    """Two vertices with parallel (opposite) wavefronts remain, the last made
+    vertex started at the end of the ridge between them"""
+    last = skel.vertices[-1]
+    other = last.left
+    for v in (other, last):
+        v.stop_node = last.start_node
+        v.stops_at = now
+    skel.stopped((other, last))
+
+
+def _side(p, q):
+    return q[0] - p[0], q[1] - p[1]
+
+
+def is_rectangle(skel):
+    """Whether the 4 kinetic vertices of the skeleton form a rectangle"""
+    if len(skel.vertices) != 4:
+        return False
+    for v in skel.vertices:
+        a = _side(v.left.origin, v.origin)
+        b = _side(v.origin, v.right.origin)
+        length = math.hypot(*a) * math.hypot(*b)
+        if not near_zero((a[0] * b[0] + a[1] * b[1]) / length):
+            return False
+    return True
+
+
+def _solve_triangle(skel):
+    """All three vertices meet at the incenter, at time inradius"""
+    V = skel.vertices
+    perimeter = 0.0
+    sumx, sumy = 0.0, 0.0
+    area = 0.0
+    for v in V:
+        # the side opposite of v weighs its corner
+        p, q = v.right.origin, v.left.origin
+        opposite = math.hypot(*_side(p, q))
+        perimeter += opposite
+        sumx += opposite * v.origin[0]
+        sumy += opposite * v.origin[1]
+        area += p[0] * q[1] - q[0] * p[1]
+    now = abs(area) / perimeter
+    sk_node = SkeletonNode(pos=(sumx / perimeter, sumy / perimeter), step=1,
+                           time=now)
+    skel.sk_nodes.append(sk_node)
+    for v in V:
+        v.stop_node = sk_node
+        v.stops_at = now
+    skel.stopped(V)
+    skel.event_counts = {"edge": 1, "flip": 0, "split": 0}
+    return now
+
+
+def _solve_rectangle(skel):
+    """The short sides collapse at half the width, the ridge in between
+    connects their collapse points (for a square both are the center)"""
+    V = skel.vertices
+    # first, the vertex at the start of a short side
+    if math.hypot(*_side(V[0].origin, V[1].origin)) > math.hypot(
+        *_side(V[1].origin, V[2].origin)
+    ):
+        V = V[1:] + V[:1]
+    width = math.hypot(*_side(V[0].origin, V[1].origin))
+    length = math.hypot(*_side(V[1].origin, V[2].origin))
+    now = width * 0.5
+    if near_zero(length - width):
+        sk_node = SkeletonNode(pos=V[0].position_at(now), step=1, time=now)
+        skel.sk_nodes.append(sk_node)
+        stops = [(v, sk_node) for v in V]
+        events = 1
+    else:
+        start = SkeletonNode(pos=V[0].position_at(now), step=1, time=now)
+        end = SkeletonNode(pos=V[2].position_at(now), step=2, time=now)
+        skel.sk_nodes.extend((start, end))
+        first = ridge_kvertex(skel, V[0], V[1], now, start)
+        last = ridge_kvertex(skel, V[2], V[3], now, end)
+        first.left, first.right = (last, now), (last, now)
+        last.left, last.right = (first, now), (first, now)
+        V[3].right = first, now
+        V[2].left = first, now
+        stops = [(V[0], start), (V[1], start), (V[2], end), (V[3], end),
+                 (first, end), (last, end)]
+        events = 2
+    for v, sk_node in stops:
+        v.stop_node = sk_node
+        v.stops_at = now
+    skel.stopped([v for v, _ in stops])
+    skel.event_counts = {"edge": events, "flip": 0, "split": 0}
+    return now
+
+
+def convex_event_loop(skel, closed_form=True, capture=None):
+    """Processes the edge collapses of the convex wavefront in time order
+
+    With closed_form, triangles and rectangles are solved directly (not when
+    the wavefront is recorded with a WavefrontCapture, see
+    grassfire.snapshots).
+
+    Returns:
+        time of the last event
+    """
+    if closed_form and capture is None:
+        if len(skel.vertices) == 3:
+            return _solve_triangle(skel)
+        elif is_rectangle(skel):
+            return _solve_rectangle(skel)
+    queue = []
+    counter = 0
+
+    def schedule(v1, v2, now):
+        nonlocal counter
+        time = edge_collapse_time(v1, v2, now)
+        if time is not None:
+            counter += 1
+            heapq.heappush(queue, (time, counter, v1, v2))
+
+    for kv in skel.vertices:
+        schedule(kv, kv.right, 0.0)
+
+    remaining = len(skel.vertices)
+    now = 0.0
+    step = 0
+    events = 0
+    made_now = []  # skeleton nodes made at time now
+    while queue and remaining > 2:
+        time, _, v1, v2 = heapq.heappop(queue)
+        # events of vertices that were stopped already are outdated
+        if v1.stops_at is not None or v2.stops_at is not None or v1.right is not v2:
+            continue
+        if capture is not None:
+            capture.advance(skel, time)
+        if not near_zero(time - now):
+            made_now = []
+        now = time
+        step += 1
+        events += 1
+        v3 = v2.right
+        if remaining == 3:
+            # the last triangle: when its third vertex is at the same
+            # location, the wavefront collapses to a point (peak)
+            if same_location(v1.position_at(now), v3.position_at(now)):
+                stop_vertices([v1, v2, v3], step, now, skel, made_now)
+                remaining = 0
+                break
+        kv = _collapse_edge(skel, v1, v2, now, step, made_now)
+        remaining -= 1
+        schedule(kv.left, kv, now)
+        schedule(kv, v3, now)
+    if remaining == 2:
+        _finish_ridge(skel, now)
+        remaining = 0
+    if remaining:
+        raise ValueError(
+            "convex wavefront did not collapse, {} vertices left".format(remaining)
+        )
+    if capture is not None:
+        capture.finish(skel)
+    skel.event_counts = {"edge": events, "flip": 0, "split": 0}
+    logging.debug("convex skeleton: {} events".format(events))
+    return now
+
+
+def convex_skeleton(points, ring, infos=None):
+    """Computes the straight skeleton inside the convex polygon given by the
+    counterclockwise ring of point indices
+
+    Returns:
+        skel -- skeleton structure
+    """
+    skel = init_convex_skeleton(points, ring, infos)
+    convex_event_loop(skel)
+    return skel
@@ -5,9 +5,9 @@ from tri.delaunay.tds import cw, ccw, Edge
 
 from grassfire.events.lib import stop_kvertices, compute_new_kvertex, \
     update_circ, replace_kvertex, schedule_immediately, near_zero
-from grassfire.events.lib import get_fan, is_infinitely_fast
+from grassfire.events.lib import get_fan, is_infinitely_fast, get_wavefront_pair
 from grassfire.events.parallel import handle_parallel_fan
-from grassfire.line2d import WaveFrontIntersector
+from grassfire.line2d import LineLineIntersectionResult
 
 
 # ------------------------------------------------------------------------------
@@ -49,9 +49,8 @@ def handle_edge_event(evt, step, skel, queue, immediate, pause):
         assert v2.wfl is b
     c = v2.wfr
     #
-    intersector = WaveFrontIntersector(a, c)
-    bi = intersector.get_bisector()
-    logging.debug(bi)
+    pair = get_wavefront_pair(skel, a, c)
+    logging.debug(pair.bisector)
     # in general position the new position of the node can be constructed by intersecting 3 pairs of wavefronts
     # (a,c), (a,b), (b,c)
     # in case (a,c) are parallel, this is new infinitely fast vertex and triangles are locked between
@@ -59,12 +58,10 @@ def handle_edge_event(evt, step, skel, queue, immediate, pause):
     # in case (a,b) are parallel, then v1 is straight -- no turn
     # in case (b,c) are parallel, then v2 is straight -- no turn
     pos_at_now = None
-    try:
-        intersector = WaveFrontIntersector(a, c)
-        pos_at_now = intersector.get_intersection_at_t(now)
+    status, x, y = pair.intersection_at_t(now)
+    if status == LineLineIntersectionResult.POINT:
+        pos_at_now = (x, y)
         logging.debug("POINT({0[0]} {0[1]});a;c".format(pos_at_now))
-    except ValueError:
-        pass
     # iff the wavefronts wfl/wfr are parallel
     # then only the following 2 pairs of wavefronts can be properly intersected!
     # try:
@@ -83,10 +80,10 @@ def handle_edge_event(evt, step, skel, queue, immediate, pause):
     # ⋮
     # +--- new use of wavefronts ------------------------------ #
 
-    sk_node, newly_made = stop_kvertices([v1, v2], step, now, pos=pos_at_now)
+    sk_node, newly_made = stop_kvertices([v1, v2], step, now, pos=pos_at_now, skel=skel)
     if newly_made:
         skel.sk_nodes.append(sk_node)
-    kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node, len(skel.vertices) + 1, v1.internal or v2.internal, pause)
+    kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node, len(skel.vertices) + 1, v1.internal or v2.internal, pause, pair)
 
     # ---- new use of wavefronts ---------- #
     kv.wfl = v1.wfl                         #
@@ -201,7 +198,7 @@ def handle_edge_event(evt, step, skel, queue, immediate, pause):
     if n is not None:
         logging.debug("*** neighbour n: schedule adjacent neighbour for *IMMEDIATE* processing")
         n.neighbours[n.neighbours.index(t)] = None
-        if n.event is not None and n.stops_at is None:
+        if queue.has_event(n) and n.stops_at is None:
             schedule_immediately(n, now, queue, immediate)
 
 #    if t.info == 134:
@@ -248,12 +245,12 @@ def handle_edge_event_3sides(evt, step, skel, queue, immediate):
     assert len(evt.side) == 3
     # we stop the vertices always at the same geometric location
     # This means that the triangle collapse leads to 1 point
-    sk_node, newly_made = stop_kvertices(t.vertices, step, now)
+    sk_node, newly_made = stop_kvertices(t.vertices, step, now, skel=skel)
     if newly_made:
         skel.sk_nodes.append(sk_node)
     # get neighbours around collapsing triangle, if any, and schedule them
     for n in t.neighbours:
-        if n is not None and n.event is not None and n.stops_at is None:
+        if n is not None and queue.has_event(n) and n.stops_at is None:
             n.neighbours[n.neighbours.index(t)] = None
             schedule_immediately(n, now, queue, immediate)
     # we "remove" the triangle itself
@@ -280,7 +277,7 @@ def handle_edge_event_1side(evt, step, skel, queue, immediate, pause):
     v2 = t.vertices[cw(e)]
     # stop the two vertices of this edge and make new skeleton node
     # replace 2 vertices with new kinetic vertex
-    sk_node, newly_made = stop_kvertices([v1, v2], step, now)
+    sk_node, newly_made = stop_kvertices([v1, v2], step, now, skel=skel)
     if newly_made:
         skel.sk_nodes.append(sk_node)
     kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node, len(skel.vertices) + 1, v1.internal or v2.internal, pause)
@@ -292,7 +289,7 @@ def handle_edge_event_1side(evt, step, skel, queue, immediate, pause):
     logging.debug(kv.position_at(now+1))
     # append to skeleton structure, new kinetic vertex
     skel.vertices.append(kv)
-    sk_node, newly_made = stop_kvertices([v0, kv], step, now)
+    sk_node, newly_made = stop_kvertices([v0, kv], step, now, skel=skel)
     if newly_made:
         skel.sk_nodes.append(sk_node)
     # we "remove" the triangle itself
@@ -22,12 +22,15 @@ def is_infinitely_fast(fan, now):
         return False
 
 
-def stop_kvertices(V, step, now, pos=None):
+def stop_kvertices(V, step, now, pos=None, skel=None):
     """ Stop a list of kinetic vertices *V* at time *now*, creating a new node.
 
     If one of the vertices was already stopped before, at a node, use that
     skeleton node
 
+    The vertices that were not stopped yet are passed to skel.stopped (if
+    skel is given).
+
     Returns tuple of (new node, False) in case all vertices are stopped for the
     first time, otherwise it returns (node, True) to indicate that were already
     stopped once.
@@ -37,6 +40,7 @@ def stop_kvertices(V, step, now, pos=None):
     # at more or less the same location
 #     assert at_same_location(V, now)
     sk_node = None
+    fresh = [v for v in V if v.stops_at is None]
 
     logging.debug("stopping kinetic vertices, @t:={}".format(now))
     for v in V:
@@ -85,7 +89,7 @@ def stop_kvertices(V, step, now, pos=None):
 #            assert dy, y - pos[1]
         else:
             logging.debug("Make new skeleton node - using external position: {}".format(pos))
-        sk_node = SkeletonNode(pos, step)
+        sk_node = SkeletonNode(pos, step, time=now)
         for v in V:
             v.stop_node = sk_node
         is_new_node = True
@@ -114,13 +118,18 @@ def stop_kvertices(V, step, now, pos=None):
         # or do we keep a topological tree of events (where nodes
         # can be embedded at same location) ???
         # assert not at_same_location([v.start_node, v.stop_node], now), "stopped nodes should be different, but are not for {0}".format(id(v))
+    if skel is not None:
+        skel.stopped(fresh)
     return sk_node, is_new_node
 
 
-def compute_new_kvertex(ul, ur, now, sk_node, info, internal, pause=False):
+def compute_new_kvertex(ul, ur, now, sk_node, info, internal, pause=False, pair=None):
     """Based on the two wavefront directions and time t=now, compute the
     velocity and position at t=0 and return a new kinetic vertex
 
+    If the WaveFrontPair of the wavefronts that ul and ur support is given,
+    its solved intersection is used instead of intersecting ul and ur again.
+
     Returns: KineticVertex
     """
     kv = KineticVertex()
@@ -170,20 +179,22 @@ def compute_new_kvertex(ul, ur, now, sk_node, info, internal, pause=False):
         logging.debug(" OVERRULED - vectors cancel each other out / angle ~180° -> parallel wavefront!")
         bi = (0, 0)
     else:
-        from grassfire.line2d import (LineLineIntersectionResult,
-                                      LineLineIntersector, make_vector)
-        intersect = LineLineIntersector(ul, ur)
-        tp = intersect.intersection_type()
+        from grassfire.line2d import LineLineIntersectionResult, intersect_at_time
+        if pair is not None and pair.left.line is ul and pair.right.line is ur:
+            tp = pair.tp
+        else:
+            pair = None
+            tp, x0, y0 = intersect_at_time(ul, ur, 0.0)
         if tp == LineLineIntersectionResult.NO_INTERSECTION:
             bi = (0, 0)
+        elif tp == LineLineIntersectionResult.POINT and pair is not None:
+            pos_at_t0 = pair.point
+            bi = pair.bisector
         elif tp == LineLineIntersectionResult.POINT:
-            pos_at_t0 = intersect.result
-            ul_t = ul.translated(ul.w)
-            ur_t = ur.translated(ur.w)
-            intersect_t = LineLineIntersector(ul_t, ur_t)
-            intersect_result_t = intersect_t.intersection_type()
-            assert intersect_result_t == LineLineIntersectionResult.POINT
-            bi = make_vector(end=intersect_t.result, start=pos_at_t0)
+            pos_at_t0 = (x0, y0)
+            tp_t, x1, y1 = intersect_at_time(ul, ur, 1.0)
+            assert tp_t == LineLineIntersectionResult.POINT
+            bi = (x1 - x0, y1 - y0)
         elif tp == LineLineIntersectionResult.LINE:
             # this would mean original overlapping wavefronts...
             # -> parallel at left / right of a kvertex
@@ -222,6 +233,14 @@ def compute_new_kvertex(ul, ur, now, sk_node, info, internal, pause=False):
     return kv
 
 
+def get_wavefront_pair(skel, wf_left, wf_right):
+    """Returns the solved WaveFrontPair for the two wavefronts from the cache
+    of the skeleton (None, if one of the wavefronts is not known)"""
+    if wf_left is None or wf_right is None:
+        return None
+    return skel.wavefront_pairs[wf_left, wf_right]
+
+
 def get_fan(t, v, direction):
     """Gets a list of triangles that are the fan of
     vertex *v*, while turning *direction*, starting at triangle *t*
@@ -303,14 +322,13 @@ def replace_in_queue(t, now, queue, immediate):
                 id(t)))
 
 ###    logging.debug(" collapse time computation for: {}".format(str(repr(t)).replace(",",",\n\t")))
-    e = compute_collapse_time(t, now)
+    e = queue.schedule(t, now)
     if e is not None:
         # if t.info in (548,550):
         #     logging.debug("""
         #     >>>
         #     """)
         logging.debug("new event in queue {}".format(e))
-        queue.add(e)
     else:
         logging.debug("no new events".format(e))
         return
@@ -363,7 +381,7 @@ def schedule_immediately(tri, now, queue, immediate):
     if tri.event in immediate:
         immediate.remove(tri.event)
     # compute new event and put in immediate queue
-    E = compute_new_edge_collapse_event(tri, now)
+    E = compute_new_edge_collapse_event(tri, now, queue.reuse_events)
     tri.event = E
     # if we have no neighbors around, then no matter what, all 3 sides will
     # collapse (overrides what is determined by compute_new_edge_collapse_event)
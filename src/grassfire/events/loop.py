@@ -1,11 +1,11 @@
+import gc
 import logging
 from collections import deque
 
 from tri.delaunay.tds import Edge
-from grassfire.ordered_sequence import OrderedSequence
 
 from grassfire.calc import near_zero
-from grassfire.collapse import compute_collapse_time, find_gt
+from grassfire.collapse import find_gt
 
 from grassfire.events.edge import (
     handle_edge_event,
@@ -15,19 +15,16 @@ from grassfire.events.edge import (
 from grassfire.events.flip import handle_flip_event
 from grassfire.events.split import handle_split_event
 from grassfire.events.check import check_active_triangles_orientation, check_bisectors
+from grassfire.events.queue import EventQueue
 
 from grassfire.inout import interactive_visualize, visualize
 
-
 def choose_next_event(queue):
     """Choose a next event from the queue.
 
     NOTE: Event selection order is currently driven by the queue ordering.
     """
-    it = iter(queue)
-    evt = next(it)
-    queue.remove(evt)
-    return evt
+    return queue.pop()
 
 
 def log_queue_content(step, immediate, queue):
@@ -49,9 +46,15 @@ def log_queue_content(step, immediate, queue):
 
 # Main event loop
 # -----------------------------------------------------------------------------
-def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_digits=3):
+def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_digits=3,
+               capture=None, disable_gc=True):
     """The main event loop.
 
+    The event loop makes (almost) no cyclic garbage, while the structures it
+    works on are large: collecting during the loop only walks them again, so
+    with disable_gc the cyclic garbage collector does not run while the
+    events are processed.
+
     Args:
         queue: Event queue
         skel: Skeleton structure
@@ -59,7 +62,25 @@ def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_d
         stop_after: Stop after this many steps (0 = no limit) - for testing/debugging
         make_video: Whether to generate video frames - for testing/debugging
         video_digits: Number of decimal digits for video timing - for testing/debugging
+        capture: WavefrontCapture that records the wavefront at its capture
+            times, before the first event after such a time is handled
+        disable_gc: Whether to disable the cyclic garbage collector while
+            the events are processed
     """
+    disabled = disable_gc and gc.isenabled()
+    if disabled:
+        gc.disable()
+    try:
+        return _process_events(queue, skel, pause, stop_after, make_video, video_digits,
+                               capture)
+    finally:
+        if disabled:
+            gc.enable()
+
+
+def _process_events(queue, skel, pause, stop_after, make_video, video_digits,
+                    capture=None):
+    """Handles the events of the queue in order, see event_loop"""
     if stop_after != 0:
         logging.debug("Stopping for the first time after step#{}".format(stop_after))
 
@@ -92,8 +113,18 @@ def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_d
     check_bisectors(skel, 0.0)
     check_active_triangles_orientation(skel.triangles, 0)
 
+    counts = {"edge": 0, "flip": 0, "split": 0}
+    rechecks = 0
     guard = 0
     while queue or immediate:
+        if capture is not None and not immediate:
+            capture.advance(skel, queue.peek().time)
+        if not immediate and queue.peek().tp == "recheck":
+            # lazy queue: the exact event is only computed now
+            rechecks += 1
+            queue.recheck(choose_next_event(queue))
+            continue
+
         guard += 1
         if guard > 50000:
             raise ValueError("loop with more than 50_000 events stopped")
@@ -169,6 +200,7 @@ def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_d
             logging.warning("Already stopped %s, but still queued", id(evt.triangle))
             continue
 
+        counts[evt.tp] += 1
         if evt.tp == "edge":
             if len(evt.side) == 3:
                 handle_edge_event_3sides(evt, step, skel, queue, immediate)
@@ -206,6 +238,9 @@ def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_d
         if make_video:
             make_frames(NOW, video_digits, skel, queue, immediate)
 
+    if capture is not None:
+        capture.finish(skel)
+
     if pause:
         visualize(queue, skel, NOW)
 
@@ -223,42 +258,25 @@ def event_loop(queue, skel, pause=False, stop_after=0, make_video=False, video_d
     if not_stopped_tris:
         raise ValueError("triangles not stopped at end: {}".format(not_stopped_tris))
 
+    if queue.lazy:
+        counts["recheck"] = rechecks
+    skel.event_counts = counts
     return NOW
 
 
-def compare_event_by_time(one, other):
-    """Compare two events, first by time, in case they are equal by triangle type
-    (first 2-triangle, then 1-triangle, then 0-triangle), as last resort by
-    identifier of triangle.
-    """
-    if one.time < other.time:
-        return -1
-    elif one.time > other.time:
-        return 1
-    else:
-        if -one.triangle_tp < -other.triangle_tp:
-            return -1
-        elif -one.triangle_tp > -other.triangle_tp:
-            return 1
-        else:
-            if id(one.triangle) < id(other.triangle):
-                return -1
-            elif id(one.triangle) > id(other.triangle):
-                return 1
-            else:
-                return 0
-
-
-def init_event_list(skel):
+def init_event_list(skel, lazy=False, reuse_events=True):
     """Compute for all kinetic triangles when they will collapse and put them in
-    an OrderedSequence, so that events are ordered properly for further processing.
+    an EventQueue, so that events are ordered properly for further processing.
+
+    With lazy, triangles that collapse clearly later than t=0 only get a
+    recheck event at a lower bound of their collapse time (see EventQueue).
+    With reuse_events, the event record of a triangle is updated in place
+    when its collapse is recomputed (see collapse.make_event).
     """
-    q = OrderedSequence(cmp=compare_event_by_time)
+    q = EventQueue(lazy=lazy, reuse_events=reuse_events)
     logging.debug("Calculate initial events")
     logging.debug("=" * 80)
     for tri in skel.triangles:
-        res = compute_collapse_time(tri, 0, find_gt)
-        if res is not None:
-            q.add(res)
+        q.schedule(tri, 0, find_gt)
     logging.debug("=" * 80)
     return q
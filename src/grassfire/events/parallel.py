@@ -1,6 +1,6 @@
 import logging
 
-from tri.delaunay.tds import ccw, cw, Edge
+from tri.delaunay.tds import ccw, cw
 
 # flip dependencies
 from tri.delaunay.tds import apex, orig, dest
@@ -8,7 +8,7 @@ from tri.delaunay.tds import apex, orig, dest
 from grassfire.events.lib import stop_kvertices, update_circ, \
     compute_new_kvertex, replace_kvertex, schedule_immediately, \
     is_infinitely_fast
-from grassfire.events.lib import get_fan
+from grassfire.events.lib import get_fan, get_wavefront_pair
 from grassfire.inout import interactive_visualize
 from grassfire.calc import near_zero
 from grassfire.primitives import KineticVertex
@@ -64,6 +64,33 @@ def flip(t0, side0, t1, side1):
 
 # Parallel
 # -----------------------------------------------------------------------------
+def fan_leg_lengths(fan, pivot, now):
+    """Returns for every triangle in the fan a tuple
+    (index of pivot, length of left leg, length of right leg) at time *now*
+
+    The left leg is the side ccw of the pivot, the right leg the side cw of
+    the pivot. Positions are computed once per vertex, as the triangles in a
+    fan share their spokes.
+    """
+    positions = {}
+
+    def position(v):
+        try:
+            return positions[v]
+        except KeyError:
+            pos = positions[v] = v.position_at(now)
+            return pos
+
+    at_pivot = position(pivot)
+    legs = []
+    for t in fan:
+        idx = t.vertices.index(pivot)
+        left_dist = dist(position(t.vertices[cw(idx)]), at_pivot)
+        right_dist = dist(at_pivot, position(t.vertices[ccw(idx)]))
+        legs.append((idx, left_dist, right_dist))
+    return legs
+
+
 def handle_parallel_fan(fan, pivot, now, direction, step, skel, queue, immediate, pause):
     """Dispatches to correct function for handling parallel wavefronts
 
@@ -103,11 +130,9 @@ def handle_parallel_fan(fan, pivot, now, direction, step, skel, queue, immediate
     # -> let's collapse the edge opposite of the pivot
     if first_tri.neighbours.count(None) == 3:
         assert first_tri is last_tri #FIXME: is this true?
-        dists = []
-        for side in range(3):
-            edge = Edge(first_tri, side)
-            d = dist(*map(lambda x: x.position_at(now), edge.segment))
-            dists.append(d)
+        # side i runs from vertex ccw(i) to vertex cw(i)
+        pos = [v.position_at(now) for v in first_tri.vertices]
+        dists = [dist(pos[ccw(side)], pos[cw(side)]) for side in range(3)]
         dists_sub_min = [near_zero(_ - min(dists)) for _ in dists]
         if near_zero(min(dists)) and dists_sub_min.count(True) == 1:
             logging.debug(dists_sub_min)
@@ -124,30 +149,28 @@ def handle_parallel_fan(fan, pivot, now, direction, step, skel, queue, immediate
 
     if first_tri is last_tri:
         assert len(fan) == 1
+    # classify the fan in one pass: leg lengths of all triangles at the pivot
+    legs = fan_leg_lengths(fan, pivot, now)
     if direction is cw:
-        left = fan[0]
-        right = fan[-1]
+        left, left_legs = fan[0], legs[0]
+        right, right_legs = fan[-1], legs[-1]
     else:
         assert direction is ccw
-        left = fan[-1]
-        right = fan[0]
+        left, left_legs = fan[-1], legs[-1]
+        right, right_legs = fan[0], legs[0]
 
-    left_leg_idx = ccw(left.vertices.index(pivot))
-    left_leg = Edge(left, left_leg_idx)
+    left_leg_idx = ccw(left_legs[0])
     if left.neighbours[left_leg_idx] is not None:
         logging.debug("inf-fast pivot, but not over wavefront edge? -- left side")
-    left_dist = dist(*map(lambda x: x.position_at(now), left_leg.segment))
-    right_leg_idx = cw(right.vertices.index(pivot))
-    right_leg = Edge(right, right_leg_idx)
+    left_dist = left_legs[1]
+    right_leg_idx = cw(right_legs[0])
     if right.neighbours[right_leg_idx] is not None:
         logging.debug("inf-fast pivot, but not over wavefront edge? -- right side")
-    right_dist = dist(*map(lambda x: x.position_at(now), right_leg.segment))
-    dists = [left_dist, right_dist]
-    logging.debug('  distances: {}'.format(dists))
-    dists_sub_min = [near_zero(_ - min(dists)) for _ in dists]
-    logging.debug(dists_sub_min)
-    unique_dists = dists_sub_min.count(True)
-    if unique_dists == 2:
+    right_dist = right_legs[2]
+    logging.debug('  distances: {}'.format([left_dist, right_dist]))
+    shortest = min(left_dist, right_dist)
+    left_is_shortest = near_zero(left_dist - shortest)
+    if left_is_shortest and near_zero(right_dist - shortest):
         logging.debug("Equal sized legs")
         if len(fan) == 1:
             logging.debug("Calling handle_parallel_edge_event_even_legs for 1 triangle")
@@ -170,24 +193,11 @@ def handle_parallel_fan(fan, pivot, now, direction, step, skel, queue, immediate
             logging.debug("Calling handle_parallel_edge_event_even_legs for *multiple* triangles")
             # raise NotImplementedError('multiple triangles #{} in parallel fan that should be stopped'.format(len(fan)))
 
+            # FIXME: left = cw / right = ccw seen from the vertex
             all_2 = True
-            for t in fan:
-                # FIXME: left = cw / right = ccw seen from the vertex
-                left_leg_idx = ccw(t.vertices.index(pivot))
-                left_leg = Edge(t, left_leg_idx)
-                left_dist = dist(*map(lambda x: x.position_at(now), left_leg.segment))
-
-                right_leg_idx = cw(t.vertices.index(pivot))
-                right_leg = Edge(t, right_leg_idx)
-                right_dist = dist(*map(lambda x: x.position_at(now), right_leg.segment))
-
-                dists = [left_dist, right_dist]
-
-                dists_sub_min = [near_zero(_ - min(dists)) for _ in dists]
-                logging.debug("  {}".format([left_dist, right_dist]))
-                logging.debug("  {}".format(dists_sub_min))
-                unique_dists = dists_sub_min.count(True)
-                if unique_dists != 2:
+            for _, t_left_dist, t_right_dist in legs:
+                logging.debug("  {}".format([t_left_dist, t_right_dist]))
+                if not near_zero(t_left_dist - t_right_dist):
                     all_2 = False
 
             # assert unique_dists == 2
@@ -233,13 +243,12 @@ def handle_parallel_fan(fan, pivot, now, direction, step, skel, queue, immediate
                 assert t.stops_at is not None
     else:
         # check what is the shortest of the two distances
-        shortest_idx = dists_sub_min.index(True)
-        if shortest_idx == 1: # right is shortest, left is longest
+        if not left_is_shortest: # right is shortest, left is longest
             logging.debug("CW / left wavefront at pivot, ending at v2, is longest")
-            handle_parallel_edge_event_shorter_leg(right_leg.triangle, right_leg.side, pivot, now, step, skel, queue, immediate, pause)
-        elif shortest_idx == 0: # left is shortest, right is longest
+            handle_parallel_edge_event_shorter_leg(right, right_leg_idx, pivot, now, step, skel, queue, immediate, pause)
+        else: # left is shortest, right is longest
             logging.debug("CCW / right wavefront at pivot, ending at v1, is longest")
-            handle_parallel_edge_event_shorter_leg(left_leg.triangle, left_leg.side, pivot, now, step, skel, queue, immediate, pause)
+            handle_parallel_edge_event_shorter_leg(left, left_leg_idx, pivot, now, step, skel, queue, immediate, pause)
 
 
 def handle_parallel_edge_event_shorter_leg(t, e, pivot, now, step, skel, queue, immediate, pause):
@@ -284,7 +293,7 @@ def handle_parallel_edge_event_shorter_leg(t, e, pivot, now, step, skel, queue,
             to_stop.append(v)
 
     # stop the non-infinite vertices
-    sk_node, newly_made = stop_kvertices(to_stop, step, now)
+    sk_node, newly_made = stop_kvertices(to_stop, step, now, skel=skel)
     if newly_made:
         skel.sk_nodes.append(sk_node)
     if pivot.stop_node is None:
@@ -292,6 +301,7 @@ def handle_parallel_edge_event_shorter_leg(t, e, pivot, now, step, skel, queue,
         assert pivot.stops_at is None
         pivot.stop_node = sk_node
         pivot.stops_at = now
+        skel.stopped([pivot])
         # we will update the circular list
         # at the pivot a little bit later
     else:
@@ -302,7 +312,8 @@ def handle_parallel_edge_event_shorter_leg(t, e, pivot, now, step, skel, queue,
     # check that the edge that collapses is not opposite of the pivot
     # i.e. the edge is one of the two adjacent legs at the pivot
     assert t.vertices.index(pivot) != e
-    kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node, len(skel.vertices) + 1, v1.internal or v2.internal, pause)
+    pair = get_wavefront_pair(skel, v1.left.wfr, v2.right.wfl)
+    kv = compute_new_kvertex(v1.ul, v2.ur, now, sk_node, len(skel.vertices) + 1, v1.internal or v2.internal, pause, pair)
     # FIXME new wavefront -- update refs
     kv.wfl = v1.left.wfr
     kv.wfr = v2.right.wfl
@@ -357,7 +368,7 @@ def handle_parallel_edge_event_shorter_leg(t, e, pivot, now, step, skel, queue,
     logging.debug("*** neighbour n: {} ".format("schedule adjacent neighbour for *IMMEDIATE* processing" if n is not None else "no neighbour to collapse simultaneously"))
     if n is not None:
         n.neighbours[n.neighbours.index(t)] = None
-        if n.event is not None and n.stops_at is None:
+        if queue.has_event(n) and n.stops_at is None:
             schedule_immediately(n, now, queue, immediate)
 
     # process parallel fan, only if the fan has all un-dealt with triangles
@@ -421,6 +432,7 @@ def handle_parallel_edge_event_even_legs(t, e, pivot, now, step, skel, queue, im
     # stop the non-infinite vertices
     v1 = t.vertices[ccw(e)]
     v2 = t.vertices[cw(e)]
+    fresh = [v for v in (v1, v2, pivot) if v.stops_at is None]
     sk_node, newly_made = stop_kvertices([v1,v2], step, now)
     if newly_made:
         skel.sk_nodes.append(sk_node)
@@ -432,6 +444,7 @@ def handle_parallel_edge_event_even_legs(t, e, pivot, now, step, skel, queue, im
 #    assert pivot.stops_at is None
     pivot.stop_node = sk_node
     pivot.stops_at = now
+    skel.stopped(fresh)
     # this is not necessary, is it?
     ## update_circ(pivot, v1, now)
     ## update_circ(v2, pivot, now)
@@ -444,7 +457,7 @@ def handle_parallel_edge_event_even_legs(t, e, pivot, now, step, skel, queue, im
     logging.debug("*** neighbour n: {} ".format(msg))
     if n is not None:
         n.neighbours[n.neighbours.index(t)] = None
-        if n.event is not None and n.stops_at is None:
+        if queue.has_event(n) and n.stops_at is None:
             logging.debug(n.event)
             schedule_immediately(n, now, queue, immediate)
 
@@ -465,14 +478,8 @@ def handle_parallel_edge_event_3tri(t, e, pivot, now, step, skel, queue, immedia
     assert t.vertices[e] is pivot
 #    assert pivot.inf_fast
 
-    left_leg_idx = ccw(t.vertices.index(pivot))
-    left_leg = Edge(t, left_leg_idx)
-    left_dist = dist(*map(lambda x: x.position_at(now), left_leg.segment))
+    _, left_dist, right_dist = fan_leg_lengths([t], pivot, now)[0]
     v1 = t.vertices[ccw(e)]
-
-    right_leg_idx = cw(t.vertices.index(pivot))
-    right_leg = Edge(t, right_leg_idx)
-    right_dist = dist(*map(lambda x: x.position_at(now), right_leg.segment))
     v2 = t.vertices[cw(e)]
 
     assert v1 is not pivot
@@ -490,13 +497,11 @@ def handle_parallel_edge_event_3tri(t, e, pivot, now, step, skel, queue, immedia
 
     logging.debug('  velocity magnitude: {}'.format([magn_v1, magn_v2]))
 
-    dists = [left_dist, right_dist]
-    logging.debug('  distances: {}'.format(dists))
-    dists_sub_min = [near_zero(_ - min(dists)) for _ in dists]
-    logging.debug(dists_sub_min)
+    logging.debug('  distances: {}'.format([left_dist, right_dist]))
 
     # stop the non-infinite vertices at the same location
     # use the slowest moving vertex to determine the location
+    fresh = [v for v in (v1, v2, pivot) if v.stops_at is None]
     if magn_v2 < magn_v1:
         sk_node, newly_made = stop_kvertices([v2], step, now)
         if newly_made:
@@ -522,6 +527,7 @@ def handle_parallel_edge_event_3tri(t, e, pivot, now, step, skel, queue, immedia
     #FIXME: wrong sk_node for pivot
     pivot.stop_node = sk_node
     pivot.stops_at = now
+    skel.stopped(fresh)
     # this is not necessary, is it?
     ## update_circ(pivot, v1, now)
     ## update_circ(v2, pivot, now)
@@ -0,0 +1,142 @@
+import heapq
+import logging
+
+from grassfire.collapse import compute_collapse_time, compute_lazy_collapse_time, find_gte
+
+
+class EventQueue(object):
+    """Priority queue of the events of the kinetic triangles
+
+    The heap holds lightweight (time, -triangle type, id, seq, triangle)
+    entries: events come first by time, at equal times the 2-triangles
+    before the 1-triangles before the 0-triangles, then by identifier of
+    the triangle (the sequence number makes the keys unique, so the
+    triangles themselves are never compared). Removing an event only
+    invalidates its entry: an entry is valid while the event of its
+    triangle still has the same sequence number, so the event records can
+    be updated in place and queued again (see collapse.make_event).
+
+    With lazy=True, triangles that collapse clearly later than the current
+    time get a recheck event at a lower bound of their collapse time, and the
+    exact event is only computed when the event loop reaches that bound
+    (triangles that are changed before, do not need it at all).
+
+    With reuse_events=False, every computed event gets a new record (to
+    compare allocations, see benchmark_memory.py).
+
+    collapse_computations counts the exact collapse computations
+    (compute_collapse_time) of the queue, see benchmark_lazy_events.py.
+    """
+
+    def __init__(self, lazy=False, reuse_events=True):
+        self.lazy = lazy
+        self.reuse_events = reuse_events
+        self.collapse_computations = 0
+        self._heap = []
+        self._seq = 0
+        self._count = 0
+
+    def add(self, event):
+        if event.seq is not None:
+            self.discard(event)
+        self._seq += 1
+        event.seq = self._seq
+        tri = event.triangle
+        heapq.heappush(self._heap, (event.time, -event.triangle_tp, id(tri), self._seq, tri))
+        self._count += 1
+        # drop the invalidated entries once they outnumber the valid ones
+        if len(self._heap) > 2 * self._count + 64:
+            self._heap = [entry for entry in self._heap if self._is_valid(entry)]
+            heapq.heapify(self._heap)
+
+    def discard(self, event):
+        if event is not None and event.seq is not None:
+            event.seq = None
+            self._count -= 1
+
+    def remove(self, event):
+        if event is None or event.seq is None:
+            raise ValueError("event not in queue")
+        self.discard(event)
+
+    @staticmethod
+    def _is_valid(entry):
+        event = entry[4].event
+        return event is not None and event.seq == entry[3]
+
+    def _prune(self):
+        heap = self._heap
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+
+    def peek(self):
+        """The first event, without removing it"""
+        self._prune()
+        return self._heap[0][4].event
+
+    def pop(self):
+        """Removes and returns the first event"""
+        self._prune()
+        event = heapq.heappop(self._heap)[4].event
+        event.seq = None
+        self._count -= 1
+        return event
+
+    def __iter__(self):
+        for entry in sorted(self._heap):
+            if self._is_valid(entry):
+                yield entry[4].event
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def schedule(self, tri, now, sieve=find_gte):
+        """Computes the (recheck) event of the triangle and adds it"""
+        if self.lazy:
+            event = compute_lazy_collapse_time(tri, now, sieve, self.reuse_events)
+            exact = event is None or event.tp != "recheck"
+        else:
+            event = compute_collapse_time(tri, now, sieve, self.reuse_events)
+            exact = True
+        if exact and tri.stops_at is None:
+            self.collapse_computations += 1
+        if event is not None:
+            self.add(event)
+        return event
+
+    def recheck(self, event):
+        """Replaces the popped recheck event by the exact event of its
+        triangle, as computed at the time the recheck was made"""
+        tri = event.triangle
+        if tri.event is not event or tri.stops_at is not None:
+            logging.debug("outdated recheck for triangle #{}".format(id(tri)))
+            return None
+        had_event = event.had_event
+        self.collapse_computations += 1
+        exact = compute_collapse_time(tri, event.since, event.sieve,
+                                      self.reuse_events)
+        if exact is not None:
+            self.add(exact)
+        elif not had_event:
+            tri.event = None
+        return exact
+
+    def has_event(self, tri):
+        """Whether the triangle has an event, as it would have without lazy
+        events
+
+        A recheck event made while the triangle had an event counts as is
+        (without lazy events that event would still be there). Otherwise the
+        recheck is resolved here, as the event loop would do when it reaches
+        it, so the exact event is computed once and stays queued.
+        """
+        event = tri.event
+        if event is None:
+            return False
+        if event.tp != "recheck" or event.had_event:
+            return True
+        self.discard(event)
+        return self.recheck(event) is not None
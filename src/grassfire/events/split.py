@@ -2,7 +2,7 @@ import logging
 from tri.delaunay.tds import cw, ccw
 from grassfire.events.lib import stop_kvertices, compute_new_kvertex, update_circ, replace_kvertex
 from grassfire.events.parallel import handle_parallel_fan
-from grassfire.line2d import WaveFrontIntersector
+from grassfire.line2d import LineLineIntersectionResult, intersect_at_time
 
 
 # ------------------------------------------------------------------------------
@@ -38,40 +38,19 @@ def handle_split_event(evt, step, skel, queue, immediate, pause):
     assert v2.wfl is b
     c = v.wfl
 
-    # TODO: are we having the correct bisectors here?
-    intersector = WaveFrontIntersector(a, b)           #
-    bi0 = intersector.get_bisector()
-    # print(bi0)
-    #
-    intersector = WaveFrontIntersector(a, c)           #
-    bi1 = intersector.get_bisector()
-    # print(bi1)
-
+    pairs = skel.wavefront_pairs
     # the position of the node is witnessed by 3 pairs of wavefronts
-    # NOTE uses try-except to determine parallel (bad approach)
-    try:
-        intersector = WaveFrontIntersector(a, b)
-        pos_at_now = intersector.get_intersection_at_t(now)
-    except ValueError:
-        pass
+    # (parallel pairs do not have a point of intersection)
+    pos_at_now = None
+    for one, other in ((a, b), (a, c), (b, c)):
+        status, x, y = intersect_at_time(one.line, other.line, now)
+        if status == LineLineIntersectionResult.POINT:
+            pos_at_now = (x, y)
     # print("POINT({0[0]} {0[1]})".format(pos_at_now))
 
-    try:
-        intersector = WaveFrontIntersector(a, c)
-        pos_at_now = intersector.get_intersection_at_t(now)
-        # print("POINT({0[0]} {0[1]})".format(pos_at_now))
-    except ValueError:
-        pass
-    try:
-        intersector = WaveFrontIntersector(b,c)
-        pos_at_now = intersector.get_intersection_at_t(now)
-        # print("POINT({0[0]} {0[1]})".format(pos_at_now))            #
-    except ValueError:
-        pass
-
     # ---- new use of wavefronts ------------------------------ #
 
-    sk_node, newly_made = stop_kvertices([v], step, now)
+    sk_node, newly_made = stop_kvertices([v], step, now, skel=skel)
     # add the skeleton node to the skeleton
     if newly_made:
         skel.sk_nodes.append(sk_node)
@@ -87,7 +66,7 @@ def handle_split_event(evt, step, skel, queue, immediate, pause):
 
     # a bisector based on the original line equations
     # BI = compute_crossing_bisector(v.ul, v2.ul, now)
-    vb = compute_new_kvertex(v.ul, v2.ul, now, sk_node, len(skel.vertices) + 1, v.internal or v2.internal, pause)
+    vb = compute_new_kvertex(v.ul, v2.ul, now, sk_node, len(skel.vertices) + 1, v.internal or v2.internal, pause, pairs[c, b])
     # FIXME: new wavefront
     vb.wfl = v.wfl
     vb.wfr = v2.wfl
@@ -108,7 +87,7 @@ def handle_split_event(evt, step, skel, queue, immediate, pause):
         interactive_visualize(queue, skel, step, now)
 
     # BI = compute_crossing_bisector(v1.ur, v.ur, now)
-    va = compute_new_kvertex(v1.ur, v.ur, now, sk_node, len(skel.vertices) + 1, v.internal or v1.internal, pause)
+    va = compute_new_kvertex(v1.ur, v.ur, now, sk_node, len(skel.vertices) + 1, v.internal or v1.internal, pause, pairs[b, a])
     va.wfl = v1.wfr
     va.wfr = v.wfr
 
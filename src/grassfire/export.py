@@ -0,0 +1,80 @@
+"""Export of the skeleton segments as NumPy arrays
+
+segment_arrays gives the segments of Skeleton.segments as parallel
+arrays, with the transform back to the box of the input applied once to
+all end points. Unlike Skeleton.segments, this also applies it to the
+segments of vertices that never stop (those of Skeleton.segments stay in
+the box the skeleton was computed in).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+SegmentArrays = namedtuple(
+    "SegmentArrays", ["coords", "times", "nodes", "infos", "bounded"]
+)
+SegmentArrays.__doc__ = """Segments of a skeleton as parallel arrays
+
+coords -- (n, 2, 2) float64 array, start and end point of the segments
+times -- (n, 2) float64 array, start and stop time (NaN if unbounded)
+nodes -- (n, 2) int64 array, index of the start and stop node in
+         skel.sk_nodes (-1 if unbounded)
+infos -- (n, 2) object array, info of the start and stop node
+bounded -- (n,) bool array, False for vertices that never stop (these
+           end at their position at time ray_until)
+"""
+
+
+def segment_arrays(skel, ray_until=1000.0):
+    """Returns the segments of skel as SegmentArrays
+
+    Segments of vertices that start and stop at the same node are skipped
+    (as Skeleton.segments does). Coordinates and times are in the units of
+    the input (the transform of skel is applied), also for the unbounded
+    segments, which Skeleton.segments gives untransformed. These end at
+    time ray_until, in the units of the input as well (as for
+    CompactSkeleton.segments_list).
+    """
+    if skel.transform is not None:
+        # the vertices move in the box the skeleton was computed in
+        ray_until = ray_until / skel.transform.scale[0]
+    node_index = {id(node): i for i, node in enumerate(skel.sk_nodes)}
+    nodes = []
+    times = []
+    rays = []
+    for v in skel.vertices:
+        if v.stops_at is not None:
+            if v.start_node is v.stop_node:
+                continue
+            nodes.append((node_index[id(v.start_node)], node_index[id(v.stop_node)]))
+            times.append((v.starts_at, v.stops_at))
+        else:
+            nodes.append((node_index[id(v.start_node)], -1))
+            times.append((v.starts_at, np.nan))
+            rays.append((len(nodes) - 1, v.position_at(ray_until)))
+
+    n = len(nodes)
+    nodes = np.array(nodes, dtype=np.int64).reshape(n, 2)
+    times = np.array(times, dtype=np.float64).reshape(n, 2)
+    positions = np.array([node.pos for node in skel.sk_nodes],
+                         dtype=np.float64).reshape(-1, 2)
+    coords = np.empty((n, 2, 2), dtype=np.float64)
+    if n:
+        coords[:, 0] = positions[nodes[:, 0]]
+        coords[:, 1] = positions[nodes[:, 1]]
+    bounded = nodes[:, 1] != -1
+    if rays:
+        index, ends = zip(*rays)
+        coords[list(index), 1] = ends
+    if skel.transform is not None:
+        coords = skel.transform.backward_array(coords.reshape(-1, 2)).reshape(n, 2, 2)
+        times *= skel.transform.scale[0]
+
+    infos = np.empty((n, 2), dtype=object)
+    node_infos = [node.info for node in skel.sk_nodes]
+    for i, (start, stop) in enumerate(nodes.tolist()):
+        infos[i, 0] = node_infos[start]
+        infos[i, 1] = node_infos[stop] if stop != -1 else None
+    return SegmentArrays(coords, times, nodes, infos, bounded)
@@ -0,0 +1,254 @@
+"""Faces of the straight skeleton and point location in them
+
+The wavefront of every side of an input edge sweeps one face of the
+skeleton: the kinetic vertices that have this wavefront as wfl or wfr trace
+its boundary, from the one corner of the input edge to the other. Closing
+this chain along the input edge gives the face polygon. A point in the face
+is reached by the wavefront at a time equal to its distance to the
+supporting line of the input edge.
+
+skeleton_faces assembles the faces (nodes closer than a tolerance are taken
+as one node, as in grassfire.graph), FaceIndex keeps them in a uniform grid
+on their bounding boxes and locates many points at once.
+
+Faces that are not bounded (vertices that never stop, outside of the input)
+are left out, so points there are not located.
+"""
+
+import logging
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from grassfire.graph import _snap
+
+
+Face = namedtuple("Face", ["start", "end", "infos", "polygon", "times"])
+Face.__doc__ = """Face of the skeleton swept by one input edge
+
+start, end -- the end points of the input edge
+infos -- info of the start and end node of the input edge
+polygon -- (m + 1, 2) float64 array, the closed boundary: from start along
+           the skeleton to end, and back to start
+times -- (m + 1,) float64 array, time of the nodes of the polygon
+"""
+
+PointLocation = namedtuple("PointLocation", ["faces", "infos", "times"])
+PointLocation.__doc__ = """Faces that contain query points
+
+faces -- (q,) int64 array, index of the face (-1 if in no face)
+infos -- (q, 2) object array, infos of the input edge of the face
+times -- (q,) float64 array, time at which the wavefront reaches the point
+         (distance to the input edge, NaN if in no face)
+"""
+
+
+def skeleton_faces(skel, tolerance=1e-7):
+    """Returns the bounded faces of skel as list of Faces, in the coordinates
+    of the input (tolerance in the units of the input)"""
+    nodes = {}
+    positions = []
+    infos = []
+    times = []
+
+    def node_index(node, time):
+        i = nodes.get(id(node))
+        if i is None:
+            i = nodes[id(node)] = len(positions)
+            positions.append(node.pos)
+            infos.append(node.info)
+            times.append(time if node.time is None else node.time)
+        return i
+
+    sides = {}
+    for v in skel.vertices:
+        for wavefront in (v.wfl, v.wfr):
+            if wavefront is not None:
+                sides.setdefault(id(wavefront), (wavefront, []))[1].append(v)
+    chains = []
+    for wavefront, vertices in sides.values():
+        if any(v.stops_at is None for v in vertices):
+            continue
+        arcs = [(node_index(v.start_node, v.starts_at),
+                 node_index(v.stop_node, v.stops_at)) for v in vertices]
+        chains.append((wavefront, arcs))
+
+    positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+    if skel.transform is not None:
+        positions = skel.transform.backward_array(positions)
+    node_map, members = _snap(positions, tolerance)
+    node_infos = [None] * len(members)
+    for i, info in zip(node_map.tolist(), infos):
+        if node_infos[i] is None:
+            node_infos[i] = info
+    positions = positions[members]
+    scale = skel.transform.scale[0] if skel.transform is not None else 1.0
+    times = np.array(times, dtype=np.float64)[members] * scale
+
+    faces = []
+    for wavefront, arcs in chains:
+        start, end = np.array([wavefront.start, wavefront.end], dtype=np.float64)
+        if skel.transform is not None:
+            start, end = skel.transform.backward_array(np.array([start, end]))
+        path = _walk([(node_map[a], node_map[b]) for a, b in arcs],
+                     positions, start, end)
+        if path is None:
+            logging.debug("face of {} could not be closed".format(wavefront))
+            continue
+        ring = path + path[:1]
+        faces.append(Face(tuple(start.tolist()), tuple(end.tolist()),
+                          (node_infos[path[0]], node_infos[path[-1]]),
+                          positions[ring], times[ring]))
+    return faces
+
+
+def _walk(arcs, positions, start, end):
+    """Orders the arcs of a face into a path between the two corners of the
+    input edge, from the corner nearest to start to the one nearest to end
+
+    Where two parallel wavefronts collide, the part of the skeleton along
+    which they meet is not traced by a vertex: the path then has a gap, that
+    is closed by going to the nearest other dead end.
+
+    Returns:
+        list of node indices, or None if the arcs do not reach two corners
+    """
+    neighbours = {}
+    for a, b in sorted({(min(a, b), max(a, b)) for a, b in arcs if a != b}):
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    ends = [i for i, around in neighbours.items() if len(around) % 2 == 1]
+    if len(ends) < 2:
+        return None
+    first = min(ends, key=lambda i: math.hypot(*(positions[i] - start)))
+    last = min(ends, key=lambda i: math.hypot(*(positions[i] - end)))
+    if first == last:
+        return None
+    path = [first]
+    while True:
+        here = path[-1]
+        around = neighbours.pop(here, [])
+        if around:
+            there = around.pop(0)
+            neighbours[here] = around
+            neighbours[there].remove(here)
+            path.append(there)
+            continue
+        left = [i for i, around in neighbours.items() if around]
+        if not left:
+            return path
+        # jump over a gap: to the nearest dead end, other than the last corner
+        pt = positions[here]
+        path.append(min(left, key=lambda i: (i == last,
+                                             len(neighbours[i]) % 2 == 0,
+                                             math.hypot(*(positions[i] - pt)))))
+
+
+class FaceIndex(object):
+    """Uniform grid on the bounding boxes of the faces
+
+    faces -- list of Faces (see skeleton_faces)
+    cell_size -- size of the grid cells (by default, so that there are about
+                 4 cells per face)
+    """
+
+    def __init__(self, faces, cell_size=None):
+        self.faces = list(faces)
+        count = len(self.faces)
+        boxes = np.array([np.concatenate((f.polygon.min(axis=0), f.polygon.max(axis=0)))
+                          for f in self.faces], dtype=np.float64).reshape(-1, 4)
+        self.boxes = boxes  # (min x, min y, max x, max y) per face
+        self.infos = np.empty((count + 1, 2), dtype=object)
+        for i, face in enumerate(self.faces):
+            self.infos[i] = face.infos
+        self.starts = np.array([f.start for f in self.faces], dtype=np.float64).reshape(-1, 2)
+        self.ends = np.array([f.end for f in self.faces], dtype=np.float64).reshape(-1, 2)
+        if count:
+            self.origin = boxes[:, :2].min(axis=0)
+            extent = boxes[:, 2:].max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(2)
+            extent = np.ones(2)
+        if cell_size is None:
+            # about 4 cells per face
+            cell_size = math.sqrt(float(extent[0] * extent[1]) / (4 * max(count, 1)))
+            if cell_size == 0:
+                cell_size = float(extent.max()) / max(count, 1)
+        self.size = max(cell_size, 1e-12)
+        self.shape = np.maximum(np.ceil(extent / self.size).astype(np.int64), 1)
+        # faces per cell, in compressed form
+        low = self._cell(boxes[:, :2])
+        high = self._cell(boxes[:, 2:])
+        cell_ids = []
+        face_ids = []
+        for i, ((x0, y0), (x1, y1)) in enumerate(zip(low.tolist(), high.tolist())):
+            xs, ys = np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1))
+            ids = (xs * self.shape[1] + ys).ravel()
+            cell_ids.append(ids)
+            face_ids.append(np.full(len(ids), i, dtype=np.int64))
+        cell_ids = np.concatenate(cell_ids) if cell_ids else np.empty(0, dtype=np.int64)
+        face_ids = np.concatenate(face_ids) if face_ids else np.empty(0, dtype=np.int64)
+        order = np.argsort(cell_ids, kind="stable")
+        self.cell_faces = face_ids[order]
+        self.cell_ptr = np.zeros(int(self.shape[0] * self.shape[1]) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell_ids, minlength=len(self.cell_ptr) - 1),
+                  out=self.cell_ptr[1:])
+
+    def __len__(self):
+        return len(self.faces)
+
+    def _cell(self, points):
+        cell = np.floor((points - self.origin) / self.size).astype(np.int64)
+        return np.clip(cell, 0, self.shape - 1)
+
+    def locate(self, points):
+        """Finds the face of every point ((q, 2) array) as PointLocation"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        faces = np.full(len(points), -1, dtype=np.int64)
+        if len(self.faces) and len(points):
+            cell = self._cell(points)
+            cell = cell[:, 0] * self.shape[1] + cell[:, 1]
+            first = self.cell_ptr[cell]
+            counts = self.cell_ptr[cell + 1] - first
+            # every (point, candidate face) pair
+            pair_points = np.repeat(np.arange(len(points)), counts)
+            skip = np.repeat(np.cumsum(counts) - counts, counts)
+            pair_faces = self.cell_faces[np.repeat(first, counts) +
+                                         np.arange(len(pair_points)) - skip]
+            order = np.argsort(pair_faces, kind="stable")
+            pair_points, pair_faces = pair_points[order], pair_faces[order]
+            bounds = np.flatnonzero(np.diff(pair_faces)) + 1
+            for group in np.split(np.arange(len(pair_faces)), bounds):
+                if not len(group):
+                    continue
+                i = pair_faces[group[0]]
+                candidates = pair_points[group]
+                candidates = candidates[faces[candidates] == -1]
+                inside = _contains(self.faces[i].polygon, points[candidates])
+                faces[candidates[inside]] = i
+        times = np.full(len(points), np.nan)
+        found = faces != -1
+        start, end = self.starts[faces[found]], self.ends[faces[found]]
+        direction = end - start
+        offset = points[found] - start
+        times[found] = np.abs(direction[:, 0] * offset[:, 1] -
+                              direction[:, 1] * offset[:, 0]) / \
+            np.hypot(direction[:, 0], direction[:, 1])
+        # row -1 of self.infos holds None, None for points in no face
+        return PointLocation(faces, self.infos[faces], times)
+
+
+def _contains(ring, points, chunk=1 << 20):
+    """Even-odd test of the points against the closed ring"""
+    x0, y0 = ring[:-1, 0, None], ring[:-1, 1, None]
+    x1, y1 = ring[1:, 0, None], ring[1:, 1, None]
+    inside = np.zeros(len(points), dtype=bool)
+    step = max(1, chunk // max(len(x0), 1))
+    for at in range(0, len(points), step):
+        px, py = points[at:at + step, 0], points[at:at + step, 1]
+        crosses = (y0 > py) != (y1 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+        inside[at:at + step] = np.count_nonzero(crosses & (px < x), axis=0) % 2 == 1
+    return inside
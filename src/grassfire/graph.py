@@ -0,0 +1,149 @@
+"""The skeleton as graph, in compressed sparse row (CSR) form
+
+Skeleton.segments gives every segment with its own copy of the end points,
+and nodes that the event loop made a tiny distance apart (e.g. when
+stop_kvertices makes a new node for a vertex that stops at about the same
+place as another) are different nodes. skeleton_graph merges the nodes that
+are within a tolerance of each other, using a spatial hash with cells of the
+tolerance size, and returns the unique nodes with the adjacency in CSR form,
+ready for graph algorithms (scipy.sparse.csr_matrix((data, indices, indptr))
+takes the arrays as is).
+
+Only the finite segments of the skeleton are edges of the graph, the rays of
+the skeleton outside the input are left out.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from grassfire.compact import CompactSkeleton, compact_skeleton
+
+
+SkeletonGraph = namedtuple(
+    "SkeletonGraph",
+    ["positions", "times", "infos", "edges", "lengths", "indptr", "indices",
+     "edge_ids", "data"],
+)
+SkeletonGraph.__doc__ = """Graph of the skeleton (unique nodes, CSR adjacency)
+
+positions -- (n, 2) float64 array, node coordinates (in the input units)
+times -- (n,) float64 array, time at which the wavefront reached the node
+infos -- tuple of length n, info of the node (None for most nodes)
+edges -- (e, 2) int64 array, the two nodes of every edge (times[edges] are
+         the start and stop time of the edges)
+lengths -- (e,) float64 array, length of the edges
+indptr -- (n + 1,) int64 array, the neighbours of node i are
+          indices[indptr[i]:indptr[i + 1]]
+indices -- (2e,) int64 array, neighbouring node
+edge_ids -- (2e,) int64 array, edge that leads to that neighbour
+data -- (2e,) float64 array, length of that edge
+"""
+
+
+def skeleton_graph(skel, tolerance=1e-7):
+    """Returns the graph of skel (a Skeleton or CompactSkeleton)
+
+    Nodes closer than tolerance (in the units of the input) to the first node
+    of their cluster are merged with it: the merged node keeps the position
+    of that first node, the earliest time and the first info that is not
+    None. Edges that become loops are dropped, as are repeated edges.
+    """
+    if not isinstance(skel, CompactSkeleton):
+        skel = compact_skeleton(skel)
+    node_map, members = _snap(skel.positions, tolerance)
+    count = len(members)
+    positions = skel.positions[members]
+    times = np.full(count, np.nan)
+    np.fmin.at(times, node_map, skel.times)
+    infos = [None] * count
+    for i, info in zip(node_map.tolist(), skel.infos):
+        if infos[i] is None:
+            infos[i] = info
+
+    edges = np.sort(node_map[skel.segments], axis=1).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges = np.unique(edges, axis=0)
+    lengths = np.hypot(*(positions[edges[:, 1]] - positions[edges[:, 0]]).T)
+    return make_graph(positions, times, infos, edges, lengths)
+
+
+def make_graph(positions, times, infos, edges, lengths):
+    """Returns the SkeletonGraph with the given nodes and edges (the CSR
+    adjacency is made here)"""
+    count = len(positions)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    lengths = np.asarray(lengths, dtype=np.float64)
+    # both directions of every edge, grouped per node
+    ends = np.concatenate((edges[:, 0], edges[:, 1]))
+    indices = np.concatenate((edges[:, 1], edges[:, 0]))
+    edge_ids = np.concatenate((np.arange(len(edges)), np.arange(len(edges))))
+    order = np.argsort(ends, kind="stable")
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=count), out=indptr[1:])
+    edge_ids = edge_ids[order].astype(np.int64)
+    return SkeletonGraph(
+        positions,
+        times,
+        tuple(infos),
+        edges,
+        lengths,
+        indptr,
+        indices[order].astype(np.int64),
+        edge_ids,
+        lengths[edge_ids],
+    )
+
+
+def _snap(positions, tolerance):
+    """Clusters the positions with a spatial hash (cells of tolerance size, a
+    tolerance of 0 merges exact duplicates only)
+
+    Points without another point within tolerance in x, or in y, can not be
+    merged: these are found with array operations, only the others are
+    hashed and compared one by one.
+
+    Returns:
+        node_map -- (n,) int64 array, cluster of every point
+        members -- (k,) int64 array, first point of every cluster
+    """
+    positions = positions.reshape(-1, 2)
+    crowded = np.flatnonzero(_close_on_axis(positions[:, 0], tolerance) &
+                             _close_on_axis(positions[:, 1], tolerance))
+    size = tolerance if tolerance > 0 else 1.0
+    first = np.arange(len(positions), dtype=np.int64)
+    found = {}
+    points = {}
+    for k, (x, y) in zip(crowded.tolist(), positions[crowded].tolist()):
+        points[k] = x, y
+        cx, cy = math.floor(x / size), math.floor(y / size)
+        near = _first_near(found, points, x, y, cx, cy, tolerance)
+        if near is None:
+            found.setdefault((cx, cy), []).append(k)
+        else:
+            first[k] = near
+    is_first = first == np.arange(len(first))
+    cluster = np.cumsum(is_first) - 1
+    return cluster[first], np.flatnonzero(is_first)
+
+
+def _close_on_axis(values, tolerance):
+    """Whether another value is within tolerance of each value"""
+    order = np.argsort(values, kind="stable")
+    gaps = np.diff(values[order]) <= tolerance
+    close = np.zeros(len(values), dtype=bool)
+    close[order[1:]] |= gaps
+    close[order[:-1]] |= gaps
+    return close
+
+
+def _first_near(found, points, x, y, cx, cy, tolerance):
+    """First point in the cells around (cx, cy) within tolerance of (x, y)"""
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for k in found.get((cx + dx, cy + dy), ()):
+                px, py = points[k]
+                if math.hypot(px - x, py - y) <= tolerance:
+                    return k
+    return None
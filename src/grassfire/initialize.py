@@ -1,11 +1,14 @@
 import logging
+import math
 
 from tri.delaunay.iter import RegionatedTriangleIterator, StarEdgeIterator, Edge
 from tri.delaunay.tds import cw, ccw, orient2d
 
 from grassfire.primitives import Skeleton, SkeletonNode
 from grassfire.primitives import InfiniteVertex, KineticTriangle, KineticVertex
-from grassfire.line2d import WaveFront, WaveFrontIntersector
+from grassfire.line2d import WaveFront
+from grassfire.collapse import area_collapse_time_coeff, solve_quadratic
+from grassfire.events.flip import flip
 
 
 def rotate_until_not_in_candidates(t, v, direction, candidates):
@@ -89,7 +92,7 @@ def init_skeleton(dt):
     avg_y = 0.0
     for v in dt.vertices:
         if v.is_finite:
-            nodes[v] = SkeletonNode(pos=(v.x, v.y), step=-1, info=v.info)
+            nodes[v] = SkeletonNode(pos=(v.x, v.y), step=-1, info=v.info, time=0.0)
             avg_x += v.x / len(dt.vertices)
             avg_y += v.y / len(dt.vertices)
 
@@ -173,8 +176,7 @@ def init_skeleton(dt):
             assert left is not None
             assert right is not None
 
-            intersector = WaveFrontIntersector(left, right)
-            bi = intersector.get_bisector()
+            bi = skel.wavefront_pairs[left, right].bisector
 
             ur = right.line
             ul = left.line
@@ -299,11 +301,92 @@ def internal_only_skeleton(skel):
     """
     new = Skeleton()
     new.sk_nodes = skel.sk_nodes[:]
+    new.wavefront_pairs = skel.wavefront_pairs
     new.triangles = [t for t in skel.triangles if t.internal]
     new.vertices = [v for v in skel.vertices if v.internal]
+    # break the cycles of the triangles that are dropped
+    for t in skel.triangles:
+        if not t.internal:
+            t.event = None
+            t.neighbours = [None, None, None]
     return new
 
 
+def first_area_collapse(t):
+    """Returns the first time (> 0) the area of kinetic triangle t becomes 0,
+    math.inf if its area does not become 0.
+    """
+    A, B, C = area_collapse_time_coeff(*t.vertices)
+    times = [time for time in solve_quadratic(A, B, C) if time > 0]
+    if times:
+        return min(times)
+    return math.inf
+
+
+def minimize_initial_flips(skel, max_passes=3):
+    """Flip unconstrained edges of the initial kinetic triangulation, so that
+    the earliest area collapse of the two triangles sharing the edge happens
+    later.
+
+    Long needle triangles (typically near reflex vertices) otherwise collapse
+    almost immediately and are flipped during propagation.
+    The vertex velocities at t=0 are used to predict the collapses; an edge is
+    only flipped when the quadrilateral is strictly convex at t=0, and the
+    wavefront (constrained) edges are never changed.
+
+    Returns:
+        the number of flips performed
+    """
+    def is_kinetic(t):
+        return all(isinstance(v, KineticVertex) for v in t.vertices)
+
+    def is_ccw(a, b, c):
+        return orient2d(a.origin, b.origin, c.origin) > 0
+
+    collapse = {}
+    for t in skel.triangles:
+        if is_kinetic(t):
+            collapse[t] = first_area_collapse(t)
+
+    flips = 0
+    for _ in range(max_passes):
+        flipped = False
+        for t0 in skel.triangles:
+            if t0 not in collapse:
+                continue
+            for side0 in range(3):
+                t1 = t0.neighbours[side0]
+                if t1 is None or t1 not in collapse:
+                    continue
+                side1 = t1.neighbours.index(t0)
+                # quadrilateral A, B, C, D in ccw order, as in flip()
+                A = t0.vertices[side0]
+                B = t0.vertices[ccw(side0)]
+                C = t1.vertices[side1]
+                D = t0.vertices[cw(side0)]
+                # the new diagonal A-C should lie inside the quadrilateral
+                if not (is_ccw(A, B, C) and is_ccw(C, D, A)):
+                    continue
+                before = sorted((collapse[t0], collapse[t1]))
+                flip(t0, side0, t1, side1)
+                after = sorted((first_area_collapse(t0), first_area_collapse(t1)))
+                # (times can be infinite, so compare with an explicit margin)
+                if after[0] > before[0] + 1e-9:
+                    collapse[t0] = first_area_collapse(t0)
+                    collapse[t1] = first_area_collapse(t1)
+                    flips += 1
+                    flipped = True
+                    break
+                # no improvement, flip back: this leaves the triangle that
+                # was t1 in t0 and the other way round
+                flip(t0, 1, t1, 1)
+                collapse[t0], collapse[t1] = collapse[t1], collapse[t0]
+        if not flipped:
+            break
+    logging.debug("{} initial flips to delay area collapses".format(flips))
+    return flips
+
+
 def check_ktriangles(L, now=0):
     """Check whether kinetic triangles are all linked up properly."""
     valid = True
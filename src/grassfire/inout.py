@@ -3,6 +3,8 @@ from tri.delaunay.tds import Edge
 from tri.delaunay.iter import TriangleIterator, FiniteEdgeIterator
 import logging
 
+from grassfire.lifetime import LifetimeIndex
+from grassfire.primitives import KineticVertex
 from grassfire.vectorops import mul, dist, add, unit, norm
 
 # ------------------------------------------------------------------------------
@@ -52,38 +54,22 @@ def output_offsets(skel, now=1000, ct=5):
     # inc = 0.005 #
     inc = now / float(ct)
     times = [t*inc for t in range(ct)]
-    with open("/tmpfast/offsetsl.wkt", "w") as fh:
-        fh.write("wkt;time;from;to\n")
-        for t in times:
-            for v in skel.vertices:
-                if (v.starts_at <= t and v.stops_at > t) or \
-                    (v.starts_at <= t and v.stops_at is None):
-                    try:
-                        s = "LINESTRING({0[0]} {0[1]}, {1[0]} {1[1]});{2};{3};{4}".format(v.visualize_at(t),
-                                                                              v.left_at(t).visualize_at(t),
-                                                                              t,
-                                                                              id(v), id(v.left_at(t)))
-                        fh.write(s)
-                        fh.write("\n")
-                    except AttributeError:
-                        pass
-
-    with open("/tmpfast/offsetsr.wkt", "w") as fh:
-        fh.write("wkt;time;from;to\n")
-        for t in times:
-            for v in skel.vertices:
-                if v.starts_at <= t and v.stops_at > t or \
-                    (v.starts_at <= t and v.stops_at is None):
-                # finite ranges only (not None is filtered out)
-                    try:
-                        s = "LINESTRING({0[0]} {0[1]}, {1[0]} {1[1]});{2};{3};{4}".format(v.visualize_at(t),
-                                                                              v.right_at(t).visualize_at(t),
-                                                                              t,
-                                                                              id(v), id(v.right_at(t)))
-                        fh.write(s)
-                        fh.write("\n")
-                    except AttributeError:
-                        pass
+    index = LifetimeIndex(skel.vertices)
+    for name, neighbour_at in (("offsetsl", KineticVertex.left_at),
+                               ("offsetsr", KineticVertex.right_at)):
+        with open("/tmpfast/{}.wkt".format(name), "w") as fh:
+            fh.write("wkt;time;from;to\n")
+            for t in times:
+                for v in index.active_at(t):
+                    other = neighbour_at(v, t)
+                    if other is None:
+                        continue
+                    s = "LINESTRING({0[0]} {0[1]}, {1[0]} {1[1]});{2};{3};{4}".format(v.visualize_at(t),
+                                                                          other.visualize_at(t),
+                                                                          t,
+                                                                          id(v), id(other))
+                    fh.write(s)
+                    fh.write("\n")
 
 
 def output_skel(skel, when):
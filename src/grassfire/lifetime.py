@@ -0,0 +1,104 @@
+"""Index on the lifetimes of the kinetic vertices
+
+A kinetic vertex is active from starts_at up to (not including) stops_at,
+vertices that never stop are active forever. LifetimeIndex keeps these
+intervals in a centered interval tree, so that the vertices that are active
+at a time, or during a time range, are found without testing all vertices:
+both queries take O(log n + k) for k vertices found.
+
+Build the index once the wavefront propagation is done (the lifetimes of the
+vertices do not change anymore) and use it for all queries on the skeleton.
+"""
+
+INF = float("inf")
+
+
+class _Node(object):
+    __slots__ = ("center", "by_start", "by_stop", "left", "right")
+
+    def __init__(self, center, by_start, by_stop, left, right):
+        self.center = center
+        self.by_start = by_start  # (start, index), ascending
+        self.by_stop = by_stop  # (stop, index), descending
+        self.left = left
+        self.right = right
+
+
+def _build(intervals):
+    """Builds the tree for a list of (start, stop, index) intervals"""
+    if not intervals:
+        return None
+    ends = sorted(t for start, stop, _ in intervals for t in (start, stop) if t != INF)
+    center = ends[len(ends) // 2]
+    here, left, right = [], [], []
+    for interval in intervals:
+        start, stop, _ = interval
+        if stop < center:
+            left.append(interval)
+        elif start > center:
+            right.append(interval)
+        else:
+            here.append(interval)
+    return _Node(
+        center,
+        sorted((start, i) for start, _, i in here),
+        sorted(((stop, i) for _, stop, i in here), reverse=True),
+        _build(left),
+        _build(right),
+    )
+
+
+class LifetimeIndex(object):
+    """Interval tree on [starts_at, stops_at) of the given kinetic vertices"""
+
+    def __init__(self, vertices):
+        self.vertices = list(vertices)
+        intervals = []
+        for i, v in enumerate(self.vertices):
+            if v.starts_at is None:
+                continue
+            stop = INF if v.stops_at is None else v.stops_at
+            intervals.append((v.starts_at, stop, i))
+        self._root = _build(intervals)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def _overlapping(self, t0, t1):
+        """Indices of the intervals with start <= t1 and stop > t0"""
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if t1 < node.center:
+                # all intervals here stop after the center (> t1 >= t0)
+                for start, i in node.by_start:
+                    if start > t1:
+                        break
+                    found.append(i)
+                stack.append(node.left)
+            elif t0 >= node.center:
+                # all intervals here start before the center (<= t0 <= t1)
+                for stop, i in node.by_stop:
+                    if stop <= t0:
+                        break
+                    found.append(i)
+                stack.append(node.right)
+            else:
+                found.extend(i for _, i in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        found.sort()
+        return found
+
+    def active_at(self, t):
+        """The vertices with starts_at <= t < stops_at (in the order given)"""
+        vertices = self.vertices
+        return [vertices[i] for i in self._overlapping(t, t)]
+
+    def active_between(self, t0, t1):
+        """The vertices that are active at some time in [t0, t1]"""
+        vertices = self.vertices
+        return [vertices[i] for i in self._overlapping(t0, t1)]
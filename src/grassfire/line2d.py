@@ -271,12 +271,36 @@ class WaveFrontIntersector:
         logging.debug(self.right)
 
     def get_bisector(self):
+        return WaveFrontPair(self.left, self.right).bisector
+
+    def get_intersection_at_t(self, t):
+        status, x, y = intersect_at_time(self.left.line, self.right.line, t)
+        if status == LineLineIntersectionResult.POINT:
+            return (x, y)
+        else:
+            raise ValueError('parallel lines, can not compute point of intersection')
+
+
+class WaveFrontPair:
+    """ The intersection of two wavefronts, solved once
+
+    Holds the intersection type of the two support lines, their point of
+    intersection at t=0 and the bisector (the velocity with which the point
+    of intersection moves, when both wavefronts move at unit speed).
+    """
+    __slots__ = ("left", "right", "tp", "point", "bisector")
+
+    def __init__(self, wf_left, wf_right):
+        self.left = wf_left
+        self.right = wf_right
+        left, right = wf_left.line, wf_right.line
         # configuration at time t=0
-        intersector = LineLineIntersector(self.left.line, self.right.line)
-        res = intersector.intersection_type()
+        res, x, y = intersect_at_time(left, right, 0.0)
+        self.tp = res
+        self.point = None
         if res == LineLineIntersectionResult.LINE:
             # parallel = True; intersect = True
-            bi = add(mul(self.left.line.w, 0.5), mul(self.right.line.w, 0.5))
+            bi = add(mul(left.w, 0.5), mul(right.w, 0.5))
             # the magnitude of the bisector here is either:
             #
             #  a) near 0.0 -> wavefronts moving in opposite direction
@@ -284,32 +308,54 @@ class WaveFrontIntersector:
         elif res == LineLineIntersectionResult.POINT:
             # parallel = False; intersect = True
             # configuration at time t = 1 (line.w == unit vector)
-            left_translated = self.left.line.translated(self.left.line.w)
-            right_translated = self.right.line.translated(self.right.line.w)
-
-            intersector_inner = LineLineIntersector(left_translated, right_translated)
-            inner_res = intersector_inner.intersection_type()
+            self.point = (x, y)
+            inner_res, x1, y1 = intersect_at_time(left, right, 1.0)
             assert inner_res == LineLineIntersectionResult.POINT
-            bi = make_vector(end=intersector_inner.result, start=intersector.result)
+            bi = (x1 - x, y1 - y)
         elif res == LineLineIntersectionResult.NO_INTERSECTION:
             # parallel = True; intersect = False
-            added = add(self.left.line.w, self.right.line.w)
+            added = add(left.w, right.w)
             bi = added
             # assert near_zero(magn)
         else:
             raise RuntimeError(f"Unknown intersection type: {res}")
-        magn = norm(bi)
-        logging.debug("magnitude of bisector: {}".format(magn))
-        return bi
+        logging.debug("magnitude of bisector: {}".format(norm(bi)))
+        self.bisector = bi
+
+    def intersection_at_t(self, t):
+        """ intersection of the two wavefronts at time *t*
+
+        Returns (status, x, y), with status a LineLineIntersectionResult code
+        and x, y only set when status is POINT.
+        """
+        if self.tp == LineLineIntersectionResult.POINT:
+            (px, py), (bx, by) = self.point, self.bisector
+            return self.tp, px + t * bx, py + t * by
+        return self.tp, None, None
 
     def get_intersection_at_t(self, t):
-        intersector = LineLineIntersector(self.left.line.at_time(t), self.right.line.at_time(t))
-        if intersector.intersection_type() == LineLineIntersectionResult.POINT:
-            return intersector.result
+        """ point of intersection of the two wavefronts at time *t* """
+        status, x, y = self.intersection_at_t(t)
+        if status == LineLineIntersectionResult.POINT:
+            return (x, y)
         else:
             raise ValueError('parallel lines, can not compute point of intersection')
 
 
+class WaveFrontPairs(dict):
+    """ Cache of WaveFrontPair objects, keyed on the (left, right) wavefronts
+
+    WaveFront objects are shared between kinetic vertices and not changed
+    after construction, so every pair only has to be solved once per run:
+    pairs[left, right] solves the pair on first use.
+    """
+    __slots__ = ()
+
+    def __missing__(self, key):
+        pair = self[key] = WaveFrontPair(*key)
+        return pair
+
+
 class LineLineIntersectionResult:
     NO_INTERSECTION = 0
     POINT = 1
@@ -367,6 +413,37 @@ class LineLineIntersector:
             return LineLineIntersectionResult.POINT
 
 
+def intersect_at_time(one, other, t):
+    """ Intersect two Line2 objects, that move with unit speed in the direction
+    of their normal, at time *t*
+
+    Works with the stored normal and offset only (scalar float math, no new
+    Line2 objects are made) and gives the same outcome as intersecting
+    one.at_time(t) and other.at_time(t) with a LineLineIntersector.
+
+    Returns (status, x, y):
+        status -- LineLineIntersectionResult code
+        x, y -- point of intersection, None if status is not POINT
+    """
+    (a1, b1), c1 = one.w, one.b
+    (a2, b2), c2 = other.w, other.b
+    if t != 0.0:
+        # translate the lines over t * w
+        c1 -= t * (a1 * a1 + b1 * b1)
+        c2 -= t * (a2 * a2 + b2 * b2)
+    denom = a1 * b2 - a2 * b1
+    if near_zero(denom):
+        if near_zero(a1 * c2 - a2 * c1) and near_zero(b1 * c2 - b2 * c1):
+            # overlapping lines, always intersecting in this configuration
+            return LineLineIntersectionResult.LINE, None, None
+        # parallel lines, but not intersecting in this configuration
+        return LineLineIntersectionResult.NO_INTERSECTION, None, None
+    # crossing lines
+    return (LineLineIntersectionResult.POINT,
+            (b1 * c2 - b2 * c1) / denom,
+            (a2 * c1 - a1 * c2) / denom)
+
+
 def rotate90ccw(v):
     """Rotate 2d vector 90 degrees counter clockwise
 
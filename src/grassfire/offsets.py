@@ -0,0 +1,74 @@
+"""Offset rings of the wavefront
+
+At time t, the kinetic vertices that are active form closed rings: following
+the left neighbour (left_at(t)) of a vertex leads back to it. The positions of
+the vertices along such a ring are the offset of the input at distance t.
+
+offset_rings walks these rings for a list of distances at once: the lifetime
+index, and the origins and velocities of the vertices (as arrays) are made
+once for all distances, positions are then computed vectorized per distance.
+"""
+
+import numpy as np
+
+from grassfire.lifetime import LifetimeIndex
+
+
+def offset_rings(skel, distances, index=None):
+    """Returns the offset rings of the wavefront at the given distances
+
+    distances -- iterable of distances (in the units of the input, that is,
+                 before the transform of skel)
+    index -- LifetimeIndex on skel.vertices to use (made if not given)
+
+    Returns:
+        list with for every distance a list of closed rings, each an
+        (n + 1, 2) float64 array of coordinates (last equals first) in the
+        coordinates of the input. Rings follow the left neighbours of the
+        vertices; parts of the wavefront with less than 3 vertices (that
+        just collapsed) are left out.
+    """
+    vertices = skel.vertices
+    if index is None:
+        index = LifetimeIndex(vertices)
+    position = {id(v): i for i, v in enumerate(vertices)}
+    origins = np.array([v.origin if not v.inf_fast else v.start_node.pos
+                        for v in vertices], dtype=np.float64).reshape(-1, 2)
+    velocities = np.array([v.velocity if not v.inf_fast else (0.0, 0.0)
+                           for v in vertices], dtype=np.float64).reshape(-1, 2)
+    scale = skel.transform.scale[0] if skel.transform is not None else 1.0
+
+    result = []
+    for distance in distances:
+        t = distance / scale
+        active = index.active_at(t)
+        ids = [position[id(v)] for v in active]
+        left = {}
+        for i, v in zip(ids, active):
+            neighbour = v.left_at(t)
+            if neighbour is not None:
+                left[i] = position.get(id(neighbour))
+        points = origins[ids] + t * velocities[ids] if ids else origins[:0]
+        row = dict(zip(ids, range(len(ids))))
+        if skel.transform is not None:
+            points = skel.transform.backward_array(points)
+        rings = []
+        done = set()
+        for start in ids:
+            if start in done:
+                continue
+            ring = [start]
+            done.add(start)
+            i = left.get(start)
+            while i is not None and i != start and i not in done and i in row:
+                ring.append(i)
+                done.add(i)
+                i = left.get(i)
+            # only closed rings (an open chain means the links are not
+            # consistent at t, e.g. exactly at an event)
+            if i == start and len(ring) >= 3:
+                rows = [row[i] for i in ring]
+                rows.append(rows[0])
+                rings.append(points[rows])
+        result.append(rings)
+    return result
@@ -1,11 +1,25 @@
+import weakref
+from bisect import bisect_right
 from collections import namedtuple
 from grassfire.calc import near_zero
+from grassfire.line2d import WaveFrontPairs
 from grassfire.vectorops import norm
 
 import logging
 
 class Event(object):
-    """ """
+    """Event of a kinetic triangle
+
+    A triangle keeps one event record (tri.event), that is updated in place
+    when its collapse is recomputed (see collapse.make_event). While queued,
+    seq is the sequence number of its entry in the EventQueue.
+
+    A "recheck" event holds a conservative lower bound on the collapse time;
+    the exact event (as computed at time since, with sieve) is only computed
+    once the event loop reaches it.
+    """
+    __slots__ = ("time", "triangle", "side", "tp", "triangle_tp",
+                 "since", "sieve", "had_event", "seq")
 
     def __init__(self, when, tri, side=None, tp=None, tri_tp=-1):
         """ """
@@ -15,6 +29,11 @@ class Event(object):
         self.tp = tp
         assert tri_tp != -1
         self.triangle_tp = tri_tp
+        self.since = None
+        self.sieve = None
+        # for a recheck: whether the triangle had an event before
+        self.had_event = True
+        self.seq = None
 
     def __str__(self):
         """ """
@@ -39,7 +58,40 @@ class Skeleton(object):
         # when we 'shrink' the geometry to get more floating point accuracy,
         # we can get back with this object to the original location
         self.transform = None
+        # seconds spent per stage of the calculation (see calc_skel)
+        self.timings = {}
+        # number of events handled per type (see event_loop)
+        self.event_counts = {}
+        # solved (left, right) wavefront pairs, shared by the event handlers
+        self.wavefront_pairs = WaveFrontPairs()
+        # receives the vertices when they stop (see grassfire.stream)
+        self.stream = None
+        # the wavefront at the capture times (see grassfire.snapshots)
+        self.snapshots = []
+
+    def release_triangles(self):
+        """Drop the kinetic triangulation, once the wavefront propagation is
+        done, so that its reference cycles (neighbours, events) do not keep
+        the skeleton alive until the cyclic garbage collector runs
+        """
+        for t in self.triangles:
+            t.event = None
+            t.neighbours = [None, None, None]
+        self.triangles = []
 
+    def stopped(self, vertices):
+        """Passes vertices that just stopped to the stream, if there is one
+        (their segment of the skeleton is then final)
+        """
+        if self.stream is not None:
+            self.stream.stopped(vertices)
+
+    def __reduce__(self):
+        """Pickle as flat arrays (see grassfire.serialize), instead of
+        recursing through the object graph
+        """
+        from grassfire.serialize import skeleton_from_state, skeleton_state
+        return skeleton_from_state, (skeleton_state(self),)
 
     def segments(self):
         """ """
@@ -62,9 +114,9 @@ class Skeleton(object):
 
 
 class SkeletonNode(object):
-    __slots__ = ("pos", "step", "info",)
+    __slots__ = ("pos", "step", "info", "time",)
 
-    def __init__(self, pos, step, info=None):
+    def __init__(self, pos, step, info=None, time=None):
         self.pos = pos
 
         x, y = pos
@@ -73,6 +125,7 @@ class SkeletonNode(object):
 
         self.step = step
         self.info = info  # the info of the vertex in the triangulation
+        self.time = time  # the time of the event that made the node
 
     def position_at(self, time):
         """Returns the position of this skeleton node
@@ -85,7 +138,8 @@ class KineticVertex(object):
     __slots__ = ("origin", "velocity",
                  "starts_at", "stops_at",
                  "start_node", "stop_node",
-                 "_left", "_right", "info", "ul", "ur", "inf_fast", "internal", "wfl", "wfr", "turn"
+                 "_left", "_right", "info", "ul", "ur", "inf_fast", "internal", "wfl", "wfr", "turn",
+                 "__weakref__"
                  )
 
     def __init__(self, origin=None, velocity=None, ul=None, ur=None):
@@ -94,7 +148,9 @@ class KineticVertex(object):
         # next / prev pos
         # while looking in direction of bisector, see which
         # kinetic vertex you see on the left, and which on the right
-        self._left = []  # (start, stop, vertex)
+        # (the vertices are owned by the skeleton, the histories only keep
+        # weak references, so that they do not form reference cycles)
+        self._left = []  # (start, stop, weak reference to vertex)
         self._right = []
 
         # floats
@@ -168,13 +224,13 @@ class KineticVertex(object):
     def left(self):
         """ """
         if self._left:
-            return self._left[-1][2]
+            return _deref(self._left[-1][2])
 
     @property
     def right(self):
         """ """
         if self._right:
-            return self._right[-1][2]
+            return _deref(self._right[-1][2])
 
     @left.setter
     def left(self, v):
@@ -186,7 +242,7 @@ class KineticVertex(object):
         ref, time, = v
         if len(self._left) > 0:
             self._left[-1] = self._left[-1][0], time, self._left[-1][2]
-        self._left.append((time, None, ref))
+        self._left.append((time, None, _weak(ref)))
 
     @right.setter
     def right(self, v):
@@ -194,23 +250,45 @@ class KineticVertex(object):
         ref, time, = v
         if len(self._right) > 0:
             self._right[-1] = self._right[-1][0], time, self._right[-1][2]
-        self._right.append((time, None, ref))
+        self._right.append((time, None, _weak(ref)))
 
     def left_at(self, time):
         """ """
-        for item in self._left:
-            if (item[0] <= time and item[1] is not None and item[1] > time) or \
-                    (item[0] <= time and item[1] is None):
-                return item[2]
-        return None
+        return _neighbour_at(self._left, time)
 
     def right_at(self, time):
         """ """
-        for item in self._right:
-            if (item[0] <= time and item[1] is not None and item[1] > time) or \
-                    (item[0] <= time and item[1] is None):
-                return item[2]
-        return None
+        return _neighbour_at(self._right, time)
+
+
+def _neighbour_at(history, time):
+    """The neighbour in the (start, stop, reference) history at time
+
+    The entries follow each other in time (the stop of an entry is the start
+    of the next), so the entry is the last one that starts at or before time
+    """
+    i = bisect_right(history, time, key=_start) - 1
+    if i >= 0:
+        start, stop, ref = history[i]
+        if stop is None or stop > time:
+            return _deref(ref)
+    # fall back to a scan, for histories that are not in time order
+    for start, stop, ref in history:
+        if start <= time and (stop is None or stop > time):
+            return _deref(ref)
+    return None
+
+
+def _start(item):
+    return item[0]
+
+
+def _weak(vertex):
+    return None if vertex is None else weakref.ref(vertex)
+
+
+def _deref(ref):
+    return None if ref is None else ref()
 
 
 class InfiniteVertex(object):  # Stationary Vertex
@@ -262,8 +340,8 @@ class KineticTriangle(object):
         self.wavefront_directions = [None, None, None]
         self.wavefront_support_lines = [None, None, None]
         self.event = None  # point back to event,
-                           # note this might prevent
-                           # garbage collection (strong cycle)
+                           # note this is a strong cycle, that
+                           # Skeleton.release_triangles breaks
         self.info = None
         self.stops_at = None
         self.internal = False
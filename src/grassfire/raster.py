@@ -0,0 +1,84 @@
+"""Raster of the time at which the wavefront arrives
+
+Inside the face of an input edge (see grassfire.faces), the wavefront
+arrives at a point at a time equal to its distance to the supporting line of
+the edge: the time is linear over the face. arrival_time_raster scan-converts
+the faces onto a grid, tile by tile: per tile, the faces that overlap it are
+intersected with the rows of the tile (one crossing computation per row and
+face edge, not per cell), and the cells between pairs of crossings get the
+linear time of the face. The memory used is bounded by the tile size.
+
+For the internal skeleton the result is the distance to the boundary of the
+input as far as the straight skeleton measures it (at reflex corners this is
+the distance to the supporting lines of the edges, not to the corner).
+"""
+
+import numpy as np
+
+from grassfire.faces import FaceIndex, skeleton_faces
+
+
+def arrival_time_raster(skel, origin, cell_size, shape, tile=256, index=None):
+    """Returns the arrival time of the wavefront at the centers of the cells
+    of a grid, as (rows, columns) float64 array (NaN outside the faces)
+
+    origin -- (x, y), the corner of the grid with the lowest coordinates;
+              row i and column j span [y + i * cell_size, y + (i + 1) *
+              cell_size) and [x + j * cell_size, x + (j + 1) * cell_size)
+              (rows go up in y: flip the rows for image order)
+    cell_size -- size of the (square) cells, in the units of the input
+    shape -- (rows, columns) of the grid
+    tile -- rows / columns of the tiles that are filled at once
+    index -- FaceIndex of the skeleton (made if not given)
+    """
+    if index is None:
+        index = FaceIndex(skeleton_faces(skel))
+    rows, columns = shape
+    x0, y0 = origin
+    result = np.full((rows, columns), np.nan)
+    for r0 in range(0, rows, tile):
+        r1 = min(r0 + tile, rows)
+        ys = y0 + (np.arange(r0, r1) + 0.5) * cell_size
+        for c0 in range(0, columns, tile):
+            c1 = min(c0 + tile, columns)
+            xs = x0 + (np.arange(c0, c1) + 0.5) * cell_size
+            _fill_tile(index, xs, ys, result[r0:r1, c0:c1])
+    return result
+
+
+def _fill_tile(index, xs, ys, out):
+    """Fills out (a view on the result) for the cell centers xs, ys"""
+    boxes = index.boxes
+    overlap = np.flatnonzero((boxes[:, 0] <= xs[-1]) & (boxes[:, 2] >= xs[0]) &
+                             (boxes[:, 1] <= ys[-1]) & (boxes[:, 3] >= ys[0]))
+    done = np.zeros(out.shape, dtype=bool)
+    for i in overlap.tolist():
+        ring = index.faces[i].polygon
+        row0, row1 = np.searchsorted(ys, (boxes[i, 1], boxes[i, 3]), side="left")
+        if row0 == row1:
+            continue
+        inside = _scan(ring, xs, ys[row0:row1]) & ~done[row0:row1]
+        r, c = np.nonzero(inside)
+        if not len(r):
+            continue
+        start, end = index.starts[i], index.ends[i]
+        dx, dy = end - start
+        times = np.abs(dx * (ys[row0 + r] - start[1]) - dy * (xs[c] - start[0]))
+        out[row0 + r, c] = times / np.hypot(dx, dy)
+        done[row0 + r, c] = True
+
+
+def _scan(ring, xs, ys):
+    """Cells (len(ys), len(xs)) with their center inside the closed ring
+    (even-odd rule, as in the point location of grassfire.faces)"""
+    x0, y0 = ring[:-1, 0, None], ring[:-1, 1, None]
+    x1, y1 = ring[1:, 0, None], ring[1:, 1, None]
+    crosses = (y0 > ys) != (y1 > ys)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = x0 + (ys - y0) * (x1 - x0) / (y1 - y0)
+    # crossings per row, sorted, pairs of them bound the spans inside
+    x = np.sort(np.where(crosses, x, np.inf), axis=0)
+    count = int(crosses.sum(axis=0).max()) if len(ys) else 0
+    count -= count % 2
+    enter, leave = x[0:count:2, :, None], x[1:count:2, :, None]
+    return ((enter <= xs) & (xs < leave)).any(axis=0)
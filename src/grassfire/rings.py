@@ -0,0 +1,238 @@
+"""Helpers for the engines that propagate the wavefront as circular lists of
+kinetic vertices (one list per ring), without kinetic triangulation
+
+The input rings are oriented such that the interior is at the left of every
+edge (outer rings counterclockwise, holes clockwise), so that every wavefront
+moves to the left of its edge, like the wavefronts made by init_skeleton.
+"""
+
+import math
+
+from grassfire.calc import near_zero
+from grassfire.events.lib import stop_kvertices
+from grassfire.line2d import WaveFront
+from grassfire.primitives import KineticVertex, Skeleton, SkeletonNode
+
+
+def rings_from_segments(points, segments):
+    """Returns the closed rings (lists of point indices) that the segments
+    form, in the order of the segments
+
+    Returns None if the segments do not form closed rings that use every
+    point exactly once (e.g. rings touching each other, or dangling segments).
+    """
+    segments = [(a, b) for a, b in segments if a != b]
+    if len(segments) < 3 or len(segments) != len(points):
+        return None
+    adjacent = {}
+    for a, b in segments:
+        adjacent.setdefault(a, []).append(b)
+        adjacent.setdefault(b, []).append(a)
+    if len(adjacent) != len(points) or any(len(v) != 2 for v in adjacent.values()):
+        return None
+    rings = []
+    visited = set()
+    for start, _ in segments:
+        if start in visited:
+            continue
+        ring = [start]
+        visited.add(start)
+        prev, cur = start, adjacent[start][0]
+        while cur != start:
+            if cur in visited:
+                return None
+            ring.append(cur)
+            visited.add(cur)
+            a, b = adjacent[cur]
+            prev, cur = cur, (b if a == prev else a)
+        if len(ring) < 3:
+            return None
+        rings.append(ring)
+    return rings
+
+
+def signed_area(points, ring):
+    """Twice the signed area of the ring (positive if counterclockwise)"""
+    area = 0.0
+    for i in range(len(ring)):
+        (x0, y0), (x1, y1) = points[ring[i - 1]], points[ring[i]]
+        area += x0 * y1 - x1 * y0
+    return area
+
+
+def _inside(points, ring, pt):
+    """Point in polygon test (crossing number)"""
+    x, y = pt
+    inside = False
+    for i in range(len(ring)):
+        (x0, y0), (x1, y1) = points[ring[i - 1]], points[ring[i]]
+        if (y0 > y) != (y1 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+def orient_rings(points, rings):
+    """Orients the rings in place, such that the interior is at the left:
+    rings at even nesting depth counterclockwise, the others clockwise"""
+    areas = [signed_area(points, ring) for ring in rings]
+    for i, ring in enumerate(rings):
+        pt = points[ring[0]]
+        depth = sum(
+            1
+            for j, other in enumerate(rings)
+            if j != i and abs(areas[j]) > abs(areas[i]) and _inside(points, other, pt)
+        )
+        if (areas[i] > 0) != (depth % 2 == 0):
+            ring.reverse()
+    return rings
+
+
+def ring_from_segments(points, segments):
+    """Returns the point indices of the one closed ring that the segments
+    form, in counterclockwise order
+
+    Returns None if the segments do not form exactly one ring that uses all
+    points (e.g. polygons with holes, or dangling segments).
+    """
+    rings = rings_from_segments(points, segments)
+    if rings is None or len(rings) != 1:
+        return None
+    return orient_rings(points, rings)[0]
+
+
+def turn_type(left, right):
+    """Turn type of the vertex between the wavefronts left and right"""
+    (al, bl), (ar, br) = left.line.w, right.line.w
+    # the direction of a wavefront is its normal, rotated clockwise
+    cross = bl * -ar - -al * br
+    if near_zero(cross):
+        if al * ar + bl * br > 0:
+            return "STRAIGHT"
+        return "RIGHT - REFLEX"
+    elif cross > 0:
+        return "LEFT - CONVEX"
+    return "RIGHT - REFLEX"
+
+
+def init_ring_skeleton(points, rings, infos=None):
+    """Makes the skeleton nodes and, per oriented ring of point indices, the
+    circular list of kinetic vertices"""
+    infos = dict(infos or ())
+    skel = Skeleton()
+    for ring in rings:
+        count = len(ring)
+        wavefronts = []
+        for i in range(count):
+            start, end = points[ring[i]], points[ring[(i + 1) % count]]
+            wavefronts.append(WaveFront(start, end))
+        kvertices = []
+        for i, idx in enumerate(ring):
+            x, y = points[idx]
+            node = SkeletonNode(pos=(x, y), step=-1, info=infos.get(idx), time=0.0)
+            skel.sk_nodes.append(node)
+            left, right = wavefronts[i - 1], wavefronts[i]
+            kv = KineticVertex()
+            kv.turn = turn_type(left, right)
+            kv.info = len(skel.vertices) + len(kvertices) + 1
+            kv.origin = (x, y)
+            kv.velocity = skel.wavefront_pairs[left, right].bisector
+            kv.start_node = node
+            kv.starts_at = 0
+            kv.ul = left.line
+            kv.ur = right.line
+            kv.wfl = left
+            kv.wfr = right
+            kv.internal = True
+            kvertices.append(kv)
+        for i, kv in enumerate(kvertices):
+            kv.left = kvertices[i - 1], 0
+            kv.right = kvertices[(i + 1) % count], 0
+        skel.vertices.extend(kvertices)
+    return skel
+
+
+def edge_collapse_time(v1, v2, now):
+    """Time at which the wavefront edge between v1 and its right neighbour v2
+    collapses (both kinetic vertices at the same location)
+
+    The edge length changes linearly in time, as both vertices stay on the
+    supporting line of the wavefront.
+
+    Returns None if the edge does not collapse (anymore).
+    """
+    if v1.inf_fast or v2.inf_fast:
+        if same_location(v1.position_at(now), v2.position_at(now)):
+            return now
+        return None
+    a, b = v1.ur.w
+    # direction of the wavefront: normal rotated clockwise
+    dx, dy = b, -a
+    length = dx * (v2.origin[0] - v1.origin[0]) + dy * (v2.origin[1] - v1.origin[1])
+    rate = dx * (v2.velocity[0] - v1.velocity[0]) + dy * (v2.velocity[1] - v1.velocity[1])
+    if same_location(v1.position_at(now), v2.position_at(now)):
+        return now
+    if rate >= 0 or near_zero(rate):
+        return None
+    time = -length / rate
+    if time < now:
+        if not near_zero(time - now):
+            return None
+        time = now
+    return time
+
+
+def same_location(p, q):
+    return near_zero(math.hypot(p[0] - q[0], p[1] - q[1]))
+
+
+def stop_vertices(V, step, now, skel, made_now, pos=None):
+    """Stops the kinetic vertices V at a skeleton node
+
+    Nodes that were made for another event at the same time and location
+    (e.g. all edges of a regular polygon collapse at once) are reused.
+
+    Returns:
+        the skeleton node
+    """
+    if pos is None:
+        sumx, sumy = 0.0, 0.0
+        for v in V:
+            x, y = v.position_at(now)
+            sumx += x
+            sumy += y
+        pos = sumx / len(V), sumy / len(V)
+    for sk_node in made_now:
+        if same_location(sk_node.pos, pos):
+            fresh = [v for v in V if v.stops_at is None]
+            for v in fresh:
+                v.stop_node = sk_node
+                v.stops_at = now
+            skel.stopped(fresh)
+            return sk_node
+    sk_node, newly_made = stop_kvertices(V, step, now, pos, skel=skel)
+    if newly_made:
+        skel.sk_nodes.append(sk_node)
+        made_now.append(sk_node)
+    return sk_node
+
+
+def ridge_kvertex(skel, v1, v2, now, sk_node):
+    """The vertex made when the edge between v1 and v2 collapses, while the
+    wavefronts left of v1 and right of v2 are parallel (as compute_new_kvertex
+    makes it: infinitely fast, at the node)"""
+    kv = KineticVertex()
+    kv.info = len(skel.vertices) + 1
+    kv.starts_at = now
+    kv.start_node = sk_node
+    kv.internal = True
+    kv.velocity = (0, 0)
+    kv.inf_fast = True
+    kv.origin = sk_node.pos
+    kv.ul = v1.ul
+    kv.ur = v2.ur
+    kv.wfl = v1.wfl
+    kv.wfr = v2.wfr
+    kv.turn = "LEFT - CONVEX"
+    skel.vertices.append(kv)
+    return kv
@@ -0,0 +1,115 @@
+"""Triangulated roof over the skeleton
+
+Lifting every node of the skeleton to the time at which the wavefront made
+it gives the roof of the input (all sides pitched equally): every face of
+the skeleton (see grassfire.faces) becomes one planar roof face. roof_mesh
+triangulates all faces together with array operations: a face is fanned
+from its first corner; faces for which that fan folds over (that are not
+star-shaped from that corner) are fanned from their next nodes, and only
+the faces for which no fan works are ear clipped one by one.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from grassfire.faces import skeleton_faces
+
+
+RoofMesh = namedtuple("RoofMesh", ["vertices", "triangles", "faces"])
+RoofMesh.__doc__ = """Triangle mesh of the roof
+
+vertices -- (n, 3) float64 array, x, y and height (time x pitch)
+triangles -- (k, 3) int64 array, vertices of the triangles, counterclockwise
+             seen from above
+faces -- (k,) int64 array, face (in the list of faces) of the triangles
+"""
+
+
+def roof_mesh(skel, pitch=1.0, faces=None):
+    """Returns the roof over skel as RoofMesh
+
+    pitch -- rise of the roof per unit of distance to the input
+    faces -- faces of skel to use (see grassfire.faces.skeleton_faces; made
+             if not given)
+    """
+    if faces is None:
+        faces = skeleton_faces(skel)
+    sizes = np.array([len(f.polygon) - 1 for f in faces], dtype=np.int64)
+    if not len(faces):
+        return RoofMesh(np.empty((0, 3)), np.empty((0, 3), dtype=np.int64),
+                        np.empty(0, dtype=np.int64))
+    coords = np.concatenate([f.polygon[:-1] for f in faces])
+    times = np.concatenate([f.times[:-1] for f in faces])
+    first = np.cumsum(sizes) - sizes
+    # faces share their nodes: one mesh vertex per position
+    unique, position, inverse = np.unique(coords, axis=0, return_index=True,
+                                          return_inverse=True)
+    vertices = np.column_stack((unique, times[position] * pitch))
+    inverse = inverse.ravel()
+
+    # orientation of the faces
+    nxt = np.arange(len(coords)) + 1
+    nxt[first + sizes - 1] = first
+    cross = coords[:, 0] * coords[nxt, 1] - coords[nxt, 0] * coords[:, 1]
+    orientation = np.where(np.add.reduceat(cross, first) < 0, -1.0, 1.0)
+
+    count = np.maximum(sizes - 2, 0)
+    tri_face = np.repeat(np.arange(len(faces)), count)
+    step = np.arange(len(tri_face)) - np.repeat(np.cumsum(count) - count, count)
+    # triangles with an area below this (in the wrong direction) are flat
+    eps = 1e-12 * float(np.ptp(coords, axis=0).max()) ** 2
+    rotation = np.zeros(len(faces), dtype=np.int64)
+    todo = np.arange(len(faces))
+    triangles = np.empty((len(tri_face), 3), dtype=np.int64)
+    for _ in range(int(sizes.max())):
+        rows = np.flatnonzero(np.isin(tri_face, todo))
+        f = tri_face[rows]
+        corners = np.column_stack([(rotation[f] + k) % sizes[f]
+                                   for k in (0, step[rows] + 1, step[rows] + 2)])
+        triangles[rows] = first[f, None] + corners
+        a, b, c = (coords[triangles[rows, k]] for k in range(3))
+        area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - \
+            (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+        folded = np.unique(f[area * orientation[f] < -eps])
+        rotation[folded] += 1
+        todo = folded
+        if not len(todo):
+            break
+    for i in todo.tolist():
+        rows = np.flatnonzero(tri_face == i)
+        triangles[rows] = first[i] + _ear_clip(faces[i].polygon[:-1], orientation[i])
+
+    # counterclockwise, seen from above
+    flip = orientation[tri_face] < 0
+    triangles[flip] = triangles[flip][:, ::-1]
+    return RoofMesh(vertices, inverse[triangles], tri_face)
+
+
+def _ear_clip(ring, orientation):
+    """Triangles (as corner indices) of the simple polygon ring (not closed)"""
+    left = list(range(len(ring)))
+    triangles = []
+    pts = ring.tolist()
+
+    def area(i, j, k):
+        (ax, ay), (bx, by), (cx, cy) = pts[i], pts[j], pts[k]
+        return ((bx - ax) * (cy - ay) - (by - ay) * (cx - ax)) * orientation
+
+    def inside(p, i, j, k):
+        return area(i, j, p) >= 0 and area(j, k, p) >= 0 and area(k, i, p) >= 0
+
+    while len(left) > 3:
+        for at in range(len(left)):
+            i, j, k = left[at - 1], left[at], left[(at + 1) % len(left)]
+            if area(i, j, k) > 0 and not any(inside(p, i, j, k) for p in left
+                                             if p not in (i, j, k)):
+                break
+        else:
+            # no ear (degenerate polygon): cut off any corner
+            at = 1
+            i, j, k = left[0], left[1], left[2]
+        triangles.append((i, j, k))
+        del left[at]
+    triangles.append(tuple(left))
+    return triangles
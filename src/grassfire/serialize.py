@@ -0,0 +1,304 @@
+"""Flat serialization of a Skeleton
+
+Pickling the object graph of a Skeleton as is, recurses through the
+vertices, their neighbour histories, wavefronts and (if still present) the
+triangles and their events. This is slow and can exceed the recursion limit
+for large inputs. Skeleton.__reduce__ uses the functions in this module
+instead: the skeleton is written as a dict of flat arrays (array.array, that
+pickles as raw bytes) in which the references between the objects are
+indices:
+
+    nodes -- position, step, time and info of the skeleton nodes
+    vertices -- kinematics (origin, velocity, start / stop time and node),
+                flags, wavefront lines and left / right histories
+    wavefronts -- start, end and line of the wavefronts of the vertices
+    triangles -- (optional) vertices, neighbours and state of the kinetic
+                 triangles, without their events (only present when calc_skel
+                 was asked to keep them, keep_triangles=True)
+    snapshots -- (optional) the wavefront snapshots (see grassfire.snapshots),
+                 their arrays concatenated, with the number of rows of each
+
+None is stored as NaN (floats) or -1 (indices).
+"""
+
+import math
+from array import array
+
+from grassfire.line2d import Line2, WaveFront
+from grassfire.primitives import (InfiniteVertex, KineticTriangle,
+                                  KineticVertex, Skeleton, SkeletonNode,
+                                  _weak)
+from grassfire.transform import Transform
+
+NAN = float("nan")
+# index of the infinite vertex, in the vertex references of the triangles
+INFINITE = -2
+
+
+def _float(value):
+    return NAN if value is None else value
+
+
+def _optional(value):
+    return None if math.isnan(value) else value
+
+
+def _pair(values, i):
+    x = values[2 * i]
+    return None if math.isnan(x) else (x, values[2 * i + 1])
+
+
+def _line(values, i):
+    w0 = values[3 * i]
+    if math.isnan(w0):
+        return None
+    return Line2((w0, values[3 * i + 1]), values[3 * i + 2], normalize=False)
+
+
+def _extend_line(values, line):
+    if line is None:
+        values.extend((NAN, NAN, NAN))
+    else:
+        values.extend((line.w[0], line.w[1], line.b))
+
+
+def skeleton_state(skel, triangles=True):
+    """Returns the flat representation of skel (a dict, see module doc)
+
+    With triangles=False the kinetic triangles (if any are left) are not
+    written.
+    """
+    node_index = {id(n): i for i, n in enumerate(skel.sk_nodes)}
+    vertex_index = {id(v): i for i, v in enumerate(skel.vertices)}
+    wavefront_index = {}
+    wavefronts = []
+
+    def index_of(obj, index):
+        return -1 if obj is None else index[id(obj)]
+
+    def wavefront_of(wf):
+        if wf is None:
+            return -1
+        i = wavefront_index.get(id(wf))
+        if i is None:
+            i = wavefront_index[id(wf)] = len(wavefronts)
+            wavefronts.append(wf)
+        return i
+
+    node_pos = array("d")
+    node_step = array("q")
+    node_time = array("d")
+    for n in skel.sk_nodes:
+        node_pos.extend(n.pos)
+        node_step.append(n.step)
+        node_time.append(_float(n.time))
+
+    kinematics = array("d")  # origin x, y, velocity x, y, starts_at, stops_at
+    vertex_nodes = array("q")  # start node, stop node
+    flags = array("b")  # inf_fast, internal
+    lines = array("d")  # ul, ur: w[0], w[1], b
+    vertex_wavefronts = array("q")  # wfl, wfr
+    # left and right histories of all vertices, concatenated
+    history_lengths = array("q")
+    history_times = array("d")
+    history_refs = array("q")
+    for v in skel.vertices:
+        origin = v.origin if v.origin is not None else (NAN, NAN)
+        velocity = v.velocity if v.velocity is not None else (NAN, NAN)
+        kinematics.extend((origin[0], origin[1], velocity[0], velocity[1],
+                           _float(v.starts_at), _float(v.stops_at)))
+        vertex_nodes.extend((index_of(v.start_node, node_index),
+                             index_of(v.stop_node, node_index)))
+        flags.extend((bool(v.inf_fast), bool(v.internal)))
+        _extend_line(lines, v.ul)
+        _extend_line(lines, v.ur)
+        vertex_wavefronts.extend((wavefront_of(v.wfl), wavefront_of(v.wfr)))
+        for history in (v._left, v._right):
+            history_lengths.append(len(history))
+            for start, stop, ref in history:
+                history_times.extend((_float(start), _float(stop)))
+                other = None if ref is None else ref()
+                history_refs.append(-1 if other is None else vertex_index.get(id(other), -1))
+
+    wf_coords = array("d")
+    for wf in wavefronts:
+        wf_coords.extend(wf.start + wf.end + (wf.line.w[0], wf.line.w[1], wf.line.b))
+
+    state = {
+        "node_pos": node_pos,
+        "node_step": node_step,
+        "node_time": node_time,
+        "node_info": [n.info for n in skel.sk_nodes],
+        "kinematics": kinematics,
+        "vertex_nodes": vertex_nodes,
+        "flags": flags,
+        "lines": lines,
+        "vertex_wavefronts": vertex_wavefronts,
+        "vertex_info": [v.info for v in skel.vertices],
+        "turn": [v.turn for v in skel.vertices],
+        "history_lengths": history_lengths,
+        "history_times": history_times,
+        "history_refs": history_refs,
+        "wavefronts": wf_coords,
+        "transform": None if skel.transform is None else
+        (tuple(skel.transform.scale), tuple(skel.transform.translate)),
+        "timings": dict(skel.timings),
+        "event_counts": dict(skel.event_counts),
+    }
+    if triangles and skel.triangles:
+        state.update(_triangles_state(skel.triangles, vertex_index))
+    if skel.snapshots:
+        state.update(_snapshots_state(skel.snapshots))
+    return state
+
+
+def _triangles_state(triangles, vertex_index):
+    triangle_index = {id(t): i for i, t in enumerate(triangles)}
+    infinite = None
+    refs = array("q")  # 3 vertices, 3 neighbours per triangle
+    stops_at = array("d")
+    internal = array("b")
+    for t in triangles:
+        for v in t.vertices:
+            if isinstance(v, InfiniteVertex):
+                infinite = v
+                refs.append(INFINITE)
+            else:
+                refs.append(-1 if v is None else vertex_index[id(v)])
+        for n in t.neighbours:
+            refs.append(-1 if n is None else triangle_index.get(id(n), -1))
+        stops_at.append(_float(t.stops_at))
+        internal.append(bool(t.internal))
+    return {
+        "triangle_refs": refs,
+        "triangle_stops_at": stops_at,
+        "triangle_internal": internal,
+        "triangle_info": [t.info for t in triangles],
+        "triangle_wavefront_directions": [t.wavefront_directions for t in triangles],
+        "infinite_origin": None if infinite is None else infinite.origin,
+    }
+
+
+def _snapshots_state(snapshots):
+    times = array("d")
+    lengths = array("q")
+    vertices = array("q")
+    positions = array("d")
+    left = array("q")
+    right = array("q")
+    for s in snapshots:
+        times.append(s.time)
+        lengths.append(len(s.vertices))
+        vertices.extend(s.vertices.tolist())
+        positions.extend(s.positions.ravel().tolist())
+        left.extend(s.left.tolist())
+        right.extend(s.right.tolist())
+    return {
+        "snapshot_times": times,
+        "snapshot_lengths": lengths,
+        "snapshot_vertices": vertices,
+        "snapshot_positions": positions,
+        "snapshot_left": left,
+        "snapshot_right": right,
+    }
+
+
+def skeleton_from_state(state):
+    """Returns the Skeleton written by skeleton_state"""
+    skel = Skeleton()
+    node_pos = state["node_pos"]
+    nodes = skel.sk_nodes
+    node_time = state.get("node_time") or [NAN] * len(state["node_step"])
+    for i, (step, info) in enumerate(zip(state["node_step"], state["node_info"])):
+        nodes.append(SkeletonNode((node_pos[2 * i], node_pos[2 * i + 1]), step, info,
+                                  _optional(node_time[i])))
+
+    wf = state["wavefronts"]
+    wavefronts = []
+    for i in range(len(wf) // 7):
+        s = wf[7 * i:7 * i + 7]
+        wavefronts.append(WaveFront(s[0:2], s[2:4],
+                                    Line2((s[4], s[5]), s[6], normalize=False)))
+
+    kin = state["kinematics"]
+    vnodes = state["vertex_nodes"]
+    flags = state["flags"]
+    lines = state["lines"]
+    vwf = state["vertex_wavefronts"]
+    vertices = skel.vertices
+    for i, (info, turn) in enumerate(zip(state["vertex_info"], state["turn"])):
+        v = KineticVertex(_pair(kin, 3 * i), _pair(kin, 3 * i + 1),
+                          _line(lines, 2 * i), _line(lines, 2 * i + 1))
+        v.starts_at = _optional(kin[6 * i + 4])
+        v.stops_at = _optional(kin[6 * i + 5])
+        start, stop = vnodes[2 * i], vnodes[2 * i + 1]
+        v.start_node = None if start == -1 else nodes[start]
+        v.stop_node = None if stop == -1 else nodes[stop]
+        v.inf_fast = bool(flags[2 * i])
+        v.internal = bool(flags[2 * i + 1])
+        left, right = vwf[2 * i], vwf[2 * i + 1]
+        v.wfl = None if left == -1 else wavefronts[left]
+        v.wfr = None if right == -1 else wavefronts[right]
+        v.info = info
+        v.turn = turn
+        vertices.append(v)
+
+    lengths = state["history_lengths"]
+    times = state["history_times"]
+    refs = state["history_refs"]
+    k = 0
+    for i, v in enumerate(vertices):
+        for which in (0, 1):
+            history = v._left if which == 0 else v._right
+            for _ in range(lengths[2 * i + which]):
+                ref = refs[k]
+                history.append((_optional(times[2 * k]), _optional(times[2 * k + 1]),
+                                None if ref == -1 else _weak(vertices[ref])))
+                k += 1
+
+    if state["transform"] is not None:
+        skel.transform = Transform(*state["transform"])
+    skel.timings = dict(state["timings"])
+    skel.event_counts = dict(state["event_counts"])
+    if "triangle_refs" in state:
+        skel.triangles = _triangles_from_state(state, vertices)
+    if "snapshot_times" in state:
+        skel.snapshots = _snapshots_from_state(state)
+    return skel
+
+
+def _triangles_from_state(state, vertices):
+    infinite = None
+    if state["infinite_origin"] is not None:
+        infinite = InfiniteVertex(state["infinite_origin"])
+    refs = state["triangle_refs"]
+    triangles = [KineticTriangle() for _ in state["triangle_info"]]
+    for i, t in enumerate(triangles):
+        r = refs[6 * i:6 * i + 6]
+        t.vertices = [infinite if j == INFINITE else None if j == -1 else vertices[j]
+                      for j in r[:3]]
+        t.neighbours = [None if j == -1 else triangles[j] for j in r[3:]]
+        t.stops_at = _optional(state["triangle_stops_at"][i])
+        t.internal = bool(state["triangle_internal"][i])
+        t.info = state["triangle_info"][i]
+        t.wavefront_directions = list(state["triangle_wavefront_directions"][i])
+    return triangles
+
+
+def _snapshots_from_state(state):
+    import numpy as np
+
+    from grassfire.snapshots import Snapshot
+
+    vertices = np.array(state["snapshot_vertices"], dtype=np.int64)
+    positions = np.array(state["snapshot_positions"], dtype=np.float64).reshape(-1, 2)
+    left = np.array(state["snapshot_left"], dtype=np.int64)
+    right = np.array(state["snapshot_right"], dtype=np.int64)
+    snapshots = []
+    k = 0
+    for time, length in zip(state["snapshot_times"], state["snapshot_lengths"]):
+        rows = slice(k, k + length)
+        snapshots.append(Snapshot(time, vertices[rows].copy(), positions[rows].copy(),
+                                  left[rows].copy(), right[rows].copy()))
+        k += length
+    return snapshots
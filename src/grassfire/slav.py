@@ -0,0 +1,515 @@
+"""Straight skeleton of a polygon (with holes), without kinetic triangulation
+
+The wavefront is kept as a set of circular lists of active kinetic vertices
+(SLAV), one list per wavefront component.  Two kinds of event change it:
+
+- edge event: the wavefront edge between two neighbouring vertices collapses
+- split event: a reflex vertex hits a wavefront edge that is not its own,
+  this splits the edge (and the list of vertices) in two
+
+No flip events are needed, but every reflex vertex has to be tested against
+the wavefronts.  For every reflex vertex the time at which it reaches each
+supporting line is computed once, by a scan over all wavefronts, and kept
+sorted (the split candidates of the vertex); only the earliest candidate is
+queued and when it turns out to be invalid, the next one is.  A candidate is
+valid when, at its time, the hit point lies on one of the pieces of the
+wavefront that are still active (found by a scan over the pieces of that
+wavefront, which are kept per wavefront by the vertex at their start).  The
+vertices that take part in a split event are found by a scan over all active
+vertices.  There is no spatial index: finding the candidates takes O(n) per
+reflex vertex and every split event O(n), so the engine pays off for inputs
+with few reflex vertices only (see prefer_slav).
+
+When parallel wavefronts collapse onto each other, the part of the wavefront
+they are in must collapse completely (into ridge segments on one line);
+otherwise UnsupportedConfiguration is raised (calc_skel then falls back to
+the triangulation based engine).
+"""
+
+import heapq
+import logging
+import math
+
+from grassfire.calc import near_zero
+from grassfire.events.lib import compute_new_kvertex, update_circ
+from grassfire.rings import (
+    edge_collapse_time,
+    init_ring_skeleton,
+    orient_rings,
+    ridge_kvertex,
+    rings_from_segments,
+    same_location,
+    stop_vertices,
+    turn_type,
+)
+
+# calc_skel(engine="fastest") uses this engine (if possible) for inputs with
+# at most this many reflex vertices ...
+SLAV_MAX_REFLEX = 160
+# ... and at least this many vertices per reflex vertex (see prefer_slav).
+# Both limits come from benchmark_engines: above them the triangulation
+# engine was faster, from 100 up to 3200 vertices.
+SLAV_MIN_VERTICES_PER_REFLEX = 3
+
+EDGE, SPLIT = 0, 1
+
+
+class UnsupportedConfiguration(NotImplementedError):
+    """The wavefront reached a configuration this engine does not handle"""
+
+
+def oriented_rings(points, segments):
+    """Returns the rings of point indices, oriented with the interior at the
+    left, if the segments form closed rings only (None otherwise)"""
+    rings = rings_from_segments(points, segments)
+    if rings is None:
+        return None
+    return orient_rings(points, rings)
+
+
+def reflex_count(points, rings):
+    """Number of reflex vertices of the oriented rings"""
+    count = 0
+    for ring in rings:
+        size = len(ring)
+        for i in range(size):
+            (ax, ay) = points[ring[i - 1]]
+            (bx, by) = points[ring[i]]
+            (cx, cy) = points[ring[(i + 1) % size]]
+            if (bx - ax) * (cy - by) - (by - ay) * (cx - bx) < 0:
+                count += 1
+    return count
+
+
+def prefer_slav(vertices, reflex):
+    """Whether this engine is expected to be faster than the triangulation
+    based one, for an input with this many vertices and reflex vertices
+
+    The triangulation engine has a high cost per vertex (triangulation,
+    flip events). This engine tests every reflex vertex against every
+    wavefront for its split candidates, and every split event (at most one
+    per reflex vertex) scans all active vertices for the ones at the hit
+    point: both take about vertices * reflex vertex tests. Measured with
+    benchmark_engines, this engine is faster as long as the number of
+    reflex vertices stays below about 160 and below a third of the number
+    of vertices, at every number of vertices tried.
+    """
+    return (reflex <= SLAV_MAX_REFLEX and
+            reflex * SLAV_MIN_VERTICES_PER_REFLEX <= vertices)
+
+
+def split_time(v, wavefront):
+    """Time at which kinetic vertex v reaches the supporting line of the
+    wavefront (coming from the front side), None if it never does"""
+    if v.inf_fast:
+        return None
+    (a, b), c = wavefront.line.w, wavefront.line.b
+    # signed distance to the line at time t: dist + rate * t
+    dist = a * v.origin[0] + b * v.origin[1] + c
+    rate = a * v.velocity[0] + b * v.velocity[1] - 1.0
+    if rate >= 0 or near_zero(rate):
+        return None
+    return -dist / rate
+
+
+def is_reflex(v):
+    return v.turn == "RIGHT - REFLEX"
+
+
+class SlavEventLoop(object):
+    """Propagates the wavefront of a skeleton made by init_ring_skeleton"""
+
+    def __init__(self, skel, capture=None):
+        self.skel = skel
+        self.capture = capture
+        self.wavefronts = []
+        # wavefront -> active vertices at the start of a piece of it (a dict
+        # is used as ordered set, so that the outcome does not depend on ids)
+        self.pieces = {}
+        # active vertices (ordered set)
+        self.active = dict.fromkeys(skel.vertices)
+        for v in skel.vertices:
+            if v.wfr not in self.pieces:
+                self.pieces[v.wfr] = {}
+                self.wavefronts.append(v.wfr)
+            self.pieces[v.wfr][v] = None
+        # reflex vertex -> [sorted split candidates, index of queued one]
+        self.candidates = {}
+        self.queue = []
+        self.counter = 0
+        self.now = 0.0
+        self.step = 0
+        self.made_now = []
+        self.inf_fast = []
+        self.counts = {"edge": 0, "flip": 0, "split": 0}
+
+    def push(self, time, kind, data):
+        self.counter += 1
+        heapq.heappush(self.queue, (time, self.counter, kind, data))
+
+    def schedule_edge(self, v1, v2):
+        time = edge_collapse_time(v1, v2, self.now)
+        if time is not None:
+            self.push(time, EDGE, (v1, v2))
+
+    def schedule_splits(self, v):
+        """Computes the split candidates of the reflex vertex v, by testing
+        it against every wavefront (O(n))"""
+        candidates = []
+        for wavefront in self.wavefronts:
+            if wavefront is v.wfl or wavefront is v.wfr:
+                continue
+            time = split_time(v, wavefront)
+            if time is not None and (time >= self.now or near_zero(time - self.now)):
+                candidates.append((max(time, self.now), wavefront))
+        if candidates:
+            candidates.sort(key=lambda item: item[0])
+            self.candidates[v] = [candidates, 0]
+            self.push(candidates[0][0], SPLIT, v)
+
+    def next_split(self, v):
+        """Queues the next split candidate of v"""
+        entry = self.candidates[v]
+        entry[1] += 1
+        if entry[1] < len(entry[0]):
+            self.push(entry[0][entry[1]][0], SPLIT, v)
+
+    def activate(self, v):
+        """Adds the new vertex v to the pieces of its wavefront"""
+        self.pieces[v.wfr][v] = None
+        self.active[v] = None
+        v.turn = turn_type(v.wfl, v.wfr)
+        if v.inf_fast:
+            self.inf_fast.append(v)
+
+    def deactivate(self, V):
+        for v in V:
+            self.pieces[v.wfr].pop(v, None)
+            self.active.pop(v, None)
+            self.candidates.pop(v, None)
+
+    def stop(self, V, pos=None):
+        self.deactivate(V)
+        return stop_vertices(V, self.step, self.now, self.skel, self.made_now, pos)
+
+    def new_vertex(self, wfl, wfr, sk_node):
+        kv = compute_new_kvertex(
+            wfl.line,
+            wfr.line,
+            self.now,
+            sk_node,
+            len(self.skel.vertices) + 1,
+            True,
+            pair=self.skel.wavefront_pairs[wfl, wfr],
+        )
+        kv.wfl = wfl
+        kv.wfr = wfr
+        self.skel.vertices.append(kv)
+        return kv
+
+    def find_piece(self, wavefront, pos):
+        """Returns the vertex at the start of the active piece of the
+        wavefront that contains pos (at time now), None if no piece does
+
+        Pieces that contain pos in their interior are preferred over pieces
+        that only have an end point at pos.
+        """
+        a, b = wavefront.line.w
+        dx, dy = b, -a
+        at_end = None
+        for u in self.pieces[wavefront]:
+            start = u.position_at(self.now)
+            end = u.right.position_at(self.now)
+            length = dx * (end[0] - start[0]) + dy * (end[1] - start[1])
+            along = dx * (pos[0] - start[0]) + dy * (pos[1] - start[1])
+            if near_zero(along) or near_zero(along - length):
+                at_end = at_end or u
+            elif 0 < along < length:
+                return u
+        return at_end
+
+    def handle_edge(self, v1, v2):
+        v0, v3 = v1.left, v2.right
+        if v3 is v0 and same_location(v1.position_at(self.now), v3.position_at(self.now)):
+            # the last triangle of this part collapses to a point
+            self.stop([v1, v2, v3])
+            return
+        sk_node = self.stop([v1, v2])
+        kv = self.new_vertex(v1.wfl, v2.wfr, sk_node)
+        update_circ(v0, kv, self.now)
+        update_circ(kv, v3, self.now)
+        self.activate(kv)
+        self.link(kv)
+
+    def handle_split(self, v, wavefront):
+        """Split event: v hits a piece of the wavefront
+
+        All vertices at the location of the hit take part in the event, so
+        that vertex events (a reflex vertex that hits another vertex) are
+        handled as well; these are found by a scan over the active vertices.
+
+        Returns:
+            whether the event is valid
+        """
+        pos = v.position_at(self.now)
+        u = self.find_piece(wavefront, pos)
+        if u is None:
+            return False
+        V = [x for x in self.active if same_location(x.position_at(self.now), pos)]
+        split = None
+        if not (same_location(u.position_at(self.now), pos) or
+                same_location(u.right.position_at(self.now), pos)):
+            split = (wavefront, u)
+        self.step += 1
+        sk_node = self.stop(V, pos)
+        self.reconnect(V, sk_node, split)
+        return True
+
+    def reconnect(self, V, sk_node, split=None):
+        """Replaces the vertices V, that all are at sk_node, by new vertices
+        that connect the wavefront edges leaving the node
+
+        The edges are sorted around the node; going counterclockwise, every
+        outgoing edge (wavefront right of a vertex) is followed by the
+        incoming edge (wavefront left of a vertex) that it forms a new vertex
+        with.  With split, a (wavefront, vertex at start of piece) tuple, the
+        piece is split at the node.
+        """
+        at_node = set(V)
+        edges = []
+        for x in V:
+            if x.left not in at_node:
+                edges.append((x.wfl, x.left, False))
+            if x.right not in at_node:
+                edges.append((x.wfr, x.right, True))
+        if split is not None:
+            wavefront, u = split
+            edges.append((wavefront, u, False))
+            edges.append((wavefront, u.right, True))
+        if not edges:
+            return
+
+        def angle(edge):
+            wavefront, _, outgoing = edge
+            a, b = wavefront.line.w
+            # direction from the node along the edge
+            if outgoing:
+                alpha = math.atan2(-a, b)
+            else:
+                alpha = math.atan2(a, -b)
+            if near_zero(alpha - math.pi):
+                alpha = -math.pi
+            return alpha
+
+        # edges in the same direction bound a sector of zero width, that is
+        # interior (coinciding wavefronts): outgoing first
+        angles = [angle(edge) for edge in edges]
+        order = sorted(range(len(edges)), key=lambda i: angles[i])
+        clusters = [[order[0]]]
+        for i in order[1:]:
+            if near_zero(angles[i] - angles[clusters[-1][0]]):
+                clusters[-1].append(i)
+            else:
+                clusters.append([i])
+        edges = [
+            edges[i]
+            for cluster in clusters
+            for i in sorted(cluster, key=lambda i: not edges[i][2])
+        ]
+        first = next(
+            (i for i, edge in enumerate(edges) if edge[2]), None
+        )
+        if first is None:
+            raise UnsupportedConfiguration("no outgoing wavefront at vertex event")
+        edges = edges[first:] + edges[:first]
+        if len(edges) % 2 or any(
+            edge[2] != (i % 2 == 0) for i, edge in enumerate(edges)
+        ):
+            raise UnsupportedConfiguration(
+                "wavefronts around vertex event do not alternate"
+            )
+        new = []
+        for i in range(0, len(edges), 2):
+            wfr, head, _ = edges[i]
+            wfl, tail, _ = edges[i + 1]
+            if wfl is wfr:
+                # nothing in between: the wavefront continues
+                update_circ(tail, head, self.now)
+                continue
+            kv = self.new_vertex(wfl, wfr, sk_node)
+            update_circ(tail, kv, self.now)
+            update_circ(kv, head, self.now)
+            new.append(kv)
+        for kv in new:
+            self.activate(kv)
+        for kv in new:
+            self.link(kv)
+
+    def link(self, kv):
+        """Schedules the events of the new vertex kv, or finishes its part
+        of the wavefront when only two vertices are left in it"""
+        if kv.stops_at is not None:
+            return
+        if kv.right.right is kv:
+            self.finish_pair(kv, kv.right)
+            return
+        self.schedule_edge(kv.left, kv)
+        self.schedule_edge(kv, kv.right)
+        if is_reflex(kv):
+            self.schedule_splits(kv)
+
+    def finish_pair(self, a, b):
+        """Two vertices with coinciding wavefronts in between remain: the
+        segment between them is part of the skeleton"""
+        if same_location(a.position_at(self.now), b.position_at(self.now)):
+            self.stop([a, b])
+            return
+        if not near_zero(a.starts_at - self.now):
+            a, b = b, a
+        if not near_zero(a.starts_at - self.now):
+            raise UnsupportedConfiguration(
+                "two vertices with parallel wavefronts remain, none started now"
+            )
+        # a started now, it continues until where b is
+        sk_node = self.stop([b])
+        self.deactivate([a])
+        a.stop_node = sk_node
+        a.stops_at = self.now
+        self.skel.stopped([a])
+
+    def collapse_part(self, v):
+        """Collapses the part of the wavefront that v is in, if all its
+        vertices are on one line (its wavefronts coincide at time now): the
+        part then becomes ridge segments on that line
+
+        Returns:
+            whether the part was collapsed
+        """
+        part = [v]
+        x = v.right
+        while x is not v:
+            part.append(x)
+            x = x.right
+        positions = [x.position_at(self.now) for x in part]
+        x0, y0 = positions[0]
+        far = max(positions, key=lambda p: math.hypot(p[0] - x0, p[1] - y0))
+        if same_location(positions[0], far):
+            self.stop(part)
+            return True
+        length = math.hypot(far[0] - x0, far[1] - y0)
+        dx, dy = (far[0] - x0) / length, (far[1] - y0) / length
+        along = []
+        for x, y in positions:
+            if not near_zero(dx * (y - y0) - dy * (x - x0)):
+                return False
+            along.append(dx * (x - x0) + dy * (y - y0))
+        # stop the vertices at a node per location along the line
+        order = sorted(range(len(part)), key=lambda i: along[i])
+        groups = [[order[0]]]
+        for i in order[1:]:
+            if near_zero(along[i] - along[groups[-1][0]]):
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        self.step += 1
+        nodes = [
+            self.stop([part[i] for i in group], positions[group[0]])
+            for group in groups
+        ]
+        # edges of the part that run forward / backward along the line
+        forward = backward = None
+        for i, x in enumerate(part):
+            j = (i + 1) % len(part)
+            if not near_zero(along[j] - along[i]):
+                if along[j] > along[i]:
+                    forward = forward or x.right
+                else:
+                    backward = backward or x
+        for start, end in zip(nodes, nodes[1:]):
+            kv = ridge_kvertex(self.skel, forward, backward, self.now, start)
+            kv.stop_node = end
+            kv.stops_at = self.now
+            self.skel.stopped([kv])
+        return True
+
+    def check_inf_fast(self):
+        """Infinitely fast vertices must be gone after all events at their
+        time are processed, unless their part of the wavefront collapsed"""
+        for v in self.inf_fast:
+            if v.stops_at is None and not self.collapse_part(v):
+                raise UnsupportedConfiguration(
+                    "parallel wavefronts collapse in the middle of the wavefront"
+                )
+        self.inf_fast = []
+
+    def run(self):
+        for v in self.skel.vertices:
+            self.schedule_edge(v, v.right)
+            if is_reflex(v):
+                self.schedule_splits(v)
+        while self.queue:
+            time, _, kind, data = heapq.heappop(self.queue)
+            if kind == EDGE:
+                v1, v2 = data
+                if v1.stops_at is not None or v2.stops_at is not None or v1.right is not v2:
+                    continue
+            else:
+                v1 = data
+                if v1.stops_at is not None or v1 not in self.candidates:
+                    continue
+            if not near_zero(time - self.now):
+                self.check_inf_fast()
+                if self.capture is not None:
+                    self.capture.advance(self.skel, time)
+                self.made_now = []
+                self.now = max(time, self.now)
+            if kind == EDGE:
+                self.step += 1
+                self.handle_edge(v1, v2)
+                self.counts["edge"] += 1
+            else:
+                candidates, idx = self.candidates[v1]
+                if self.handle_split(v1, candidates[idx][1]):
+                    self.counts["split"] += 1
+                else:
+                    self.next_split(v1)
+        self.check_inf_fast()
+        left = sum(1 for v in self.skel.vertices if v.stops_at is None)
+        if left:
+            raise UnsupportedConfiguration(
+                "wavefront did not collapse, {} vertices left".format(left)
+            )
+        if self.capture is not None:
+            self.capture.finish(self.skel)
+        self.skel.event_counts = self.counts
+        logging.debug("slav skeleton: {}".format(self.counts))
+        return self.now
+
+
+def init_slav_skeleton(points, rings, infos=None):
+    """Makes the skeleton nodes and kinetic vertices for the oriented rings"""
+    return init_ring_skeleton(points, rings, infos)
+
+
+def slav_event_loop(skel, capture=None):
+    """Processes the edge and split events of the wavefront in time order
+
+    capture -- WavefrontCapture to record the wavefront with (see
+               grassfire.snapshots)
+
+    Returns:
+        time of the last event
+    """
+    return SlavEventLoop(skel, capture).run()
+
+
+def slav_skeleton(points, rings, infos=None):
+    """Computes the straight skeleton inside the polygon(s) given by the
+    oriented rings of point indices
+
+    Returns:
+        skel -- skeleton structure
+    """
+    skel = init_slav_skeleton(points, rings, infos)
+    slav_event_loop(skel)
+    return skel
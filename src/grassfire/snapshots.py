@@ -0,0 +1,106 @@
+"""Snapshots of the wavefront, taken while the event loop runs
+
+A WavefrontCapture is given to the event loop of an engine (see calc_skel,
+capture_times keyword). Whenever the loop is about to handle an event that
+happens after the next capture time, the wavefront at that time is recorded:
+all events before it are handled, none after it, so the wavefront consists
+of the vertices that did not stop yet, linked by their current left / right
+neighbours. Offsetting at many distances then costs one sweep of the events.
+
+A Snapshot holds the wavefront as arrays:
+
+    time -- the capture time (distance, in the units of the input)
+    vertices -- (k,) int64 array, indices into skel.vertices
+    positions -- (k, 2) float64 array, positions in the input coordinates
+    left, right -- (k,) int64 arrays, row of the left / right neighbour in
+                   this snapshot (-1 if there is none)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+INF = float("inf")
+
+
+class Snapshot(namedtuple("Snapshot", ["time", "vertices", "positions", "left", "right"])):
+    """The wavefront at one capture time (see module doc)"""
+
+    __slots__ = ()
+
+    def rings(self):
+        """Returns the closed rings of the wavefront, each as (n + 1, 2)
+        array of coordinates (last equals first), following the left
+        neighbours; parts with less than 3 vertices are left out"""
+        left = self.left.tolist()
+        done = [False] * len(left)
+        rings = []
+        for start in range(len(left)):
+            if done[start]:
+                continue
+            ring = [start]
+            done[start] = True
+            i = left[start]
+            while i != -1 and i != start and not done[i]:
+                ring.append(i)
+                done[i] = True
+                i = left[i]
+            if i == start and len(ring) >= 3:
+                ring.append(start)
+                rings.append(self.positions[ring])
+        return rings
+
+
+class WavefrontCapture(object):
+    """Records Snapshots of the wavefront at the given times
+
+    times -- sorted times (distances, in the units of the input)
+    transform -- the transform of the skeleton (None if not shrunk)
+    """
+
+    def __init__(self, times, transform=None):
+        times = list(times)
+        if any(a > b for a, b in zip(times, times[1:])):
+            raise ValueError("capture times should be sorted")
+        self.times = times
+        self.transform = transform
+        self.scale = transform.scale[0] if transform is not None else 1.0
+        self.snapshots = []
+        # vertices that were not stopped at the last capture, and the number
+        # of vertices of the skeleton then (later vertices are new)
+        self._alive = []
+        self._seen = 0
+
+    def advance(self, skel, now):
+        """Records the snapshots of the capture times before now (the time
+        of the next event, in the time of the skeleton)"""
+        times = self.times
+        while len(self.snapshots) < len(times) and \
+                times[len(self.snapshots)] / self.scale < now:
+            self._capture(skel, times[len(self.snapshots)])
+
+    def finish(self, skel):
+        """Records the snapshots of the remaining capture times, after the
+        last event"""
+        self.advance(skel, INF)
+
+    def _capture(self, skel, time):
+        t = time / self.scale
+        vertices = skel.vertices
+        alive = [i for i in self._alive if vertices[i].stops_at is None]
+        alive.extend(i for i in range(self._seen, len(vertices))
+                     if vertices[i].stops_at is None)
+        self._alive = alive
+        self._seen = len(vertices)
+        row = {id(vertices[i]): k for k, i in enumerate(alive)}
+        positions = np.array([vertices[i].position_at(t) for i in alive],
+                             dtype=np.float64).reshape(-1, 2)
+        if self.transform is not None:
+            positions = self.transform.backward_array(positions)
+        left = np.array([row.get(id(vertices[i].left), -1) for i in alive],
+                        dtype=np.int64)
+        right = np.array([row.get(id(vertices[i].right), -1) for i in alive],
+                         dtype=np.int64)
+        self.snapshots.append(
+            Snapshot(time, np.array(alive, dtype=np.int64), positions, left, right)
+        )
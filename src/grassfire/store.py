@@ -0,0 +1,183 @@
+"""Binary container for the skeletons of many polygons
+
+SkeletonWriter streams skeletons to one file, keyed by an integer id (e.g.
+of the polygon), SkeletonStore maps that file into memory and gives the
+arrays of one skeleton as read-only views on the map: no copies are made and
+nothing is parsed when a skeleton is read.
+
+Every skeleton is stored as the arrays of a CompactSkeleton (see
+grassfire.compact), one after the other, all little endian and 8 byte wide:
+
+    positions -- (n, 2) float64, node coordinates
+    times -- (n,) float64, time at which the wavefront reached the node
+    infos -- (n,) int64, info of the node (NO_INFO if it has none)
+    segments -- (m, 2) int64, start and end node of the segments
+    rays -- (k,) int64, start node of the vertices that never stop
+    ray_directions -- (k, 2) float64, velocity of those vertices
+
+The file starts with MAGIC, and ends with the index (one INDEX_DTYPE record
+per skeleton, sorted on key) followed by the offset of the index, the number
+of records in it and MAGIC again. Node infos can only be stored when they
+are integers (or None).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from grassfire.compact import CompactSkeleton, compact_skeleton
+
+MAGIC = b"GFSKEL01"
+NO_INFO = np.iinfo(np.int64).min
+INDEX_DTYPE = np.dtype([
+    ("key", "<i8"),
+    ("offset", "<i8"),
+    ("nodes", "<i8"),
+    ("segments", "<i8"),
+    ("rays", "<i8"),
+])
+FOOTER_DTYPE = np.dtype([("index", "<i8"), ("count", "<i8")])
+
+
+class StoredSkeleton(namedtuple("StoredSkeleton", ["positions", "times", "infos",
+                                                   "segments", "rays",
+                                                   "ray_directions"])):
+    """The arrays of one skeleton in a SkeletonStore (views on the map)"""
+
+    __slots__ = ()
+
+    def compact(self):
+        """Copies the arrays into a CompactSkeleton"""
+        infos = [None if info == NO_INFO else info for info in self.infos.tolist()]
+        return CompactSkeleton(self.positions, self.times, infos, self.segments,
+                               self.rays, self.ray_directions)
+
+
+class SkeletonWriter(object):
+    """Writes skeletons to a new container file, one at a time
+
+    Use as context manager, or call close when done: the index is written
+    then.
+    """
+
+    def __init__(self, path):
+        self._fh = open(path, "wb")
+        self._fh.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._records = []
+        self._keys = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, key, skel):
+        """Appends the skeleton (a Skeleton or CompactSkeleton) under key"""
+        key = int(key)
+        if key in self._keys:
+            raise ValueError("key {} was added already".format(key))
+        if not isinstance(skel, CompactSkeleton):
+            skel = compact_skeleton(skel)
+        infos = []
+        for info in skel.infos:
+            if info is None:
+                infos.append(NO_INFO)
+            elif isinstance(info, (int, np.integer)) and info != NO_INFO:
+                infos.append(int(info))
+            else:
+                raise TypeError("node info {!r} can not be stored, only integers"
+                                " and None can".format(info))
+        columns = [
+            (skel.positions, "<f8"),
+            (skel.times, "<f8"),
+            (infos, "<i8"),
+            (skel.segments, "<i8"),
+            (skel.rays, "<i8"),
+            (skel.ray_directions, "<f8"),
+        ]
+        data = b"".join(np.ascontiguousarray(values, dtype=dtype).tobytes()
+                        for values, dtype in columns)
+        self._fh.write(data)
+        offset = self._offset
+        self._offset += len(data)
+        self._keys.add(key)
+        self._records.append((key, offset, len(skel.positions),
+                              len(skel.segments), len(skel.rays)))
+
+    def close(self):
+        """Writes the index and footer and closes the file"""
+        if self._fh.closed:
+            return
+        index = np.array(self._records, dtype=INDEX_DTYPE)
+        index.sort(order="key")
+        footer = np.array([(self._offset, len(index))], dtype=FOOTER_DTYPE)
+        self._fh.write(index.tobytes())
+        self._fh.write(footer.tobytes())
+        self._fh.write(MAGIC)
+        self._fh.close()
+
+
+class SkeletonStore(object):
+    """Read-only, memory-mapped access to a file made by SkeletonWriter"""
+
+    def __init__(self, path):
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        tail = len(MAGIC) + FOOTER_DTYPE.itemsize
+        if len(self._map) < len(MAGIC) + tail or \
+                self._map[:len(MAGIC)].tobytes() != MAGIC or \
+                self._map[-len(MAGIC):].tobytes() != MAGIC:
+            raise ValueError("{} is not a skeleton container".format(path))
+        footer = self._map[-tail:-len(MAGIC)].view(FOOTER_DTYPE)[0]
+        start = int(footer["index"])
+        stop = start + int(footer["count"]) * INDEX_DTYPE.itemsize
+        self.index = self._map[start:stop].view(INDEX_DTYPE)
+        # all columns are 8 bytes wide, so the data is a run of 8 byte words
+        self._floats = self._map[:start].view("<f8")
+        self._ints = self._map[:start].view("<i8")
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        row = self._find(key)
+        if row is None:
+            raise KeyError(key)
+        return self._read(self.index[row])
+
+    def keys(self):
+        """The keys of the skeletons, sorted (int64 array)"""
+        return self.index["key"]
+
+    def items(self):
+        """Iterates over (key, StoredSkeleton) pairs, in key order"""
+        for record in self.index:
+            yield int(record["key"]), self._read(record)
+
+    def _find(self, key):
+        keys = self.index["key"]
+        row = int(np.searchsorted(keys, key))
+        if row < len(keys) and keys[row] == key:
+            return row
+        return None
+
+    def _read(self, record):
+        n, m, k = int(record["nodes"]), int(record["segments"]), int(record["rays"])
+        at = int(record["offset"]) // 8
+        columns = []
+        for size, shape, words in ((2 * n, (n, 2), self._floats),
+                                   (n, (n,), self._floats),
+                                   (n, (n,), self._ints),
+                                   (2 * m, (m, 2), self._ints),
+                                   (k, (k,), self._ints),
+                                   (2 * k, (k, 2), self._floats)):
+            columns.append(words[at:at + size].reshape(shape))
+            at += size
+        return StoredSkeleton(*columns)
@@ -0,0 +1,51 @@
+"""Streaming of the skeleton segments while the wavefront propagates
+
+The segment that a kinetic vertex traces is final once the vertex stops.
+calc_skel(..., on_segment=callback) installs a SegmentStream on the skeleton,
+that the engines notify (Skeleton.stopped) whenever vertices stop; it passes
+the segment of every such vertex to the callback, in the format of
+Skeleton.segments:
+
+    ((start, end), (start info, end info))
+
+with start and end in the coordinates of the input. After the propagation,
+the unbounded segments of vertices that never stopped (only in the skeleton
+outside the input) follow, with end None as info.
+
+Segments of vertices that stop at their start node are not passed on.
+"""
+
+
+class SegmentStream(object):
+    """Passes the segments of stopped vertices to a callback"""
+
+    __slots__ = ("callback", "transform", "count")
+
+    def __init__(self, callback, transform=None):
+        self.callback = callback
+        self.transform = transform
+        self.count = 0  # number of segments passed on
+
+    def _point(self, pt):
+        if self.transform is not None:
+            return self.transform.backward(pt)
+        return pt
+
+    def stopped(self, vertices):
+        for v in vertices:
+            start, stop = v.start_node, v.stop_node
+            if start is stop:
+                continue
+            self.count += 1
+            self.callback(((self._point(start.pos), self._point(stop.pos)),
+                           (start.info, stop.info)))
+
+    def finish(self, skel, ray_until=1000):
+        """Passes the unbounded segments of the vertices that did not stop
+        (they end at their position at time ray_until)"""
+        for v in skel.vertices:
+            if v.stops_at is None:
+                self.count += 1
+                self.callback(((self._point(v.start_node.pos),
+                                self._point(v.position_at(ray_until))),
+                               (v.start_node.info, None)))
@@ -0,0 +1,38 @@
+"""Shapes and helpers shared by the tests (in tests/)
+
+"""
+
+import math
+
+
+L_SHAPE = [(0, 0), (20, 0), (20, 10), (10, 10), (10, 20), (0, 20)]
+RECTANGLE = [(0, 0), (12, 0), (12, 7), (0, 7)]
+RECT_WITH_HOLE = [
+    [(0, 0), (10, 0), (10, 6), (0, 6)],
+    [(4, 2), (4, 4), (6, 4), (6, 2)],
+]
+
+
+def conv(*rings):
+    """Returns the ToPointsAndSegments with the segments of the (closed)
+    rings given"""
+    # imported here, so that the helpers that do not triangulate can be used
+    # without tri
+    from tri.delaunay.helpers import ToPointsAndSegments
+
+    result = ToPointsAndSegments()
+    for ring in rings:
+        for i in range(len(ring)):
+            result.add_segment(ring[i], ring[(i + 1) % len(ring)])
+    return result
+
+
+def rounded(segments):
+    """Returns segments (as given by Skeleton.segments) as sorted pairs of
+    end points, rounded to 5 decimals, without the ones of zero length"""
+    result = []
+    for (p, q), _ in segments:
+        if math.hypot(p[0] - q[0], p[1] - q[1]) < 1e-7:
+            continue
+        result.append(tuple(sorted(tuple(round(c, 5) for c in pt) for pt in (p, q))))
+    return sorted(result)
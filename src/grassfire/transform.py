@@ -16,6 +16,14 @@ class Transform(object):
         return (pt[0] * self.scale[0]) + self.translate[0], \
             (pt[1] * self.scale[1]) + self.translate[1]
 
+    def forward_array(self, coords):
+        """Vectorized forward, for an (n, 2) NumPy array of coordinates"""
+        return (coords - self.translate) / self.scale
+
+    def backward_array(self, coords):
+        """Vectorized backward, for an (n, 2) NumPy array of coordinates"""
+        return (coords * self.scale) + self.translate
+
 
 def get_transform(box):
     """Get a transform object for a bounding box to transform to (-1,-1),(1,1)
@@ -47,4 +55,12 @@ def get_box(pts):
             ur[0] = pt[0]
         if pt[1] > ur[1]:
             ur[1] = pt[1]
-    return tuple(ll), tuple(ur)
\ No newline at end of file
+    return tuple(ll), tuple(ur)
+
+
+def get_box_array(coords):
+    """Returns tight fitting bounding box around an (n, 2) NumPy array of
+    coordinates (same format as get_box)
+    """
+    assert len(coords)
+    return tuple(coords.min(axis=0).tolist()), tuple(coords.max(axis=0).tolist())
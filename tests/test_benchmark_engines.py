@@ -0,0 +1,56 @@
+import pytest
+
+from grassfire.benchmark_engines import benchmark_engines, star_ring
+
+
+def _signed_area(ring):
+    return 0.5 * sum(
+        ring[i][0] * ring[(i + 1) % len(ring)][1]
+        - ring[(i + 1) % len(ring)][0] * ring[i][1]
+        for i in range(len(ring))
+    )
+
+
+def _reflex(ring):
+    count = 0
+    for i in range(len(ring)):
+        (ax, ay), (bx, by), (cx, cy) = ring[i - 1], ring[i], ring[(i + 1) % len(ring)]
+        if (bx - ax) * (cy - by) - (by - ay) * (cx - bx) < 0:
+            count += 1
+    return count
+
+
+@pytest.mark.parametrize("vertices, reflex", [(10, 0), (10, 1), (10, 5), (100, 33)])
+def test_star_ring(vertices, reflex):
+    ring = star_ring(vertices, reflex)
+    assert len(ring) == vertices
+    assert _signed_area(ring) > 0
+    assert _reflex(ring) == reflex
+
+
+def test_star_ring_too_many_reflex():
+    with pytest.raises(ValueError):
+        star_ring(10, 6)
+
+
+def test_benchmark_engines_reports_failures():
+    times = iter((0.0, 1.0, 2.0, 5.0, 10.0, 11.0, 12.0))
+
+    def fake_calc_skel(conv, internal_only, engine):
+        if engine == "slav" and conv[0] == 2:
+            raise NotImplementedError("not yet")
+
+    rows = benchmark_engines(
+        vertices=(10,),
+        reflex=(1, 2, 6),
+        repeats=1,
+        calc_skel_fn=fake_calc_skel,
+        make_conv_fn=lambda ring: (_reflex(ring),),
+        timer=lambda: next(times),
+    )
+    assert rows[0] == (10, 1, 1.0, 3.0, None)
+    assert rows[1][:3] == (10, 2, None)
+    assert rows[1][3] == 1.0
+    assert rows[1][4] == "NotImplementedError: not yet"
+    # more reflex vertices than half the vertices are skipped
+    assert len(rows) == 2
@@ -0,0 +1,33 @@
+from grassfire.benchmark_lazy_events import benchmark_lazy_events, count_computations
+from grassfire.benchmark_rectilinear import make_conv, rectilinear_ring
+
+
+def test_benchmark_lazy_events_reports_failures():
+    staircase = rectilinear_ring("staircase", 10)
+    calls = []
+
+    def fake_count(ring, lazy_events):
+        calls.append((ring == staircase, lazy_events))
+        if ring == staircase:
+            raise ValueError("boom")
+        if lazy_events:
+            return 3, {"edge": 2, "flip": 0, "split": 0, "recheck": 4}
+        return 5, {"edge": 2, "flip": 0, "split": 0}
+
+    rows = benchmark_lazy_events(
+        shapes=("L", "staircase"),
+        sizes=(10,),
+        count_fn=fake_count,
+        make_conv_fn=lambda ring: ring,
+    )
+    assert calls == [(False, False), (False, True), (True, False)]
+    assert rows[0][2:] == (5, 3, 4, None)
+    assert rows[1][2:] == (None, None, None, "ValueError: boom")
+
+
+def test_lazy_events_compute_fewer_collapses():
+    ring = rectilinear_ring("L", 100)
+    eager, _ = count_computations(make_conv(ring), False)
+    lazy, counts = count_computations(make_conv(ring), True)
+    assert lazy < eager
+    assert counts["recheck"] > 0
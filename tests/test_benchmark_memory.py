@@ -0,0 +1,38 @@
+import pytest
+
+from grassfire import calc_skel
+from grassfire.benchmark_memory import make_batch, measure_memory, skeletonize
+from grassfire.test.shapes import L_SHAPE, conv, rounded
+
+
+def test_make_batch():
+    rings = make_batch(shapes=("L", "comb"), size=10, count=2)
+    assert len(rings) == 4
+
+
+def test_measure_memory_passes_settings():
+    calls = []
+
+    def fake_skeletonize(conv, reuse_events, disable_gc):
+        calls.append((conv, reuse_events, disable_gc))
+        return [object() for _ in range(100)]
+
+    result = measure_memory(
+        ["a", "b"],
+        reuse_events=False,
+        disable_gc=False,
+        skeletonize_fn=fake_skeletonize,
+        make_conv_fn=lambda ring: ring,
+    )
+    assert calls == [("a", False, False), ("b", False, False)]
+    assert result["peak_bytes"] > 0
+    assert len(result["collections"]) == 3
+    assert result["gc_time"] >= 0.0
+
+
+@pytest.mark.parametrize("reuse_events", [True, False])
+@pytest.mark.parametrize("disable_gc", [True, False])
+def test_skeletonize_matches_calc_skel(reuse_events, disable_gc):
+    expected = calc_skel(conv(L_SHAPE), internal_only=True, engine="triangulation")
+    skel = skeletonize(conv(L_SHAPE), reuse_events, disable_gc)
+    assert rounded(skel.segments()) == rounded(expected.segments())
@@ -2,6 +2,7 @@ import pytest
 
 from grassfire.benchmark_polygon_archive_segments import (
     benchmark_total_skeleton_time,
+    compare_initial_triangulations,
     run_benchmark,
 )
 
@@ -67,3 +68,35 @@ def test_run_benchmark_with_profiling():
     assert totals == [2.5]
     assert profiler.enabled
     assert profiler.disabled
+
+
+def test_compare_initial_triangulations_sums_events_and_timings():
+    class FakeSkel:
+        def __init__(self, minimize_flips):
+            flips = 1 if minimize_flips else 4
+            self.event_counts = {"edge": 3, "flip": flips, "split": 1}
+            self.timings = {"triangulate": 9.0, "initialize": 0.5, "propagate": 1.0}
+
+    calls = []
+
+    def fake_calc_skel(conv, internal_only, minimize_flips):
+        calls.append((conv, internal_only, minimize_flips))
+        return FakeSkel(minimize_flips)
+
+    result = compare_initial_triangulations(
+        names=("a", "b"),
+        load_coords_fn=lambda name: name,
+        calc_skel_fn=fake_calc_skel,
+        make_conv_fn=lambda coords: coords,
+    )
+    assert calls == [
+        ("a", True, False),
+        ("b", True, False),
+        ("a", True, True),
+        ("b", True, True),
+    ]
+    assert result["cdt"] == (
+        {"edge": 6, "flip": 8, "split": 2},
+        {"initialize": 1.0, "propagate": 2.0},
+    )
+    assert result["minimize_flips"][0]["flip"] == 2
@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from grassfire.benchmark_rectangles import benchmark_rectangles, make_rectangles
+
+
+def test_make_rectangles():
+    rings = list(make_rectangles(20, seed=1))
+    assert len(rings) == 20
+    for ring in rings:
+        assert len(ring) == 4
+        for i in range(4):
+            (ax, ay), (bx, by), (cx, cy) = ring[i - 1], ring[i], ring[(i + 1) % 4]
+            # right angle, counterclockwise turn
+            assert (bx - ax) * (cx - bx) + (by - ay) * (cy - by) == pytest.approx(0, abs=1e-6)
+            assert (bx - ax) * (cy - by) - (by - ay) * (cx - bx) > 0
+    assert list(make_rectangles(20, seed=1)) == rings
+
+
+def test_benchmark_rectangles_latencies():
+    times = iter((0.0, 1.0, 1.0, 4.0, 4.0, 6.0))
+    calls = []
+
+    def fake_calc_skel(conv, internal_only, engine):
+        calls.append((internal_only, engine))
+
+    result = benchmark_rectangles(
+        make_rectangles(3),
+        engine="convex",
+        calc_skel_fn=fake_calc_skel,
+        make_conv_fn=lambda ring: ring,
+        timer=lambda: next(times),
+    )
+    assert calls == [(True, "convex")] * 3
+    assert result["polygons"] == 3
+    assert result["total"] == 6.0
+    assert result["median"] == 2.0
+    assert result["p95"] == 3.0
+    assert math.isclose(result["mean"], 2.0)
+
+
+def test_benchmark_rectangles_needs_input():
+    with pytest.raises(ValueError):
+        benchmark_rectangles([], calc_skel_fn=None, make_conv_fn=None)
@@ -0,0 +1,53 @@
+import pytest
+
+from grassfire.benchmark_rectilinear import (
+    SHAPES,
+    benchmark_rectilinear,
+    rectilinear_ring,
+)
+
+
+def _signed_area(ring):
+    return 0.5 * sum(
+        ring[i][0] * ring[(i + 1) % len(ring)][1]
+        - ring[(i + 1) % len(ring)][0] * ring[i][1]
+        for i in range(len(ring))
+    )
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_rectilinear_ring(shape):
+    for size in (10, 100, 1000):
+        ring = rectilinear_ring(shape, size)
+        assert size * 0.5 <= len(ring) <= size * 1.25
+        assert len(set(ring)) == len(ring)
+        assert _signed_area(ring) > 0
+        for i in range(len(ring)):
+            (x0, y0), (x1, y1) = ring[i], ring[(i + 1) % len(ring)]
+            # axis aligned edges
+            assert x0 == pytest.approx(x1) or y0 == pytest.approx(y1)
+
+
+def test_unknown_shape():
+    with pytest.raises(ValueError):
+        rectilinear_ring("Z", 10)
+
+
+def test_benchmark_rectilinear_reports_failures():
+    times = iter((0.0, 2.0, 5.0))
+
+    def fake_calc_skel(conv, internal_only, engine):
+        if conv[0] == "staircase":
+            raise NotImplementedError("not yet")
+
+    rows = benchmark_rectilinear(
+        shapes=("comb", "staircase"),
+        sizes=(10,),
+        repeats=1,
+        calc_skel_fn=fake_calc_skel,
+        make_conv_fn=lambda ring: ("staircase" if len(ring) == 10 else "comb",),
+        timer=lambda: next(times),
+    )
+    assert rows[0] == ("comb", 8, 2.0, None)
+    assert rows[1][:3] == ("staircase", 10, None)
+    assert rows[1][3] == "NotImplementedError: not yet"
@@ -0,0 +1,56 @@
+import array
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire.buffers import ring_points_and_segments
+from grassfire.transform import get_box, get_box_array, get_transform
+
+
+RECT_WITH_HOLE = [
+    (0.0, 0.0), (2.0, 0.0), (2.0, 1.0), (0.0, 1.0), (0.0, 0.0),
+    (0.5, 0.25), (0.5, 0.75), (1.0, 0.75), (1.0, 0.25),
+]
+OFFSETS = [0, 5, 9]
+
+
+def _as_index_pairs(points, segments):
+    pts = [tuple(p) for p in points.tolist()]
+    return {(pts[a], pts[b]) for a, b in segments.tolist()}
+
+
+def test_ring_points_and_segments_drops_closing_point():
+    points, segments = ring_points_and_segments(np.array(RECT_WITH_HOLE), OFFSETS)
+    assert len(points) == 8
+    assert len(segments) == 8
+    pairs = _as_index_pairs(points, segments)
+    assert ((0.0, 1.0), (0.0, 0.0)) in pairs
+    assert ((1.0, 0.25), (0.5, 0.25)) in pairs
+
+
+def test_ring_points_and_segments_accepts_buffer():
+    flat = array.array("d", [c for pt in RECT_WITH_HOLE for c in pt])
+    points, segments = ring_points_and_segments(flat, OFFSETS)
+    expected_points, expected_segments = ring_points_and_segments(
+        np.array(RECT_WITH_HOLE), OFFSETS
+    )
+    assert points.tolist() == expected_points.tolist()
+    assert segments.tolist() == expected_segments.tolist()
+
+
+def test_ring_points_and_segments_validates_offsets():
+    with pytest.raises(ValueError, match="at least 3"):
+        ring_points_and_segments(np.array(RECT_WITH_HOLE), [0, 2, 9])
+    with pytest.raises(ValueError, match="start at 0"):
+        ring_points_and_segments(np.array(RECT_WITH_HOLE), [1, 9])
+
+
+def test_vectorized_transform_matches_scalar():
+    points, _ = ring_points_and_segments(np.array(RECT_WITH_HOLE), OFFSETS)
+    pts = [tuple(p) for p in points.tolist()]
+    assert get_box_array(points) == get_box(pts)
+    transform = get_transform(get_box_array(points))
+    forward = transform.forward_array(points)
+    assert forward.tolist() == [list(transform.forward(pt)) for pt in pts]
+    assert np.allclose(transform.backward_array(forward), points)
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.centerline import centerline, longest_path, reduce_graph
+from grassfire.compact import CompactSkeleton
+from grassfire.graph import skeleton_graph
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+STRIP = [(0, 0), (100, 0), (100, 10), (0, 10)]
+
+
+@pytest.mark.parametrize("engine", ["convex", "slav", "triangulation"])
+def test_centerline_of_strip(engine):
+    skel = calc_skel(conv(STRIP), internal_only=True, engine=engine)
+    line = centerline(skel)
+    # from corner to corner over the ridge
+    assert line.length == pytest.approx(90 + 2 * math.hypot(5, 5))
+    assert line.times[[0, -1]].tolist() == [0, 0]
+
+    line = centerline(skel, prune_length=8)
+    assert np.allclose(sorted(line.coords.tolist()), [[5, 5], [95, 5]])
+    assert line.times.tolist() == pytest.approx([5, 5])
+    assert line.length == pytest.approx(90)
+
+
+def test_pruning_of_l_shape():
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine="slav")
+    graph = skeleton_graph(skel)
+    assert len(reduce_graph(graph, prune_length=3).edges) == len(graph.edges)
+
+    reduced = reduce_graph(graph, prune_length=8)
+    assert np.allclose(sorted(reduced.positions.tolist()),
+                       [[5, 5], [5, 15], [15, 5]])
+    assert len(reduced.edges) == 2
+    assert reduced.lengths.sum() == pytest.approx(20)
+    assert centerline(graph, prune_length=8).length == pytest.approx(20)
+    # the ends of the remaining graph are pruned as well once the branches
+    # to the corners behind them are gone
+    assert len(reduce_graph(graph, prune_length=20).edges) == 1
+
+
+def test_collinear_chains_are_merged():
+    compact = CompactSkeleton(
+        [(0, 0), (1, 0), (2, 0), (3, 0), (1, 1), (4, 1)],
+        [0.0, 1.0, 1.0, 1.0, 2.0, 2.0],
+        [None, None, None, None, None, "end"],
+        [(0, 1), (1, 2), (2, 3), (1, 4), (3, 5)],
+    )
+    graph = skeleton_graph(compact)
+    reduced = reduce_graph(graph)
+    assert reduced.positions.tolist() == [[0, 0], [1, 0], [3, 0], [1, 1], [4, 1]]
+    assert reduced.infos == (None, None, None, None, "end")
+    assert reduced.edges.tolist() == [[0, 1], [1, 2], [1, 3], [2, 4]]
+    assert reduced.lengths.tolist() == pytest.approx([1, 2, 1, math.sqrt(2)])
+    assert reduced.data.tolist() == reduced.lengths[reduced.edge_ids].tolist()
+
+    assert len(reduce_graph(graph, merge_angle=-1).edges) == 5
+    # (3, 0) turns by 45 degrees
+    bent = reduce_graph(graph, merge_angle=math.pi / 3)
+    assert bent.edges.tolist() == [[0, 1], [1, 2], [1, 3]]
+    assert bent.lengths.tolist() == pytest.approx([1, 1, 2 + math.sqrt(2)])
+
+    path = longest_path(reduced)
+    assert reduced.positions[path].tolist() in ([[0, 0], [1, 0], [3, 0], [4, 1]],
+                                                [[4, 1], [3, 0], [1, 0], [0, 0]])
+    line = centerline(compact)
+    assert line.length == pytest.approx(3 + math.sqrt(2))
+    assert len(line.coords) == 4
+
+    empty = centerline(CompactSkeleton([], [], [], []))
+    assert empty.coords.shape == (0, 2)
+    assert empty.length == 0
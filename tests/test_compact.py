@@ -0,0 +1,71 @@
+import gc
+import math
+import pickle
+import weakref
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel, calc_skel_from_rings
+from grassfire.compact import CompactSkeleton, compact_skeleton
+from grassfire.test.shapes import L_SHAPE, RECT_WITH_HOLE, conv, rounded
+
+
+@pytest.mark.parametrize("engine", ["convex", "slav", "triangulation"])
+def test_compact_segments_match_skeleton(engine):
+    ring = L_SHAPE if engine != "convex" else [(0, 0), (8, 0), (8, 4), (0, 4)]
+    skel = calc_skel(conv(ring), internal_only=True, engine=engine)
+    result = compact_skeleton(skel)
+    assert rounded(result.segments_list()) == rounded(skel.segments())
+    assert len(result.rays) == 0
+
+
+def test_node_times_are_distances_to_the_boundary():
+    coords = np.array([pt for ring in RECT_WITH_HOLE for pt in ring], dtype=float)
+    result = calc_skel_from_rings(coords, [0, 4, 8], internal_only=True, compact=True)
+    assert isinstance(result, CompactSkeleton)
+    assert not np.isnan(result.times).any()
+    for (x, y), time in zip(result.positions.tolist(), result.times.tolist()):
+        # for this input the distance to the boundary is the distance to the
+        # nearest edge of the outer ring or the hole
+        outer = min(x, y, 10 - x, 6 - y)
+        dx = max(4 - x, 0, x - 6)
+        dy = max(2 - y, 0, y - 4)
+        assert time == pytest.approx(min(outer, math.hypot(dx, dy)), abs=1e-6)
+
+
+def test_compact_result_is_immutable():
+    result = calc_skel(conv(L_SHAPE), internal_only=True, compact=True)
+    with pytest.raises(AttributeError):
+        result.times = None
+    with pytest.raises(ValueError):
+        result.positions[0, 0] = 1.0
+    assert result.segments.dtype == np.int64
+    assert result.segments.max() < len(result.positions)
+    assert len(result.infos) == len(result.positions)
+
+
+def test_compact_result_does_not_keep_skeleton():
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine="triangulation")
+    vertex = weakref.ref(skel.vertices[0])
+    result = compact_skeleton(skel)
+    del skel
+    gc.collect()
+    assert vertex() is None
+    assert len(result) > 0
+
+
+def test_rays_of_external_skeleton():
+    skel = calc_skel(conv(L_SHAPE), engine="triangulation")
+    result = compact_skeleton(skel)
+    unstopped = [v for v in skel.vertices if v.stops_at is None]
+    assert len(result.rays) == len(unstopped) > 0
+    assert len(result.segments_list()) == len(result.segments) + len(result.rays)
+
+
+def test_compact_result_can_be_pickled():
+    result = calc_skel(conv(L_SHAPE), internal_only=True, compact=True)
+    copy = pickle.loads(pickle.dumps(result))
+    assert copy.segments_list() == result.segments_list()
+    assert not copy.positions.flags.writeable
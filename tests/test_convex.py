@@ -0,0 +1,98 @@
+import math
+import random
+
+import pytest
+
+from grassfire import calc_skel
+from grassfire.convex import convex_ring, convex_skeleton, ring_from_segments
+from grassfire.test.shapes import conv, rounded
+
+
+def _random_convex(count, seed):
+    rnd = random.Random(seed)
+    angles = sorted(rnd.uniform(0, 2 * math.pi) for _ in range(count))
+    return [(10 * math.cos(a), 7 * math.sin(a)) for a in angles]
+
+
+def _regular(count, radius=5.0):
+    return [(radius * math.cos(2 * math.pi * i / count),
+             radius * math.sin(2 * math.pi * i / count)) for i in range(count)]
+
+
+def test_ring_from_segments_orients_counterclockwise():
+    points = [(0, 0), (0, 1), (1, 1), (1, 0)]
+    segments = [(0, 1), (1, 2), (2, 3), (3, 0)]
+    assert ring_from_segments(points, segments) == [3, 2, 1, 0]
+
+
+def test_ring_from_segments_rejects_more_rings():
+    points = [(0, 0), (4, 0), (4, 4), (1, 1), (2, 1), (2, 2)]
+    segments = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)]
+    assert ring_from_segments(points, segments) is None
+
+
+def test_convex_ring_rejects_reflex_and_collinear_vertices():
+    segments = [(0, 1), (1, 2), (2, 3), (3, 0)]
+    reflex = [(0, 0), (4, 0), (1, 1), (0, 4)]
+    assert convex_ring(reflex, segments) is None
+    collinear = [(0, 0), (2, 0), (4, 0), (2, 2)]
+    assert convex_ring(collinear, segments) is None
+    assert convex_ring([(0, 0), (4, 0), (4, 4), (0, 4)], segments) is not None
+
+
+def test_square_collapses_to_one_node():
+    points = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    skel = convex_skeleton(points, [0, 1, 2, 3])
+    ends = {tuple(round(c, 9) for c in v.stop_node.pos)
+            for v in skel.vertices if v.stop_node is not None}
+    assert ends == {(1.0, 1.0)}
+    assert skel.event_counts["split"] == 0
+
+
+@pytest.mark.parametrize(
+    "ring",
+    [
+        [(0, 0), (3, 0), (1, 2)],
+        [(0, 0), (4, 0), (4, 1), (0, 1)],
+        [(0, 0), (2, 0), (2, 2), (0, 2)],
+        _regular(6),
+        _random_convex(40, seed=7),
+    ],
+)
+def test_convex_engine_matches_triangulation(ring):
+    expected = calc_skel(conv(ring), internal_only=True, engine="triangulation")
+    skel = calc_skel(conv(ring), internal_only=True)
+    assert skel.timings["triangulate"] == 0.0
+    assert rounded(skel.segments()) == rounded(expected.segments())
+
+
+def test_convex_engine_needs_internal_only_and_convex_input():
+    with pytest.raises(ValueError):
+        calc_skel(conv([(0, 0), (2, 0), (2, 2), (0, 2)]), engine="convex")
+    with pytest.raises(ValueError):
+        calc_skel(conv([(0, 0), (4, 0), (1, 1), (0, 4)]), internal_only=True,
+                  engine="convex")
+    with pytest.raises(ValueError):
+        calc_skel(conv([(0, 0), (2, 0), (2, 2)]), engine="unknown")
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        [(0, 0), (3, 0), (1, 2)],
+        [(0, 0), (4, 0), (4, 1), (0, 1)],
+        [(1, 0), (1, 4), (0, 4), (0, 0)],
+        [(0, 0), (2, 0), (2, 2), (0, 2)],
+        [(0, 0), (3, 4), (-1, 7), (-4, 3)],
+    ],
+)
+def test_closed_form_matches_event_loop(points):
+    from grassfire.convex import convex_event_loop, init_convex_skeleton
+
+    ring = list(range(len(points)))
+    closed = init_convex_skeleton(points, ring)
+    convex_event_loop(closed, closed_form=True)
+    simulated = init_convex_skeleton(points, ring)
+    convex_event_loop(simulated, closed_form=False)
+    assert rounded(closed.segments()) == rounded(simulated.segments())
+    assert all(v.stops_at is not None for v in closed.vertices)
@@ -0,0 +1,58 @@
+from grassfire.collapse import make_event
+from grassfire.events.queue import EventQueue
+from grassfire.primitives import KineticTriangle
+
+
+def _triangle(neighbours=(True, True, True)):
+    return KineticTriangle(None, None, None, *neighbours)
+
+
+def _queue_event(queue, tri, when):
+    tri.event = make_event(tri, when, (0,), "flip")
+    queue.add(tri.event)
+    return tri.event
+
+
+def test_events_are_popped_by_time_then_triangle_type():
+    queue = EventQueue()
+    late, zero, one = _triangle(), _triangle(), _triangle((None, True, True))
+    _queue_event(queue, late, 2.0)
+    _queue_event(queue, zero, 1.0)
+    _queue_event(queue, one, 1.0)
+    assert len(queue) == 3
+    assert [queue.pop().triangle for _ in range(3)] == [one, zero, late]
+    assert not queue
+
+
+def test_discarded_event_is_skipped():
+    queue = EventQueue()
+    a, b = _triangle(), _triangle()
+    _queue_event(queue, a, 1.0)
+    _queue_event(queue, b, 2.0)
+    queue.discard(a.event)
+    assert len(queue) == 1
+    assert list(queue) == [b.event]
+    assert queue.pop() is b.event
+    assert not queue
+
+
+def test_event_record_is_updated_in_place():
+    queue = EventQueue()
+    tri = _triangle()
+    first = _queue_event(queue, tri, 1.0)
+    queue.discard(first)
+    again = _queue_event(queue, tri, 3.0)
+    assert again is first
+    assert len(queue) == 1
+    assert queue.peek().time == 3.0
+    assert queue.pop() is first
+    assert not queue
+
+
+def test_queued_event_record_is_not_reused():
+    queue = EventQueue()
+    tri = _triangle()
+    queued = _queue_event(queue, tri, 1.0)
+    other = make_event(tri, 5.0, (1,), "edge")
+    assert other is not queued
+    assert queued.time == 1.0
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.export import segment_arrays
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_segment_arrays_match_segments(engine):
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine)
+    arrays = segment_arrays(skel)
+    segments = skel.segments()
+    assert arrays.coords.shape == (len(segments), 2, 2)
+    assert arrays.coords.ravel().tolist() == pytest.approx(
+        [c for (p, q), _ in segments for c in p + q])
+    assert arrays.infos.tolist() == [list(infos) for _, infos in segments]
+    assert arrays.bounded.all()
+    # times are distances to the boundary, in the units of the input
+    assert arrays.times[:, 0].min() == 0.0
+    assert arrays.times[:, 1].max() == pytest.approx(5.0)
+    positions = [skel.transform.backward(n.pos) for n in skel.sk_nodes]
+    for (start, stop), (p, q) in zip(arrays.nodes.tolist(), arrays.coords.tolist()):
+        assert positions[start] == pytest.approx(p)
+        assert positions[stop] == pytest.approx(q)
+
+
+def test_unbounded_segments():
+    skel = calc_skel(conv(L_SHAPE), engine="triangulation")
+    arrays = segment_arrays(skel)
+    unbounded = ~arrays.bounded
+    assert unbounded.sum() == sum(v.stops_at is None for v in skel.vertices) > 0
+    assert (arrays.nodes[unbounded, 1] == -1).all()
+    assert np.isnan(arrays.times[unbounded, 1]).all()
+    assert not np.isnan(arrays.coords).any()
+
+
+def test_unbounded_segments_end_as_compact_rays():
+    skel = calc_skel(conv(L_SHAPE), engine="triangulation")
+    compact = calc_skel(conv(L_SHAPE), engine="triangulation", compact=True)
+    arrays = segment_arrays(skel, ray_until=50.0)
+    ends = sorted(map(tuple, arrays.coords[~arrays.bounded, 1].tolist()))
+    rays = compact.segments_list(ray_until=50.0)[len(compact.segments):]
+    expected = sorted(q for (_, q), _ in rays)
+    assert len(ends) == len(expected) > 0
+    for end, q in zip(ends, expected):
+        assert end == pytest.approx(q)
+
+
+def test_empty_skeleton():
+    from grassfire.primitives import Skeleton
+
+    arrays = segment_arrays(Skeleton())
+    assert arrays.coords.shape == (0, 2, 2)
+    assert arrays.bounded.shape == (0,)
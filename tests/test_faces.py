@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.faces import Face, FaceIndex, skeleton_faces
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+def _area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(float(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1])))
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_faces_of_l_shape(engine):
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine)
+    faces = skeleton_faces(skel)
+    assert len(faces) == len(L_SHAPE)
+    assert sum(_area(face.polygon) for face in faces) == pytest.approx(300)
+    for face in faces:
+        assert face.polygon[0].tolist() == pytest.approx(face.start)
+        assert face.polygon[-2].tolist() == pytest.approx(face.end)
+        assert face.polygon[-1].tolist() == face.polygon[0].tolist()
+
+    index = FaceIndex(faces)
+    points = [(2, 10), (10, 3), (15, 9), (9, 13), (9.5, 8), (12, 12), (-1, 5)]
+    location = index.locate(points)
+    assert location.times[:5].tolist() == pytest.approx([2, 3, 1, 1, 2])
+    # the reflex corner at (10, 10): the wavefront of y = 10 gets to
+    # (9.5, 8) before the wavefront of x = 10 does
+    edges = [(faces[i].start, faces[i].end) for i in location.faces[:5].tolist()]
+    assert edges == [((0, 20), (0, 0)), ((0, 0), (20, 0)), ((20, 10), (10, 10)),
+                     ((10, 10), (10, 20)), ((20, 10), (10, 10))]
+    assert location.faces[5:].tolist() == [-1, -1]
+    assert np.isnan(location.times[5:]).all()
+
+
+def test_faces_where_wavefronts_collide():
+    # the bar of the comb is closed by parallel wavefronts meeting at 0.5
+    ring = rectilinear_ring("comb", 60)
+    skel = calc_skel(conv(ring), internal_only=True, engine="slav")
+    faces = skeleton_faces(skel)
+    assert len(faces) == len(ring)
+    expected = _area(np.array(list(ring) + [ring[0]], dtype=float))
+    assert sum(_area(face.polygon) for face in faces) == pytest.approx(expected)
+
+
+def test_locate_many_points():
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine="slav")
+    index = FaceIndex(skeleton_faces(skel), cell_size=3)
+    points = np.random.default_rng(1).random((5000, 2)) * 22 - 1
+    location = index.locate(points)
+    x, y = points[:, 0], points[:, 1]
+    inside = (x > 0) & (y > 0) & (x < 20) & (y < 20) & ~((x > 10) & (y > 10))
+    assert np.array_equal(location.faces != -1, inside)
+    found = location.faces[inside]
+    assert (location.times[inside] <= np.minimum.reduce([x, y, 20 - x, 20 - y])[inside] + 1e-9).all()
+    assert len(np.unique(found)) == len(L_SHAPE)
+
+
+def test_infos_of_faces():
+    square = np.array([(0, 0), (2, 0), (1, 1), (0, 0)], dtype=float)
+    index = FaceIndex([Face((0, 0), (2, 0), ("a", "b"), square,
+                            np.array([0.0, 0.0, 1.0, 0.0]))])
+    location = index.locate([(1, 0.5), (1, 2)])
+    assert location.faces.tolist() == [0, -1]
+    assert location.infos.tolist() == [["a", "b"], [None, None]]
+    assert location.times[0] == pytest.approx(0.5)
+    empty = FaceIndex([]).locate([(0, 0)])
+    assert empty.faces.tolist() == [-1]
@@ -0,0 +1,44 @@
+import gc
+import weakref
+
+import pytest
+
+from grassfire import calc_skel
+from grassfire.primitives import KineticVertex
+from grassfire.test.shapes import conv
+
+
+def test_vertex_history_keeps_weak_references():
+    a, b = KineticVertex(), KineticVertex()
+    a.right = b, 0
+    b.left = a, 0
+    assert a.right is b
+    assert b.left_at(1.0) is a
+    ref = weakref.ref(b)
+    del b
+    assert ref() is None
+    assert a.right is None
+
+
+@pytest.mark.parametrize("engine", ["triangulation", "convex", "slav"])
+def test_skeleton_is_freed_by_reference_counting(engine):
+    ring = [(0, 0), (4, 0), (4, 3), (0, 3)]
+    skel = calc_skel(conv(ring), internal_only=True, engine=engine)
+    assert skel.triangles == []
+    refs = [weakref.ref(v) for v in skel.vertices]
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        del skel
+        assert all(ref() is None for ref in refs)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def test_keep_triangles():
+    ring = [(0, 0), (4, 0), (4, 3), (1, 1), (0, 3)]
+    skel = calc_skel(conv(ring), internal_only=True, engine="triangulation",
+                     keep_triangles=True)
+    assert len(skel.triangles) == 3
+    assert all(t.internal for t in skel.triangles)
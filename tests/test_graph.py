@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.compact import CompactSkeleton
+from grassfire.graph import skeleton_graph
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+def _nearest(graph, pt):
+    return int(np.argmin(np.hypot(*(graph.positions - pt).T)))
+
+
+def _neighbours(graph, i):
+    return graph.indices[graph.indptr[i]:graph.indptr[i + 1]].tolist()
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_graph_of_l_shape(engine):
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine)
+    graph = skeleton_graph(skel)
+    # every position once
+    rounded = {tuple(round(c, 6) for c in pt) for pt in graph.positions.tolist()}
+    assert len(rounded) == len(graph.positions)
+    assert graph.indptr[-1] == len(graph.indices) == 2 * len(graph.edges)
+    expected = 0.0
+    for (p, q), _ in skel.segments():
+        expected += math.hypot(p[0] - q[0], p[1] - q[1])
+    assert graph.lengths.sum() == pytest.approx(expected)
+    for i in range(len(graph.positions)):
+        for j, e in zip(_neighbours(graph, i),
+                        graph.edge_ids[graph.indptr[i]:graph.indptr[i + 1]].tolist()):
+            assert sorted(graph.edges[e].tolist()) == sorted([i, j])
+            assert i in _neighbours(graph, j)
+    assert graph.data.tolist() == graph.lengths[graph.edge_ids].tolist()
+    # corners of the input are leaves, with the wavefront starting there
+    for corner in L_SHAPE:
+        i = _nearest(graph, corner)
+        assert len(_neighbours(graph, i)) == 1
+        assert graph.times[i] == 0
+
+
+def test_near_duplicates_are_merged():
+    # node 2 is node 1, moved a little
+    compact = CompactSkeleton(
+        [(0, 0), (1, 0), (1, 1e-9), (2, 0), (1, 1)],
+        [0.0, 0.5, 0.4, 0.0, 1.0],
+        [None, None, 7, None, None],
+        [(0, 1), (2, 3), (1, 4), (2, 4), (1, 2)],
+    )
+    graph = skeleton_graph(compact)
+    assert len(graph.positions) == 4
+    assert graph.positions[1].tolist() == [1, 0]
+    assert graph.times.tolist() == [0.0, 0.4, 0.0, 1.0]
+    assert graph.infos == (None, 7, None, None)
+    # the loop (1, 2) and the repeated edge (1, 4) are gone
+    assert graph.edges.tolist() == [[0, 1], [1, 2], [1, 3]]
+    assert sorted(_neighbours(graph, 1)) == [0, 2, 3]
+    assert graph.lengths.tolist() == [1.0, 1.0, 1.0]
+
+    exact = skeleton_graph(compact, tolerance=0)
+    assert len(exact.positions) == 5
+    assert len(exact.edges) == 5
@@ -0,0 +1,35 @@
+from grassfire import calc_skel, prepare_triangulation
+from grassfire.initialize import (init_skeleton, internal_only_skeleton,
+                                  minimize_initial_flips)
+from grassfire.test.shapes import conv, rounded
+
+
+def _comb():
+    """Polygon with a few reflex vertices (needle triangles in the CDT)"""
+    return conv([(0, 0), (12, 0), (12, 6), (10, 6), (9, 1.5), (8, 6), (6, 6),
+                 (5, 1), (4, 6), (2, 6), (1, 2), (0, 6)])
+
+
+def test_minimize_flips_gives_same_skeleton():
+    prepared = prepare_triangulation(_comb())
+    plain = calc_skel(None, internal_only=True, triangulation=prepared)
+    fewer = calc_skel(None, internal_only=True, triangulation=prepared,
+                      minimize_flips=True)
+    assert rounded(plain.segments()) == rounded(fewer.segments())
+    assert set(fewer.event_counts) == {"edge", "flip", "split"}
+
+
+def test_minimize_flips_gives_fewer_flip_events():
+    # the constrained Delaunay triangulation of this polygon is unique, and
+    # two of its triangles are flipped during propagation
+    ring = [(3, 1), (1, 7), (-1, 2), (-1, 7), (-2, 3), (-8, 1), (-6, -7),
+            (0, -3), (1, -8), (2, -2)]
+    prepared = prepare_triangulation(conv(ring))
+    plain = calc_skel(None, internal_only=True, triangulation=prepared)
+    skel = init_skeleton(prepared.dt)
+    skel = internal_only_skeleton(skel)
+    assert minimize_initial_flips(skel) >= 1
+    fewer = calc_skel(None, internal_only=True, triangulation=prepared,
+                      minimize_flips=True)
+    assert fewer.event_counts["flip"] < plain.event_counts["flip"]
+    assert rounded(plain.segments()) == rounded(fewer.segments())
@@ -0,0 +1,95 @@
+import math
+import random
+
+import pytest
+
+from grassfire import calc_skel
+from grassfire.events import loop
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.collapse import collapse_time_lower_bound, compute_collapse_time, find_gte
+from grassfire.primitives import KineticTriangle, KineticVertex
+from grassfire.test.shapes import conv, rounded
+
+
+def _kinetic_vertex(rnd):
+    kv = KineticVertex()
+    kv.origin = (rnd.uniform(-1, 1), rnd.uniform(-1, 1))
+    kv.velocity = (rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+    kv.inf_fast = False
+    kv.starts_at = 0
+    return kv
+
+
+def test_lower_bound_does_not_pass_collapse():
+    rnd = random.Random(1)
+    checked = 0
+    for _ in range(1000):
+        a, b, c = (_kinetic_vertex(rnd) for _ in range(3))
+        (ax, ay), (bx, by), (cx, cy) = a.origin, b.origin, c.origin
+        if (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) < 0:
+            a, c = c, a
+        # 0-triangle: collapses when its area does
+        tri = KineticTriangle(a, b, c, True, True, True)
+        bound = collapse_time_lower_bound(tri, 0.0)
+        event = compute_collapse_time(tri, 0.0, find_gte)
+        if event is not None:
+            checked += 1
+            assert bound <= event.time + 1e-9
+    assert checked > 100
+
+
+@pytest.mark.parametrize(
+    "ring",
+    [
+        [(0, 0), (10, 0), (10, 6), (6, 6), (6, 3), (4, 3), (4, 6), (0, 6)],
+        [(math.cos(2 * math.pi * i / 17), 0.6 * math.sin(2 * math.pi * i / 17))
+         for i in range(17)],
+        rectilinear_ring("comb", 40),
+        rectilinear_ring("T", 100),
+    ],
+)
+def test_lazy_events_give_same_skeleton(ring):
+    expected = calc_skel(conv(ring), internal_only=True, engine="triangulation")
+    skel = calc_skel(conv(ring), internal_only=True, engine="triangulation",
+                     lazy_events=True)
+    assert rounded(skel.segments()) == rounded(expected.segments())
+    assert skel.event_counts["recheck"] > 0
+    assert "recheck" not in expected.event_counts
+
+
+def _handled_events(monkeypatch, ring, lazy_events):
+    handled = []
+
+    def record(handler):
+        def handle(evt, *args, **kwargs):
+            handled.append((evt.tp, round(evt.time, 9)))
+            return handler(evt, *args, **kwargs)
+        return handle
+
+    with monkeypatch.context() as m:
+        for name in ("handle_edge_event", "handle_edge_event_3sides",
+                     "handle_edge_event_1side", "handle_flip_event",
+                     "handle_split_event"):
+            m.setattr(loop, name, record(getattr(loop, name)))
+        calc_skel(conv(ring), internal_only=True, engine="triangulation",
+                  lazy_events=lazy_events)
+    return sorted(handled)
+
+
+# rings without simultaneous events: the order in which those are handled
+# depends on how the triangles are laid out in memory
+@pytest.mark.parametrize(
+    "ring",
+    [
+        [(math.cos(2 * math.pi * i / 17), 0.6 * math.sin(2 * math.pi * i / 17))
+         for i in range(17)],
+        [(3, 1), (1, 7), (-1, 2), (-1, 7), (-2, 3), (-8, 1), (-6, -7),
+         (0, -3), (1, -8), (2, -2)],
+        rectilinear_ring("staircase", 40),
+    ],
+)
+def test_lazy_events_handle_same_events(monkeypatch, ring):
+    expected = _handled_events(monkeypatch, ring, False)
+    handled = _handled_events(monkeypatch, ring, True)
+    assert expected
+    assert handled == expected
@@ -0,0 +1,69 @@
+import random
+
+from grassfire import calc_offsets, calc_skel
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.lifetime import LifetimeIndex
+from grassfire.primitives import KineticVertex
+from grassfire.test.shapes import conv
+
+
+def _vertices(rnd, count):
+    vertices = []
+    for _ in range(count):
+        v = KineticVertex()
+        v.starts_at = rnd.choice([0.0, rnd.uniform(0, 10), float(rnd.randint(0, 10))])
+        if rnd.random() < 0.2:
+            v.stops_at = None
+        elif rnd.random() < 0.1:
+            v.stops_at = v.starts_at
+        else:
+            v.stops_at = v.starts_at + rnd.choice([rnd.uniform(0, 5), float(rnd.randint(1, 3))])
+        vertices.append(v)
+    return vertices
+
+
+def _active(v, t0, t1):
+    return v.starts_at <= t1 and (v.stops_at is None or v.stops_at > t0)
+
+
+def test_queries_match_scan():
+    rnd = random.Random(42)
+    vertices = _vertices(rnd, 500)
+    index = LifetimeIndex(vertices)
+    for _ in range(200):
+        t0 = rnd.choice([rnd.uniform(-1, 16), float(rnd.randint(0, 15))])
+        t1 = t0 + rnd.choice([0.0, rnd.uniform(0, 3)])
+        assert index.active_at(t0) == [v for v in vertices if _active(v, t0, t0)]
+        assert index.active_between(t0, t1) == [v for v in vertices if _active(v, t0, t1)]
+
+
+def test_neighbour_history_lookup():
+    v, a, b, c = KineticVertex(), KineticVertex(), KineticVertex(), KineticVertex()
+    v.left = a, 0.0
+    v.left = b, 2.0
+    v.left = c, 2.0
+    v.right = a, 1.0
+    assert v.left_at(-1.0) is None
+    assert v.left_at(0.0) is a
+    assert v.left_at(1.9) is a
+    assert v.left_at(2.0) is c
+    assert v.left_at(100.0) is c
+    assert v.right_at(0.5) is None
+    assert v.right_at(1.0) is a
+
+
+def test_offsets_match_scan():
+    skel = calc_skel(conv(rectilinear_ring("comb", 40)), internal_only=True,
+                     engine="slav")
+    now = max(v.stops_at for v in skel.vertices)
+    expected = []
+    inc = now / 20
+    for k in range(20):
+        t = k * inc
+        for v in skel.vertices:
+            if v.starts_at <= t and (v.stops_at is None or v.stops_at > t):
+                left = v.left_at(t)
+                if left is not None:
+                    expected.append((v.position_at(t), left.position_at(t), t))
+    index = LifetimeIndex(skel.vertices)
+    assert [o[:3] for o in calc_offsets(skel, now, 20, index)] == expected
@@ -0,0 +1,55 @@
+import pytest
+
+from grassfire.benchmark_line2d import benchmark_event_handling
+from grassfire.line2d import (
+    Line2,
+    LineLineIntersectionResult,
+    LineLineIntersector,
+    intersect_at_time,
+)
+
+
+def test_intersect_at_time_matches_line_objects():
+    one = Line2.from_points((0.0, 0.0), (4.0, 1.0))
+    other = Line2.from_points((4.0, 1.0), (1.0, 3.0))
+    for t in (0.0, 0.1, 2.0):
+        intersector = LineLineIntersector(one.at_time(t), other.at_time(t))
+        assert intersector.intersection_type() == LineLineIntersectionResult.POINT
+        status, x, y = intersect_at_time(one, other, t)
+        assert status == LineLineIntersectionResult.POINT
+        assert (x, y) == pytest.approx(intersector.result)
+
+
+def test_intersect_at_time_status_for_parallel_lines():
+    one = Line2.from_points((0.0, 0.0), (1.0, 0.0))
+    opposite = Line2.from_points((1.0, 1.0), (0.0, 1.0))
+    same = Line2.from_points((2.0, 0.0), (3.0, 0.0))
+    assert intersect_at_time(one, opposite, 0.25) == (
+        LineLineIntersectionResult.NO_INTERSECTION, None, None
+    )
+    # both lines moved up by 0.5, they meet in the middle
+    assert intersect_at_time(one, opposite, 0.5)[0] == LineLineIntersectionResult.LINE
+    assert intersect_at_time(one, same, 1.0)[0] == LineLineIntersectionResult.LINE
+
+
+def test_benchmark_event_handling():
+    class Result:
+        timings = {"propagate": 2.0}
+        event_counts = {"edge": 3, "flip": 1}
+
+    def fake_calc_skel(conv, internal_only, engine):
+        assert engine == "triangulation"
+        if conv[0] == "staircase":
+            raise NotImplementedError("not yet")
+        return Result()
+
+    rows = benchmark_event_handling(
+        shapes=("comb", "staircase"),
+        sizes=(10,),
+        repeats=2,
+        calc_skel_fn=fake_calc_skel,
+        make_conv_fn=lambda ring: ("staircase" if len(ring) == 10 else "comb",),
+    )
+    assert rows[0] == ("comb", 8, 4, 2.0, None)
+    assert rows[1][:4] == ("staircase", 10, None, None)
+    assert rows[1][4] == "NotImplementedError: not yet"
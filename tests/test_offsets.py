@@ -0,0 +1,39 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.offsets import offset_rings
+from grassfire.test.shapes import L_SHAPE, RECT_WITH_HOLE, conv
+
+
+def _area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]))
+
+
+def _corners(ring):
+    return sorted({tuple(round(c, 6) for c in pt) for pt in ring.tolist()})
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_l_shape_offsets(engine):
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine)
+    at_2, at_4, at_6 = offset_rings(skel, [2.0, 4.0, 6.0])
+    assert len(at_2) == len(at_4) == 1
+    ring = at_2[0]
+    assert ring.shape[1] == 2
+    assert ring[0].tolist() == ring[-1].tolist()
+    assert _corners(ring) == [(2, 2), (2, 18), (8, 8), (8, 18), (18, 2), (18, 8)]
+    assert abs(_area(at_4[0])) == pytest.approx(2 * 12 * 2 - 2 * 2)
+    # the wavefront is gone after 5
+    assert at_6 == []
+
+
+def test_offsets_around_hole():
+    skel = calc_skel(conv(*RECT_WITH_HOLE), internal_only=True, engine="slav")
+    (outer, hole), = offset_rings(skel, [0.5])
+    if abs(_area(outer)) < abs(_area(hole)):
+        outer, hole = hole, outer
+    assert _corners(outer) == [(0.5, 0.5), (0.5, 5.5), (9.5, 0.5), (9.5, 5.5)]
+    assert _corners(hole) == [(3.5, 1.5), (3.5, 4.5), (6.5, 1.5), (6.5, 4.5)]
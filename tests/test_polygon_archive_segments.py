@@ -49,7 +49,7 @@ def _load_coords(name: str):
     return requests.get(url).json()
 
 
-def _calc_segments(coords):
+def _conv(coords):
     conv = ToPointsAndSegments()
     for ring in coords:
         for p in ring:
@@ -58,8 +58,11 @@ def _calc_segments(coords):
             start = tuple(ring[i])
             end = tuple(ring[(i + 1) % len(ring)])
             conv.add_segment(start, end)
+    return conv
+
 
-    skel = calc_skel(conv, internal_only=True)
+def _calc_segments(coords):
+    skel = calc_skel(_conv(coords), internal_only=True)
     return skel.segments()
 
 
@@ -0,0 +1,42 @@
+from tri.delaunay.helpers import ToPointsAndSegments
+from tri.delaunay.insert_kd import triangulate
+
+from grassfire import calc_skel, prepare_triangulation
+
+
+def _square_with_hole():
+    conv = ToPointsAndSegments()
+    for ring in (
+        [(0, 0), (10, 0), (10, 10), (0, 10)],
+        [(4, 4), (4, 6), (6, 6), (6, 4)],
+    ):
+        for i in range(len(ring)):
+            conv.add_segment(ring[i], ring[(i + 1) % len(ring)])
+    return conv
+
+
+def test_prepared_triangulation_is_reused():
+    calls = []
+
+    def counting_triangulator(points, infos, segments, output):
+        calls.append(len(points))
+        return triangulate(points, infos, segments, output)
+
+    conv = _square_with_hole()
+    prepared = prepare_triangulation(conv, triangulator=counting_triangulator)
+    internal = calc_skel(None, internal_only=True, triangulation=prepared)
+    full = calc_skel(None, triangulation=prepared)
+    assert calls == [8]
+    assert internal.transform is prepared.transform
+    assert len(full.segments()) > len(internal.segments())
+    # same result as triangulating inside calc_skel
+    fresh = calc_skel(_square_with_hole(), internal_only=True)
+    assert sorted(s[0] for s in fresh.segments()) == sorted(
+        s[0] for s in internal.segments()
+    )
+
+
+def test_timings_reported_per_stage():
+    skel = calc_skel(_square_with_hole(), internal_only=True)
+    assert set(skel.timings) == {"triangulate", "initialize", "propagate"}
+    assert all(value >= 0.0 for value in skel.timings.values())
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.faces import FaceIndex, skeleton_faces
+from grassfire.raster import arrival_time_raster
+from grassfire.test.shapes import L_SHAPE, RECTANGLE, conv
+
+
+def _centers(origin, cell_size, shape):
+    rows, columns = np.mgrid[0:shape[0], 0:shape[1]]
+    return np.stack([origin[0] + (columns.ravel() + 0.5) * cell_size,
+                     origin[1] + (rows.ravel() + 0.5) * cell_size], axis=1)
+
+
+@pytest.mark.parametrize("engine", ["convex", "slav", "triangulation"])
+def test_rectangle_is_distance_to_boundary(engine):
+    skel = calc_skel(conv(RECTANGLE), internal_only=True, engine=engine)
+    raster = arrival_time_raster(skel, (-1, -1), 0.25, (36, 56))
+    x, y = _centers((-1, -1), 0.25, (36, 56)).T
+    expected = np.minimum.reduce([x, y, 12 - x, 7 - y]).reshape(36, 56)
+    expected[expected < 0] = np.nan
+    assert np.allclose(raster, expected, equal_nan=True)
+
+
+def test_l_shape_matches_point_location():
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine="slav")
+    index = FaceIndex(skeleton_faces(skel))
+    shape = (45, 43)
+    raster = arrival_time_raster(skel, (-1.3, -1.1), 0.5, shape, index=index)
+    location = index.locate(_centers((-1.3, -1.1), 0.5, shape))
+    assert np.allclose(raster, location.times.reshape(shape), equal_nan=True)
+    # the outcome does not depend on the tiling
+    tiled = arrival_time_raster(skel, (-1.3, -1.1), 0.5, shape, tile=8, index=index)
+    assert np.array_equal(raster, tiled, equal_nan=True)
+    assert np.nanmax(raster) == pytest.approx(5, abs=0.5)
@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.faces import Face, skeleton_faces
+from grassfire.roof import roof_mesh
+from grassfire.test.shapes import L_SHAPE, RECTANGLE, conv
+
+
+def _areas(mesh):
+    a, b, c = (mesh.vertices[mesh.triangles[:, k]] for k in range(3))
+    return 0.5 * ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+                  (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+
+
+def _ring_area(ring):
+    x, y = np.array(list(ring) + [ring[0]], dtype=float).T
+    return 0.5 * abs(float(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1])))
+
+
+@pytest.mark.parametrize("engine", ["convex", "slav", "triangulation"])
+def test_nodes_know_their_time(engine):
+    skel = calc_skel(conv(RECTANGLE), internal_only=True, engine=engine)
+    for v in skel.vertices:
+        assert v.start_node.time == v.starts_at
+        assert v.stop_node.time == pytest.approx(v.stops_at)
+
+
+@pytest.mark.parametrize("ring", [L_SHAPE, RECTANGLE, rectilinear_ring("comb", 40)])
+def test_roof_covers_input(ring):
+    skel = calc_skel(conv(ring), internal_only=True, engine="slav")
+    faces = skeleton_faces(skel)
+    mesh = roof_mesh(skel, pitch=0.5, faces=faces)
+    areas = _areas(mesh)
+    assert (areas >= -1e-12).all()
+    assert areas.sum() == pytest.approx(_ring_area(ring))
+    # every triangle lies in the plane of its face
+    for triangle, face in zip(mesh.triangles.tolist(), mesh.faces.tolist()):
+        (sx, sy), (ex, ey) = faces[face].start, faces[face].end
+        for x, y, z in mesh.vertices[triangle].tolist():
+            distance = abs((ex - sx) * (y - sy) - (ey - sy) * (x - sx)) / np.hypot(ex - sx, ey - sy)
+            assert z == pytest.approx(0.5 * distance, abs=1e-9)
+
+
+def test_hip_roof_of_rectangle():
+    skel = calc_skel(conv(RECTANGLE), internal_only=True, engine="convex")
+    mesh = roof_mesh(skel, pitch=2.0)
+    assert len(mesh.vertices) == 6
+    assert len(mesh.triangles) == 6
+    assert sorted(mesh.vertices[:, 2].tolist()) == pytest.approx([0, 0, 0, 0, 7, 7])
+
+
+def test_face_without_star_point():
+    # an S: no fan from one of its corners covers it
+    ring = [(0, 0), (5, 0), (5, 3), (1, 3), (1, 4), (5, 4), (5, 5), (0, 5),
+            (0, 2), (4, 2), (4, 1), (0, 1)]
+    for corners in (ring, ring[::-1]):
+        polygon = np.array(corners + corners[:1], dtype=float)
+        face = Face(corners[0], corners[1], (None, None), polygon, np.zeros(len(polygon)))
+        mesh = roof_mesh(None, faces=[face])
+        areas = _areas(mesh)
+        assert len(areas) == len(ring) - 2
+        assert (areas > 0).all()
+        assert areas.sum() == pytest.approx(17)
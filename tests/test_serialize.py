@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+from grassfire import calc_offsets, calc_skel
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.primitives import InfiniteVertex
+from grassfire.serialize import skeleton_state
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+def _index(skel, vertex):
+    return None if vertex is None else skel.vertices.index(vertex)
+
+
+def _offsets(skel, now):
+    return [(p, q, t) for p, q, t, _, _ in calc_offsets(skel, now, 10)]
+
+
+@pytest.mark.parametrize(
+    "ring, kwargs",
+    [
+        (L_SHAPE, {"internal_only": True, "engine": "slav"}),
+        (L_SHAPE, {"internal_only": True, "engine": "triangulation"}),
+        (L_SHAPE, {"engine": "triangulation"}),
+        (rectilinear_ring("comb", 40), {"internal_only": True}),
+    ],
+)
+def test_pickle_round_trip(ring, kwargs):
+    skel = calc_skel(conv(ring), **kwargs)
+    copy = pickle.loads(pickle.dumps(skel))
+    assert copy.segments() == skel.segments()
+    assert _offsets(copy, 0.5) == _offsets(skel, 0.5)
+    assert copy.timings == skel.timings
+    assert copy.event_counts == skel.event_counts
+    assert [(n.step, n.time) for n in copy.sk_nodes] == \
+        [(n.step, n.time) for n in skel.sk_nodes]
+    for v, w in zip(skel.vertices, copy.vertices):
+        assert (w.starts_at, w.stops_at, w.info) == (v.starts_at, v.stops_at, v.info)
+        assert _index(skel, v.left) == _index(copy, w.left)
+        assert _index(skel, v.right_at(v.starts_at)) == _index(copy, w.right_at(w.starts_at))
+        assert (w.wfl is None) == (v.wfl is None)
+
+
+def test_pickle_does_not_recurse():
+    skel = calc_skel(conv(rectilinear_ring("staircase", 2000)), internal_only=True,
+                     engine="triangulation")
+    data = pickle.dumps(skel)
+    assert len(pickle.loads(data).vertices) == len(skel.vertices)
+
+
+def _triangle_refs(skel, t):
+    vertices = ["infinite" if isinstance(v, InfiniteVertex) else _index(skel, v)
+                for v in t.vertices]
+    neighbours = [None if n is None else skel.triangles.index(n) for n in t.neighbours]
+    return vertices, neighbours
+
+
+@pytest.mark.parametrize("internal_only", [True, False])
+def test_kept_triangles_round_trip(internal_only):
+    skel = calc_skel(conv(L_SHAPE), internal_only=internal_only,
+                     engine="triangulation", keep_triangles=True)
+    assert skel.triangles
+    copy = pickle.loads(pickle.dumps(skel))
+    assert len(copy.triangles) == len(skel.triangles)
+    for t, u in zip(skel.triangles, copy.triangles):
+        assert _triangle_refs(copy, u) == _triangle_refs(skel, t)
+        assert (u.stops_at, u.internal, u.info) == (t.stops_at, t.internal, t.info)
+    assert "triangle_refs" not in skeleton_state(skel, triangles=False)
+
+
+def test_released_triangles_are_not_written():
+    skel = calc_skel(conv(L_SHAPE), engine="triangulation")
+    assert "triangle_refs" not in skeleton_state(skel)
+    assert pickle.loads(pickle.dumps(skel)).triangles == []
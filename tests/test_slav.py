@@ -0,0 +1,158 @@
+import math
+
+import pytest
+
+from grassfire import calc_skel
+from grassfire.benchmark_polygon_archive_segments import INPUT_NAMES, load_coords, make_conv
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.rings import orient_rings, rings_from_segments, signed_area
+from grassfire.slav import (
+    UnsupportedConfiguration,
+    oriented_rings,
+    prefer_slav,
+    reflex_count,
+    slav_skeleton,
+)
+from grassfire.test.intersection import segments_intersecting
+from grassfire.test.shapes import conv, rounded
+
+
+SQUARE_WITH_HOLE = [
+    [(0, 0), (3, 0), (3, 3), (0, 3)],
+    [(1, 1), (2, 1), (2, 2), (1, 2)],
+]
+PLUS = [[(1, 0), (2, 0), (2, 1), (3, 1), (3, 2), (2, 2), (2, 3), (1, 3),
+         (1, 2), (0, 2), (0, 1), (1, 1)]]
+L_SHAPE = [[(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]]
+
+# polygon archive inputs that the slav engine is known not to handle (it
+# raises UnsupportedConfiguration, calc_skel then falls back to the
+# triangulation)
+SLAV_UNSUPPORTED = set()
+
+
+def _points_and_segments(rings):
+    points, segments = [], []
+    for ring in rings:
+        offset = len(points)
+        points.extend(ring)
+        segments.extend((offset + i, offset + (i + 1) % len(ring))
+                        for i in range(len(ring)))
+    return points, segments
+
+
+def _skeleton(rings):
+    points, segments = _points_and_segments(rings)
+    return slav_skeleton(points, oriented_rings(points, segments))
+
+
+def _merged_segments(skel):
+    """The segments of skel, with the collinear chains merged (the engines
+    may split a straight part of the skeleton at different nodes)"""
+    neighbours = {}
+    for (p, q), _infos in skel.segments():
+        p, q = (tuple(round(c, 5) for c in pt) for pt in (p, q))
+        if p != q:
+            neighbours.setdefault(p, set()).add(q)
+            neighbours.setdefault(q, set()).add(p)
+    for p in list(neighbours):
+        if len(neighbours[p]) != 2:
+            continue
+        a, b = neighbours[p]
+        (ax, ay), (bx, by) = (a[0] - p[0], a[1] - p[1]), (b[0] - p[0], b[1] - p[1])
+        opposite = ax * bx + ay * by < 0
+        collinear = abs(ax * by - ay * bx) <= 1e-6 * math.hypot(ax, ay) * math.hypot(bx, by)
+        if not (opposite and collinear):
+            continue
+        # p lies in the middle of a straight part: connect a and b directly
+        del neighbours[p]
+        neighbours[a].discard(p)
+        neighbours[b].discard(p)
+        neighbours[a].add(b)
+        neighbours[b].add(a)
+    return sorted(set(tuple(sorted((p, q))) for p in neighbours for q in neighbours[p]))
+
+
+def test_holes_are_oriented_clockwise():
+    points, segments = _points_and_segments(
+        [list(reversed(SQUARE_WITH_HOLE[0])), list(reversed(SQUARE_WITH_HOLE[1]))]
+    )
+    rings = orient_rings(points, rings_from_segments(points, segments))
+    assert [signed_area(points, ring) > 0 for ring in rings] == [True, False]
+
+
+def test_rings_from_segments_rejects_dangling_segments():
+    points = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    assert rings_from_segments(points, [(0, 1), (1, 2), (2, 3)]) is None
+
+
+def test_square_with_hole():
+    skel = _skeleton(SQUARE_WITH_HOLE)
+    assert rounded(skel.segments()) == [
+        ((0, 0), (0.5, 0.5)), ((0, 3), (0.5, 2.5)), ((0.5, 0.5), (0.5, 2.5)),
+        ((0.5, 0.5), (1, 1)), ((0.5, 0.5), (2.5, 0.5)), ((0.5, 2.5), (1, 2)),
+        ((0.5, 2.5), (2.5, 2.5)), ((2, 1), (2.5, 0.5)), ((2, 2), (2.5, 2.5)),
+        ((2.5, 0.5), (2.5, 2.5)), ((2.5, 0.5), (3, 0)), ((2.5, 2.5), (3, 3)),
+    ]
+
+
+def test_plus_meets_in_the_center():
+    skel = _skeleton(PLUS)
+    center = [v for v in skel.vertices
+              if v.stop_node is not None and v.stop_node.pos == pytest.approx((1.5, 1.5))]
+    assert len(center) >= 4
+    assert len(rounded(skel.segments())) == 16
+    assert all(v.stops_at is not None for v in skel.vertices)
+
+
+@pytest.mark.parametrize(
+    "rings",
+    [
+        L_SHAPE,
+        PLUS,
+        SQUARE_WITH_HOLE,
+        [rectilinear_ring("U", 40)],
+        [rectilinear_ring("comb", 20)],
+        [rectilinear_ring("staircase", 20)],
+    ],
+)
+def test_slav_engine_matches_triangulation(rings):
+    expected = calc_skel(conv(*rings), internal_only=True, engine="triangulation")
+    skel = calc_skel(conv(*rings), internal_only=True, engine="slav")
+    assert skel.timings["triangulate"] == 0.0
+    assert _merged_segments(skel) == _merged_segments(expected)
+
+
+def test_fastest_engine_picks_slav_for_few_reflex_vertices():
+    points, segments = _points_and_segments(L_SHAPE)
+    assert reflex_count(points, oriented_rings(points, segments)) == 1
+    assert prefer_slav(len(points), 1)
+    assert not prefer_slav(100000, 1000)
+    # too many reflex vertices for the number of vertices
+    assert not prefer_slav(30, 12)
+    skel = calc_skel(conv(*L_SHAPE), internal_only=True, engine="fastest")
+    assert skel.timings["triangulate"] == 0.0
+    # the default engine triangulates all but convex input
+    skel = calc_skel(conv(*L_SHAPE), internal_only=True)
+    assert skel.timings["triangulate"] > 0.0
+
+
+def test_slav_engine_needs_internal_only():
+    with pytest.raises(ValueError):
+        calc_skel(conv(*L_SHAPE), engine="slav")
+
+
+@pytest.mark.parametrize("name", INPUT_NAMES)
+def test_slav_engine_matches_triangulation_on_archive(name):
+    archive_conv = make_conv(load_coords(name))
+    if name in SLAV_UNSUPPORTED:
+        with pytest.raises(UnsupportedConfiguration):
+            calc_skel(archive_conv, internal_only=True, engine="slav")
+        return
+    skel = calc_skel(archive_conv, internal_only=True, engine="slav")
+    expected = calc_skel(archive_conv, internal_only=True, engine="triangulation")
+    segments = [segment for segment, _infos in skel.segments()]
+    assert not segments_intersecting(segments), (
+        "intersection between straight skeleton segments found"
+    )
+    assert _merged_segments(skel) == _merged_segments(expected)
@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.offsets import offset_rings
+from grassfire.snapshots import WavefrontCapture
+from grassfire.test.shapes import L_SHAPE, RECT_WITH_HOLE, conv
+
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+def _corners(ring):
+    return sorted({tuple(round(c, 6) for c in pt) for pt in ring.tolist()})
+
+
+def _same_rings(found, expected):
+    assert sorted(_corners(r) for r in found) == sorted(_corners(r) for r in expected)
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_snapshots_match_offsets(engine):
+    times = [0.5, 2.0, 4.0, 6.0]
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine,
+                     capture_times=times)
+    assert [s.time for s in skel.snapshots] == times
+    for snapshot, rings in zip(skel.snapshots, offset_rings(skel, times)):
+        _same_rings(snapshot.rings(), rings)
+    # the wavefront is gone after 5
+    assert skel.snapshots[-1].rings() == []
+
+
+def test_snapshots_around_hole():
+    skel = calc_skel(conv(*RECT_WITH_HOLE), internal_only=True, engine="slav",
+                     capture_times=[0.5])
+    snapshot, = skel.snapshots
+    assert len(snapshot.vertices) == len(snapshot.positions) == 8
+    _same_rings(snapshot.rings(), offset_rings(skel, [0.5])[0])
+
+
+def test_convex_engine_steps_events():
+    skel = calc_skel(conv(SQUARE), internal_only=True, engine="convex",
+                     capture_times=[1.0, 3.0])
+    one, three = skel.snapshots
+    assert _corners(one.rings()[0]) == [(1, 1), (1, 9), (9, 1), (9, 9)]
+    assert _corners(three.rings()[0]) == [(3, 3), (3, 7), (7, 3), (7, 7)]
+    assert calc_skel(conv(SQUARE), internal_only=True,
+                     engine="convex").snapshots == []
+
+
+@pytest.mark.parametrize("engine", ["slav", "triangulation"])
+def test_snapshots_are_pickled(engine):
+    skel = calc_skel(conv(L_SHAPE), internal_only=True, engine=engine,
+                     capture_times=[0.5, 2.0, 6.0])
+    copy = pickle.loads(pickle.dumps(skel))
+    assert len(copy.snapshots) == 3
+    for snapshot, expected in zip(copy.snapshots, skel.snapshots):
+        assert snapshot.time == expected.time
+        for name in ("vertices", "positions", "left", "right"):
+            assert np.array_equal(getattr(snapshot, name), getattr(expected, name))
+        _same_rings(snapshot.rings(), expected.rings())
+
+
+def test_unsorted_times():
+    with pytest.raises(ValueError):
+        WavefrontCapture([2.0, 1.0])
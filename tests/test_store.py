@@ -0,0 +1,80 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from grassfire import calc_skel
+from grassfire.compact import CompactSkeleton, compact_skeleton
+from grassfire.store import SkeletonStore, SkeletonWriter
+from grassfire.test.shapes import L_SHAPE, conv
+
+
+def _same(stored, compact):
+    assert np.array_equal(stored.positions, compact.positions)
+    assert np.array_equal(stored.times, compact.times, equal_nan=True)
+    assert np.array_equal(stored.segments, compact.segments)
+    assert np.array_equal(stored.rays, compact.rays)
+    assert np.array_equal(stored.ray_directions, compact.ray_directions)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "skeletons.bin")
+    expected = {}
+    with SkeletonWriter(path) as writer:
+        for key in (7, 3, 12):
+            ring = [(x + key, y) for x, y in L_SHAPE]
+            skel = calc_skel(conv(ring), internal_only=True, engine="slav")
+            writer.add(key, skel)
+            expected[key] = compact_skeleton(skel)
+        # with rays
+        compact = CompactSkeleton([(0, 0), (1, 0), (2, 0)], [0, 1, 0], [None] * 3,
+                                  [(0, 1)], [1, 2], [(0.5, 1.0), (-1.0, 0.0)])
+        writer.add(-1, compact)
+        expected[-1] = compact
+        assert len(writer) == 4
+    store = SkeletonStore(path)
+    assert len(store) == 4
+    assert store.keys().tolist() == [-1, 3, 7, 12]
+    assert 3 in store and 4 not in store
+    for key, compact in expected.items():
+        stored = store[key]
+        _same(stored, compact)
+        assert not stored.positions.flags.writeable
+        assert isinstance(stored.compact(), CompactSkeleton)
+        assert stored.compact().infos == compact.infos
+    assert store[-1].ray_directions.tolist() == [[0.5, 1.0], [-1.0, 0.0]]
+    assert [key for key, _ in store.items()] == [-1, 3, 7, 12]
+    with pytest.raises(KeyError):
+        store[4]
+
+
+def test_views_share_the_map(tmp_path):
+    path = str(tmp_path / "skeletons.bin")
+    with SkeletonWriter(path) as writer:
+        writer.add(1, calc_skel(conv(L_SHAPE), internal_only=True, engine="slav"))
+    stored = SkeletonStore(path)[1]
+    assert isinstance(stored.positions.base, np.ndarray)
+    assert not stored.positions.flags.owndata
+
+
+def test_infos(tmp_path):
+    path = str(tmp_path / "skeletons.bin")
+    compact = CompactSkeleton([(0, 0), (1, 0)], [0, 1], [5, None], [(0, 1)])
+    with SkeletonWriter(path) as writer:
+        writer.add(1, compact)
+        with pytest.raises(ValueError):
+            writer.add(1, compact)
+        with pytest.raises(TypeError):
+            writer.add(2, CompactSkeleton([(0, 0)], [0], ["a"], []))
+    stored = SkeletonStore(path)
+    assert len(stored) == 1
+    assert stored[1].compact().infos == (5, None)
+
+
+def test_empty_and_invalid(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    SkeletonWriter(path).close()
+    assert len(SkeletonStore(path)) == 0
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a container" * 4)
+    with pytest.raises(ValueError):
+        SkeletonStore(str(other))
@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from grassfire import calc_skel
+from grassfire.benchmark_rectilinear import rectilinear_ring
+from grassfire.test.shapes import L_SHAPE, conv, rounded
+
+
+SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4)]
+HEPTAGON = [(5 * math.cos(2 * math.pi * i / 7), 5 * math.sin(2 * math.pi * i / 7))
+            for i in range(7)]
+
+
+@pytest.mark.parametrize(
+    "ring, engine",
+    [
+        (SQUARE, "convex"),
+        (HEPTAGON, "convex"),
+        (L_SHAPE, "slav"),
+        (rectilinear_ring("comb", 40), "slav"),
+        (rectilinear_ring("comb", 40), "fastest"),
+        (L_SHAPE, "triangulation"),
+        (rectilinear_ring("T", 100), "triangulation"),
+    ],
+)
+def test_streamed_segments_match_segments(ring, engine):
+    streamed = []
+    skel = calc_skel(conv(ring), internal_only=True, engine=engine,
+                     on_segment=streamed.append)
+    assert rounded(streamed) == rounded(skel.segments())
+    assert skel.stream is None
+
+
+def test_unbounded_segments_are_streamed_at_the_end():
+    streamed = []
+    skel = calc_skel(conv(L_SHAPE), engine="triangulation",
+                     on_segment=streamed.append)
+    unbounded = [s for s in streamed if s[1][1] is None]
+    assert len(unbounded) == sum(v.stops_at is None for v in skel.vertices) > 0
+    assert streamed[-len(unbounded):] == unbounded
@@ -0,0 +1,50 @@
+import pytest
+
+from grassfire.line2d import (
+    LineLineIntersectionResult,
+    WaveFront,
+    WaveFrontIntersector,
+    WaveFrontPairs,
+    intersect_at_time,
+)
+
+
+def test_pair_is_solved_once():
+    left = WaveFront((0.0, 0.0), (1.0, 0.0))
+    right = WaveFront((1.0, 0.0), (1.0, 1.0))
+    pairs = WaveFrontPairs()
+    pair = pairs[left, right]
+    assert pairs[left, right] is pair
+    assert len(pairs) == 1
+    assert pair.tp == LineLineIntersectionResult.POINT
+    assert pair.point == (1.0, 0.0)
+    assert pair.bisector == pytest.approx((-1.0, 1.0))
+
+
+def test_pair_matches_intersector():
+    left = WaveFront((0.0, 0.0), (4.0, 1.0))
+    right = WaveFront((4.0, 1.0), (1.0, 3.0))
+    pair = WaveFrontPairs()[left, right]
+    intersector = WaveFrontIntersector(left, right)
+    assert pair.bisector == intersector.get_bisector()
+    for t in (0.0, 0.25, 1.5):
+        assert pair.get_intersection_at_t(t) == pytest.approx(
+            intersector.get_intersection_at_t(t)
+        )
+        status, x, y = pair.intersection_at_t(t)
+        expected = intersect_at_time(left.line, right.line, t)
+        assert status == expected[0] == LineLineIntersectionResult.POINT
+        assert (x, y) == pytest.approx(expected[1:])
+
+
+def test_parallel_pair_has_no_intersection():
+    left = WaveFront((0.0, 0.0), (1.0, 0.0))
+    right = WaveFront((1.0, 1.0), (0.0, 1.0))
+    pair = WaveFrontPairs()[left, right]
+    assert pair.tp == LineLineIntersectionResult.NO_INTERSECTION
+    assert pair.point is None
+    assert pair.intersection_at_t(0.5) == (
+        LineLineIntersectionResult.NO_INTERSECTION, None, None
+    )
+    with pytest.raises(ValueError):
+        pair.get_intersection_at_t(0.5)